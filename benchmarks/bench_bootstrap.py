@@ -0,0 +1,55 @@
+"""
+Time-to-first-load_data for a cold process: on-chain IDL fetch (Program.at)
+versus the local IDL (load_program). Results are printed as JSON.
+
+    python benchmarks/bench_bootstrap.py [rpc_url] [rounds]
+"""
+import asyncio
+import json
+import statistics
+import sys
+import time
+
+from anchorpy import Program, Provider, Wallet
+from solana.keypair import Keypair
+from solana.publickey import PublicKey
+from solana.rpc.async_api import AsyncClient
+
+from switchboardpy import SBV2_DEVNET_PID, AccountParams, AggregatorAccount
+from switchboardpy.bootstrap import load_program
+
+AGGREGATOR = PublicKey("88FX4tBstuwBPNhQU4EEBoPX35neSu4Le9zDSwtPRRQz")
+
+async def first_load_data(rpc_url: str, bootstrap) -> float:
+    start = time.perf_counter()
+    provider = Provider(AsyncClient(rpc_url), Wallet(Keypair()))
+    program = await bootstrap(provider)
+    await AggregatorAccount(AccountParams(program=program, public_key=AGGREGATOR)).load_data()
+    elapsed = time.perf_counter() - start
+    await program.close()
+    return elapsed
+
+async def main(rpc_url: str, rounds: int):
+    # make sure the local cache is populated before timing the local path
+    provider = Provider(AsyncClient(rpc_url), Wallet(Keypair()))
+    await (await load_program(provider, fetch=True)).close()
+
+    paths = {
+        "onchain_idl": lambda provider: Program.at(SBV2_DEVNET_PID, provider),
+        "local_idl": lambda provider: load_program(provider),
+    }
+    results = {}
+    for name, bootstrap in paths.items():
+        samples = [await first_load_data(rpc_url, bootstrap) for _ in range(rounds)]
+        results[name] = {
+            "rounds": rounds,
+            "median_s": statistics.median(samples),
+            "min_s": min(samples),
+            "max_s": max(samples),
+        }
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    rpc_url = sys.argv[1] if len(sys.argv) > 1 else "https://api.devnet.solana.com/"
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    asyncio.run(main(rpc_url, rounds))
@@ -0,0 +1,92 @@
+"""
+Per-call cost of the values wrappers used to rebuild on every call versus the
+shared ProgramContext: payer keypair expansion, program state PDA derivation
+and the token mint (program state RPC + AsyncToken), the latter served by the
+local RPC stand-in from synthesized accounts, or from fixtures recorded with
+record_fixtures.py. Results are printed as JSON.
+
+    python benchmarks/bench_context.py [seconds] [fixtures]
+"""
+import asyncio
+import json
+import sys
+import time
+
+from pathlib import Path
+from typing import Optional
+
+from anchorpy import Provider, Wallet
+from solana.keypair import Keypair
+from solana.rpc.async_api import AsyncClient
+from spl.token.async_client import AsyncToken
+from spl.token.constants import TOKEN_PROGRAM_ID
+
+from switchboardpy import PDA_CACHE, ProgramStateAccount
+from switchboardpy.bootstrap import load_program
+from switchboardpy.program import get_program_context
+from switchboardpy.testing import RpcStandIn, load_fixtures, standin_program, synthetic_fixtures
+
+async def microseconds_per_call(fn, seconds: float) -> float:
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        result = fn()
+        if asyncio.iscoroutine(result):
+            await result
+        count += 1
+    return (time.perf_counter() - start) / count * 1e6
+
+async def main(seconds: float, fixtures_path: Optional[Path]):
+    async with RpcStandIn() as standin:
+        if fixtures_path:
+            # recorded devnet accounts decode with the chain IDL record_fixtures.py cached
+            program = await load_program(Provider(AsyncClient(standin.http_url), Wallet(Keypair())))
+            standin.accounts.update(load_fixtures(fixtures_path))
+        else:
+            program = await standin_program(standin)
+            standin.accounts.update(synthetic_fixtures(program))
+        provider = program.provider
+        context = get_program_context(program)
+        state_account, _ = ProgramStateAccount.from_seed(program)
+
+        def uncached_state_pda():
+            PDA_CACHE.clear()
+            return ProgramStateAccount.from_seed(program)
+
+        # what get_token_mint did on every call before ProgramContext
+        async def per_call_token_mint():
+            payer = Keypair.from_secret_key(provider.wallet.payer.secret_key)
+            state = await state_account.load_data()
+            return AsyncToken(provider.connection, state.token_mint, TOKEN_PROGRAM_ID, payer)
+
+        paths = {
+            "payer_keypair": (
+                lambda: Keypair.from_secret_key(provider.wallet.payer.secret_key),
+                lambda: context.payer,
+            ),
+            "state_pda": (
+                uncached_state_pda,
+                lambda: (context.state_account, context.state_bump),
+            ),
+            "token_mint": (
+                per_call_token_mint,
+                context.token,
+            ),
+        }
+
+        results = {}
+        for name, (per_call, shared) in paths.items():
+            per_call_us = await microseconds_per_call(per_call, seconds)
+            shared_us = await microseconds_per_call(shared, seconds)
+            results[name] = {
+                "per_call_us": per_call_us,
+                "context_us": shared_us,
+                "saved_us": per_call_us - shared_us,
+            }
+        await program.close()
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    fixtures_path = Path(sys.argv[2]) if len(sys.argv) > 2 else None
+    asyncio.run(main(seconds, fixtures_path))
@@ -0,0 +1,64 @@
+"""
+Decodes/sec of the anchorpy coder versus switchboardpy.fastdecode for the hot
+account types, full and partial. Results are printed as JSON.
+
+    python benchmarks/bench_fastdecode.py [rpc_url] [seconds]
+"""
+import asyncio
+import base64
+import json
+import sys
+import time
+
+from anchorpy import Provider, Wallet
+from solana.keypair import Keypair
+from solana.publickey import PublicKey
+from solana.rpc.async_api import AsyncClient
+
+from switchboardpy.bootstrap import load_program
+from switchboardpy.fastdecode import get_decoder
+
+ACCOUNTS = {
+    "AggregatorAccountData": PublicKey("88FX4tBstuwBPNhQU4EEBoPX35neSu4Le9zDSwtPRRQz"),
+    "CrankAccountData": PublicKey("GN9jjCy2THzZxhYqZETmPM3my8vg4R5JyNkgULddUMa5"),
+    "OracleQueueAccountData": PublicKey("F8ce7MsckeZAbAGmxjJNetxYXQa9mKr9nnrC3qKubyYy"),
+    "LeaseAccountData": PublicKey("qAs3FQX2iUSRCe9WFXbRgH594LSqusTUze8BftxbiHC"),
+}
+
+LATEST_VALUE_FIELDS = ["latest_confirmed_round.result", "latest_confirmed_round.round_open_timestamp"]
+
+def decodes_per_sec(decode, data: bytes, seconds: float) -> float:
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for _ in range(100):
+            decode(data)
+        count += 100
+    return count / (time.perf_counter() - start)
+
+async def main(rpc_url: str, seconds: float):
+    provider = Provider(AsyncClient(rpc_url), Wallet(Keypair()))
+    program = await load_program(provider, fetch=True)
+    results = {}
+    accounts = {}
+    for account_name, pubkey in ACCOUNTS.items():
+        info = await provider.connection.get_account_info(pubkey, encoding="base64")
+        data = accounts[account_name] = base64.b64decode(info["result"]["value"]["data"][0])
+        decoder = get_decoder(program, account_name)
+        results[account_name] = {
+            "anchorpy": decodes_per_sec(program.coder.accounts.decode, data, seconds),
+            "fastdecode": decodes_per_sec(decoder.decode, data, seconds),
+        }
+    decoder = get_decoder(program, "AggregatorAccountData")
+    results["AggregatorAccountData"]["fastdecode_latest_value"] = decodes_per_sec(
+        lambda data: decoder.decode_fields(data, LATEST_VALUE_FIELDS),
+        accounts["AggregatorAccountData"],
+        seconds
+    )
+    await program.close()
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    rpc_url = sys.argv[1] if len(sys.argv) > 1 else "https://api.devnet.solana.com/"
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 2.0
+    asyncio.run(main(rpc_url, seconds))
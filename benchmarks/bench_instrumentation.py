@@ -0,0 +1,50 @@
+"""
+Overhead of RPC instrumentation per request against the local RPC stand-in:
+uninstrumented, installed but disabled, enabled without and with caller
+attribution. Results are printed as JSON.
+
+    python benchmarks/bench_instrumentation.py [requests]
+"""
+import asyncio
+import json
+import sys
+import time
+
+from solana.publickey import PublicKey
+from solana.rpc.async_api import AsyncClient
+
+from switchboardpy.instrumentation import RpcInstrumentation
+from switchboardpy.testing import AccountFixture, RpcStandIn, standin_program
+
+ACCOUNT = PublicKey("88FX4tBstuwBPNhQU4EEBoPX35neSu4Le9zDSwtPRRQz")
+
+async def microseconds_per_request(connection: AsyncClient, requests: int) -> float:
+    start = time.perf_counter()
+    for _ in range(requests):
+        await connection.get_account_info(ACCOUNT, encoding="base64")
+    return (time.perf_counter() - start) / requests * 1e6
+
+async def main(requests: int):
+    async with RpcStandIn({str(ACCOUNT): AccountFixture(bytes(3851))}) as standin:
+        program = await standin_program(standin)
+        connection = program.provider.connection
+        await microseconds_per_request(connection, requests // 10)
+
+        results = {"uninstrumented_us": await microseconds_per_request(connection, requests)}
+        configurations = {
+            "disabled_us": RpcInstrumentation(enabled=False),
+            "enabled_us": RpcInstrumentation(track_callers=False),
+            "enabled_with_callers_us": RpcInstrumentation(),
+        }
+        for name, instrumentation in configurations.items():
+            instrumentation.install(program)
+            results[name] = await microseconds_per_request(connection, requests)
+            instrumentation.uninstall(program)
+        for name in configurations:
+            results[name.replace("_us", "_overhead_us")] = results[name] - results["uninstrumented_us"]
+        await program.close()
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    asyncio.run(main(requests))
@@ -0,0 +1,65 @@
+"""
+Evaluations/sec of JsonParseTask paths over exchange-like payloads: naive
+interpretation (jsonpath.evaluate, parsing the path on every call) versus
+cached compiled paths (jsonpath.compile_path), and the whole JsonParseTask
+including its aggregation method. Results are printed as JSON.
+
+    python benchmarks/bench_jsonpath.py [seconds]
+"""
+import json
+import sys
+import time
+
+from switchboardpy import OracleJob, jsonpath
+from switchboardpy.jobrunner import compile_json_parse_task
+
+# Shapes of common exchange ticker and order book responses
+PAYLOADS = {
+    "binance_ticker": {"symbol": "BTCUSDT", "price": "42000.51000000"},
+    "kraken_ticker": {"error": [], "result": {"XXBTZUSD": {
+        "a": ["42001.10000", "1", "1.000"], "b": ["42000.90000", "2", "2.000"], "c": ["42001.00000", "0.00100000"],
+        "v": ["1500.1", "3000.2"], "p": ["41900.1", "41800.2"], "t": [12000, 24000],
+        "l": ["41000.0", "40900.0"], "h": ["42500.0", "42600.0"], "o": "41500.0",
+    }}},
+    "coinbase_book": {"sequence": 1, "bids": [[f"{42000 - i * 0.5}", "1.5", 3] for i in range(50)],
+                      "asks": [[f"{42001 + i * 0.5}", "0.7", 2] for i in range(50)]},
+    "huobi_tickers": {"status": "ok", "data": [
+        {"symbol": f"coin{i}usdt", "open": i, "close": i + 0.5, "bid": i + 0.4, "ask": i + 0.6} for i in range(300)
+    ] + [{"symbol": "btcusdt", "open": 41500, "close": 42000, "bid": 41999.9, "ask": 42000.1}]},
+}
+
+TASKS = {
+    "binance_ticker": ("$.price", OracleJob.JsonParseTask.NONE),
+    "kraken_ticker": ("$.result.XXBTZUSD.c[0]", OracleJob.JsonParseTask.NONE),
+    "coinbase_book": ("$.bids[*][0]", OracleJob.JsonParseTask.MAX),
+    "huobi_tickers": ("$.data[?(@.symbol == 'btcusdt')].close", OracleJob.JsonParseTask.NONE),
+}
+
+def calls_per_sec(call, seconds: float) -> float:
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for _ in range(100):
+            call()
+        count += 100
+    return count / (time.perf_counter() - start)
+
+def main(seconds: float):
+    results = {}
+    for name, (path, method) in TASKS.items():
+        # round trip through JSON, as the payloads come off the wire
+        document = json.loads(json.dumps(PAYLOADS[name]))
+        compiled = jsonpath.compile_path(path)
+        program = compile_json_parse_task(path, method)
+        assert compiled(document) == jsonpath.evaluate(path, document)
+        results[name] = {
+            "path": path,
+            "interpreted": calls_per_sec(lambda: jsonpath.evaluate(path, document), seconds),
+            "compiled": calls_per_sec(lambda: compiled(document), seconds),
+            "compile_lookup": calls_per_sec(lambda: jsonpath.compile_path(path)(document), seconds),
+            "json_parse_task": calls_per_sec(lambda: program(document), seconds),
+        }
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 1.0)
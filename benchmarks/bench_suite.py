@@ -0,0 +1,265 @@
+"""
+Benchmarks of the account wrapper hot paths, run without network access:
+account decoding, SwitchboardDecimal round-trips, produce_job_hash, from_seed
+PDA derivations (cold and cached), CrankAccount.pop_txn and
+AggregatorAccount.save_result_txn construction, history decoding and load_data
+against the local RPC stand-in. Accounts are synthesized from the stand-in IDL,
+or read from fixtures recorded with record_fixtures.py. Results are printed as
+JSON, and written to --output to track regressions across releases.
+
+    python benchmarks/bench_suite.py [--fixtures path] [--seconds 1.0] [--filter substring] [--output results.json]
+"""
+import argparse
+import asyncio
+import inspect
+import json
+import platform
+import statistics
+import time
+
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable
+
+from anchorpy import Provider, Wallet
+from solana.keypair import Keypair
+from solana.publickey import PublicKey
+from solana.rpc.async_api import AsyncClient
+
+from switchboardpy import (
+    PDA_CACHE,
+    AccountParams,
+    AggregatorAccount,
+    AggregatorSaveResultParams,
+    CrankAccount,
+    CrankPopParams,
+    LeaseAccount,
+    OracleAccount,
+    OracleJob,
+    OracleQueueAccount,
+    PermissionAccount,
+    ProgramStateAccount,
+    SwitchboardDecimal,
+)
+from switchboardpy.analytics import Ema, HistoryAnalytics, RollingMax, RollingMin, RollingStd, Twap
+from switchboardpy.bootstrap import load_program
+from switchboardpy.common import account_discriminator
+from switchboardpy.crank import decode_crank_rows
+from switchboardpy.fastdecode import FAST_DECODED_ACCOUNTS, get_decoder
+from switchboardpy.history import decode_history
+from switchboardpy.testing import RpcStandIn, history_buffer, load_fixtures, standin_program, synthetic_fixtures
+
+# Rows of the synthetic, wrapped around, history buffer
+HISTORY_ROWS = 1000
+
+def synthetic_jobs(count: int) -> list:
+    jobs = []
+    for i in range(count):
+        job = OracleJob()
+        http_task = OracleJob.HttpTask()
+        http_task.url = f"https://ftx.us/api/markets/sol/usd?job={i}"
+        job.tasks.add().http_task.CopyFrom(http_task)
+        parse_task = OracleJob.JsonParseTask()
+        parse_task.path = "$.result.price"
+        job.tasks.add().json_parse_task.CopyFrom(parse_task)
+        jobs.append(job)
+    return jobs
+
+def summarize(samples: list, runs: int, elapsed: float) -> dict:
+    return {
+        "runs": runs,
+        "ops_per_sec": runs / elapsed,
+        "mean_us": elapsed / runs * 1e6,
+        "median_us": statistics.median(samples) * 1e6,
+        "min_us": min(samples) * 1e6,
+    }
+
+"""
+Time a callable for about `seconds`, awaiting its result when awaitable and
+doubling the batch size until a batch takes at least 10ms.
+
+Returns:
+    dict: runs, ops/sec, and mean / median / min microseconds per call
+"""
+async def measure(fn: Callable[[], Any], seconds: float) -> dict:
+    samples = []
+    runs = 0
+    batch = 1
+    start = time.perf_counter()
+    while True:
+        batch_start = time.perf_counter()
+        for _ in range(batch):
+            result = fn()
+            if inspect.isawaitable(result):
+                await result
+        batch_elapsed = time.perf_counter() - batch_start
+        samples.append(batch_elapsed / batch)
+        runs += batch
+        if time.perf_counter() - start >= seconds:
+            break
+        if batch_elapsed < 0.01:
+            batch *= 2
+    return summarize(samples, runs, time.perf_counter() - start)
+
+def by_account_type(program: Any, fixtures: dict) -> dict:
+    names = {account_discriminator(account.name): account.name for account in program.idl.accounts}
+    accounts = {}
+    for pubkey, fixture in fixtures.items():
+        name = names.get(fixture.data[:8])
+        if name is not None and name not in accounts:
+            accounts[name] = (PublicKey(pubkey), fixture.data)
+    return accounts
+
+def cold(fn: Callable[[], Any]) -> Callable[[], Any]:
+    def run():
+        PDA_CACHE.clear()
+        return fn()
+    return run
+
+def build_benchmarks(program: Any, fixtures: dict) -> dict:
+    accounts = by_account_type(program, fixtures)
+    decode = program.coder.accounts.decode
+    benchmarks = {}
+
+    for name, (_, data) in sorted(accounts.items()):
+        benchmarks[f"decode.anchorpy.{name}"] = lambda data=data: decode(data)
+        if name in FAST_DECODED_ACCOUNTS:
+            benchmarks[f"decode.fastdecode.{name}"] = lambda data=data, decoder=get_decoder(program, name): decoder.decode(data)
+
+    value = Decimal("24531.123456")
+    sbd = SwitchboardDecimal.from_decimal(value)
+    benchmarks["decimal.from_decimal"] = lambda: SwitchboardDecimal.from_decimal(value)
+    benchmarks["decimal.sbd_to_decimal"] = lambda: SwitchboardDecimal.sbd_to_decimal(sbd)
+    benchmarks["decimal.round_trip"] = lambda: SwitchboardDecimal.sbd_to_decimal(SwitchboardDecimal.from_decimal(value))
+    benchmarks["decimal.as_proper_sbd"] = lambda: sbd.as_proper_sbd(program)
+    mantissas = [sbd.mantissa + i for i in range(1000)]
+    scales = [sbd.scale] * 1000
+    benchmarks["decimal.sbd_to_decimal.1000"] = lambda: [SwitchboardDecimal.sbd_to_decimal(SwitchboardDecimal(m, s)) for m, s in zip(mantissas, scales)]
+    benchmarks["decimal.to_decimal_many.1000"] = lambda: SwitchboardDecimal.to_decimal_many(mantissas, scales)
+    benchmarks["decimal.to_float_array.1000"] = lambda: SwitchboardDecimal.to_float_array(mantissas, scales)
+    threshold = SwitchboardDecimal(1, 2)
+    benchmarks["decimal.variance_check.decimal"] = lambda: abs(value - SwitchboardDecimal.sbd_to_decimal(sbd)) > SwitchboardDecimal.sbd_to_decimal(threshold)
+    benchmarks["decimal.variance_check.integer"] = lambda: SwitchboardDecimal.exceeds_threshold(sbd, sbd, threshold)
+    packed = bytearray(sbd.to_bytes())
+    benchmarks["decimal.to_bytes"] = sbd.to_bytes
+    benchmarks["decimal.pack_into"] = lambda: sbd.pack_into(packed)
+    benchmarks["decimal.unpack_from"] = lambda: SwitchboardDecimal.unpack_from(packed)
+    benchmarks["decimal.unpack_decimal_from"] = lambda: SwitchboardDecimal.unpack_decimal_from(packed)
+
+    jobs = synthetic_jobs(4)
+    benchmarks["produce_job_hash.4_jobs"] = lambda: AggregatorAccount.produce_job_hash(jobs).digest()
+
+    history = history_buffer({i: (1_650_000_000 + i, 123_456_789 + i, 6) for i in range(HISTORY_ROWS)}, size=HISTORY_ROWS, insert_idx=HISTORY_ROWS // 3)
+    benchmarks[f"history.decode.{HISTORY_ROWS}_rows"] = lambda: decode_history(history)
+    decoded_history = decode_history(history)
+    benchmarks[f"analytics.update.{HISTORY_ROWS}_rows"] = lambda: HistoryAnalytics(
+        twap=Twap(3600),
+        ema=Ema(half_life=600),
+        std=RollingStd(100),
+        min=RollingMin(100),
+        max=RollingMax(100)
+    ).update(decoded_history)
+
+    if "AggregatorAccountData" not in accounts or "OracleQueueAccountData" not in accounts:
+        return benchmarks
+    aggregator_pubkey, aggregator_data = accounts["AggregatorAccountData"]
+    aggregator = decode(aggregator_data)
+    aggregator_account = AggregatorAccount(AccountParams(program=program, public_key=aggregator_pubkey))
+    queue_pubkey, queue_data = accounts["OracleQueueAccountData"]
+    queue = decode(queue_data)
+    queue_account = OracleQueueAccount(AccountParams(program=program, public_key=queue_pubkey))
+    token_mint = decode(accounts["SbState"][1]).token_mint if "SbState" in accounts else Keypair().public_key
+
+    aggregator_history = fixtures.get(str(aggregator.history_buffer))
+    if aggregator_history is not None:
+        benchmarks["history.decode.aggregator"] = lambda: decode_history(aggregator_history.data)
+
+    pdas = {
+        "Lease": lambda: LeaseAccount.from_seed(program, queue_account, aggregator_account),
+        "Permission": lambda: PermissionAccount.from_seed(program, queue.authority, queue_pubkey, aggregator_pubkey),
+        "Oracle": lambda: OracleAccount.from_seed(program, queue_account, aggregator_pubkey),
+        "ProgramState": lambda: ProgramStateAccount.from_seed(program),
+    }
+    for name, from_seed in pdas.items():
+        benchmarks[f"from_seed.cold.{name}"] = cold(from_seed)
+        benchmarks[f"from_seed.cached.{name}"] = from_seed
+
+    oracle_account = OracleAccount(AccountParams(program=program, public_key=aggregator.current_round.oracle_pubkeys_data[0]))
+    save_result_params = AggregatorSaveResultParams(
+        oracle_idx=0,
+        error=False,
+        value=value,
+        min_response=value,
+        max_response=value,
+        jobs=jobs,
+        queue_authority=queue.authority,
+        token_mint=token_mint,
+        oracles=[],
+    )
+    save_result_txn = lambda: aggregator_account.save_result_txn(aggregator, oracle_account, save_result_params)
+    benchmarks["save_result_txn.cold"] = cold(save_result_txn)
+    benchmarks["save_result_txn.cached"] = save_result_txn
+
+    if "CrankAccountData" in accounts:
+        crank_pubkey, crank_data = accounts["CrankAccountData"]
+        crank = decode(crank_data)
+        crank_account = CrankAccount(AccountParams(program=program, public_key=crank_pubkey))
+        crank_rows = fixtures.get(str(crank.data_buffer))
+        rows = decode_crank_rows(crank_rows.data, crank.pq_size) if crank_rows is not None else []
+        ready_pubkeys = [row.pubkey for row in rows[:5]] or [aggregator_pubkey]
+        pop_params = CrankPopParams(
+            payout_wallet=Keypair().public_key,
+            queue_pubkey=crank.queue_pubkey,
+            queue_authority=queue.authority,
+            crank=crank,
+            queue=queue,
+            token_mint=token_mint,
+            ready_pubkeys=ready_pubkeys,
+            nonce=1,
+        )
+        pop_txn = lambda: crank_account.pop_txn(pop_params)
+        benchmarks[f"pop_txn.cold.{len(ready_pubkeys)}_rows"] = cold(pop_txn)
+        benchmarks[f"pop_txn.cached.{len(ready_pubkeys)}_rows"] = pop_txn
+
+    benchmarks["rpc.load_data.AggregatorAccount"] = aggregator_account.load_data
+    return benchmarks
+
+async def main(args: argparse.Namespace):
+    async with RpcStandIn() as standin:
+        if args.fixtures:
+            # recorded devnet accounts decode with the chain IDL record_fixtures.py cached
+            program = await load_program(Provider(AsyncClient(standin.http_url), Wallet(Keypair())))
+            fixtures = load_fixtures(args.fixtures)
+        else:
+            program = await standin_program(standin)
+            fixtures = synthetic_fixtures(program)
+        standin.accounts.update(fixtures)
+        benchmarks = build_benchmarks(program, fixtures)
+        results = {}
+        for name, fn in benchmarks.items():
+            if args.filter and args.filter not in name:
+                continue
+            results[name] = await measure(fn, args.seconds)
+        await program.close()
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "fixtures": str(args.fixtures) if args.fixtures else "synthetic",
+            "seconds": args.seconds,
+            "timestamp": int(time.time()),
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output)
+    print(output)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", type=Path, default=None)
+    parser.add_argument("--seconds", type=float, default=1.0)
+    parser.add_argument("--filter", default=None)
+    parser.add_argument("--output", type=Path, default=None)
+    asyncio.run(main(parser.parse_args()))
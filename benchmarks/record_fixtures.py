@@ -0,0 +1,69 @@
+"""
+Record devnet accounts as JSON fixtures, and cache the Switchboard IDL
+locally, to run bench_suite.py and bench_context.py against live data instead
+of synthesized accounts (--fixtures).
+
+    python benchmarks/record_fixtures.py [rpc_url] [output]
+"""
+import asyncio
+import sys
+
+from pathlib import Path
+
+from anchorpy import Provider, Wallet
+from solana.keypair import Keypair
+from solana.publickey import PublicKey
+from solana.rpc.async_api import AsyncClient
+
+from switchboardpy import (
+    AccountParams,
+    AggregatorAccount,
+    CrankAccount,
+    LeaseAccount,
+    OracleQueueAccount,
+    PermissionAccount,
+    ProgramStateAccount,
+)
+from switchboardpy.bootstrap import load_program
+from switchboardpy.testing import dump_fixtures, record_fixtures
+
+AGGREGATOR = PublicKey("88FX4tBstuwBPNhQU4EEBoPX35neSu4Le9zDSwtPRRQz")
+CRANK = PublicKey("GN9jjCy2THzZxhYqZETmPM3my8vg4R5JyNkgULddUMa5")
+DEFAULT_PUBKEY = PublicKey("11111111111111111111111111111111")
+
+FIXTURES_PATH = Path(__file__).parent / "fixtures" / "devnet.json"
+
+async def main(rpc_url: str, output: Path):
+    provider = Provider(AsyncClient(rpc_url), Wallet(Keypair()))
+    program = await load_program(provider, fetch=True)
+    aggregator_account = AggregatorAccount(AccountParams(program=program, public_key=AGGREGATOR))
+    aggregator = await aggregator_account.load_data()
+    queue_account = OracleQueueAccount(AccountParams(program=program, public_key=aggregator.queue_pubkey))
+    queue = await queue_account.load_data()
+    lease_account, _ = LeaseAccount.from_seed(program, queue_account, aggregator_account)
+    permission_account, _ = PermissionAccount.from_seed(program, queue.authority, queue_account.public_key, AGGREGATOR)
+    state_account, _ = ProgramStateAccount.from_seed(program)
+    crank = await CrankAccount(AccountParams(program=program, public_key=CRANK)).load_data()
+    pubkeys = [
+        AGGREGATOR,
+        CRANK,
+        crank.data_buffer,
+        queue_account.public_key,
+        lease_account.public_key,
+        permission_account.public_key,
+        state_account.public_key,
+        *aggregator.job_pubkeys_data[:aggregator.job_pubkeys_size],
+        *[pubkey for pubkey in aggregator.current_round.oracle_pubkeys_data if pubkey != DEFAULT_PUBKEY][:1],
+    ]
+    if aggregator.history_buffer != DEFAULT_PUBKEY:
+        pubkeys.append(aggregator.history_buffer)
+    fixtures = await record_fixtures(provider.connection, pubkeys)
+    await program.close()
+    output.parent.mkdir(parents=True, exist_ok=True)
+    dump_fixtures(output, fixtures)
+    print(f"Recorded {len(fixtures)} accounts to {output}")
+
+if __name__ == "__main__":
+    rpc_url = sys.argv[1] if len(sys.argv) > 1 else "https://api.devnet.solana.com/"
+    output = Path(sys.argv[2]) if len(sys.argv) > 2 else FIXTURES_PATH
+    asyncio.run(main(rpc_url, output))
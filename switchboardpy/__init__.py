@@ -2,52 +2,96 @@
 
 from switchboardpy.aggregator import (
     AggregatorAccount, 
+    AggregatorHistory, 
     AggregatorHistoryRow, 
     AggregatorInitParams, 
+    AggregatorLatestValue, 
     AggregatorOpenRoundParams, 
     AggregatorSaveResultParams, 
     AggregatorSetHistoryBufferParams
 )
+from switchboardpy.archive import HistoryArchive
+from switchboardpy.analytics import Ema, HistoryAnalytics, RollingMax, RollingMin, RollingStd, Twap
+from switchboardpy.bootstrap import load_program
+from switchboardpy.cache import AccountCache
 from switchboardpy.compiled import OracleJob
-from switchboardpy.common import SBV2_DEVNET_PID, AccountParams, SwitchboardDecimal
-from switchboardpy.crank import CrankAccount, CrankPopParams, CrankInitParams, CrankPushParams, CrankRow
+from switchboardpy.common import SBV2_DEVNET_PID, AccountFetchBatcher, AccountParams, SwitchboardDecimal, enable_fetch_batching
+from switchboardpy.crank import CrankAccount, CrankMirror, CrankPopParams, CrankInitParams, CrankPushParams, CrankRow
+from switchboardpy.crankturner import CrankTurner
+from switchboardpy.instrumentation import RpcCall, RpcInstrumentation, instrument
 from switchboardpy.job import JobAccount, JobInitParams
+from switchboardpy.jobrunner import ChildResult, JobResults, JobRunner
 from switchboardpy.lease import LeaseAccount, LeaseExtendParams, LeaseInitParams, LeaseWithdrawParams
+from switchboardpy.metrics import LatencyHistogram
 from switchboardpy.oracle import OracleAccount, OracleInitParams, OracleWithdrawParams
 from switchboardpy.oraclequeue import OracleQueueAccount, OracleQueueInitParams
+from switchboardpy.pda import PDA_CACHE, PdaCache, warm_pda_cache
 from switchboardpy.permission import PermissionAccount, PermissionInitParams, PermissionSetParams
-from switchboardpy.program import ProgramStateAccount, ProgramInitParams, VaultTransferParams
+from switchboardpy.program import ProgramContext, ProgramStateAccount, ProgramInitParams, VaultTransferParams, get_program_context
+from switchboardpy.streams import StreamManager, StreamMessage
+from switchboardpy.subscribe import AccountSubscriber, AccountUpdate
 
 __all__ = [
+    "AccountCache",
+    "AccountFetchBatcher",
     "AccountParams",
+    "AccountSubscriber",
+    "AccountUpdate",
     "AggregatorAccount", 
+    "AggregatorHistory", 
     "AggregatorHistoryRow", 
     "AggregatorInitParams", 
+    "AggregatorLatestValue", 
     "AggregatorOpenRoundParams", 
     "AggregatorSaveResultParams", 
     "AggregatorSetHistoryBufferParams",
+    "ChildResult",
     "CrankAccount",
+    "CrankMirror",
     "CrankPopParams",
     "CrankInitParams",
     "CrankPushParams",
     "CrankRow",
+    "CrankTurner",
+    "Ema",
+    "HistoryAnalytics",
+    "HistoryArchive",
     "JobAccount",
     "JobInitParams",
+    "JobResults",
+    "JobRunner",
     "LeaseAccount",
     "LeaseExtendParams",
     "LeaseInitParams",
     "LeaseWithdrawParams",
+    "LatencyHistogram",
     "OracleAccount",
     "OracleInitParams",
     "OracleWithdrawParams",
     "OracleQueueAccount",
     "OracleQueueInitParams",
     "OracleJob",
+    "PDA_CACHE",
+    "PdaCache",
     "PermissionAccount",
     "PermissionInitParams",
     "PermissionSetParams",
+    "ProgramContext",
+    "RollingMax",
+    "RollingMin",
+    "RollingStd",
+    "RpcCall",
+    "RpcInstrumentation",
     "ProgramStateAccount",
     "ProgramInitParams",
     "VaultTransferParams",
-    "SwitchboardDecimal"
+    "StreamManager",
+    "StreamMessage",
+    "SwitchboardDecimal",
+    "Twap",
+    "enable_fetch_batching",
+    "get_program_context",
+    "instrument",
+    "load_program",
+    "warm_pda_cache"
 ]
\ No newline at end of file
@@ -1,25 +1,45 @@
 from __future__ import annotations
 
-import struct
 import anchorpy
 import time
 import hashlib
 
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import Optional, Any, NamedTuple
+from typing import Optional, Any, AsyncIterator, NamedTuple
 
 from solana.keypair import Keypair
 from solana.publickey import PublicKey
 from spl.token.async_client import AsyncToken
 from spl.token.constants import TOKEN_PROGRAM_ID
 from solana.transaction import TransactionSignature
+from solana.rpc.types import DataSliceOpts
+from anchorpy.error import AccountDoesNotExistError, AccountInvalidDiscriminator
 from spl.token.instructions import get_associated_token_address
 from solana.system_program import CreateAccountParams, create_account
 
 from switchboardpy.compiled import OracleJob
-from switchboardpy.common import AccountParams, SwitchboardDecimal
-from switchboardpy.program import ProgramStateAccount
+from switchboardpy.common import (
+    AccountParams,
+    SwitchboardDecimal,
+    account_info_bytes,
+    fetch_account,
+    get_multiple_account_infos,
+    get_program_extensions,
+    load_many_accounts
+)
+from switchboardpy.fastdecode import get_decoder
+from switchboardpy.history import (
+    HISTORY_CHUNK_ROWS,
+    HISTORY_SLICE_MIN_ROWS,
+    AggregatorHistory,
+    AggregatorHistoryRow,
+    decode_history,
+    history_num_rows,
+    iter_history_chunks,
+    read_history_range
+)
+from switchboardpy.program import get_program_context
 from switchboardpy.oraclequeue import OracleQueueAccount
 from switchboardpy.oracle import OracleAccount
 from switchboardpy.job import JobAccount
@@ -148,35 +168,21 @@ class AggregatorInitParams:
     authority: PublicKey = None
 
 
-@dataclass
-class AggregatorHistoryRow:
-    """AggregatorHistoryRow is a wrapper for the row structure of elements in the aggregator history buffer.
-    
-    Attributes:
-        timestamp (int): timestamp of the aggregator result
-        value (Decimal): Aggregator value at the timestamp
-    """
-    timestamp: int
-    value: Decimal
-    
-    """
-    Generate an AggregatorHistoryRow from a retrieved buffer representation
+# Latest confirmed result of an aggregator
+class AggregatorLatestValue(NamedTuple):
 
-    Args:
-        buf (list): Anchor-loaded buffer representation of AggregatorHistoryRow
+    """Latest confirmed feed value"""
+    value: Decimal
 
-    Returns:
-        AggregatorHistoryRow
-    """
-    @staticmethod
-    def from_buffer(buf: bytes):
-        timestamp: int = struct.unpack_from("<L", buf[:8])[0]
-        mantissa: int = struct.unpack_from("<L", buf[8:24])[0]
-        scale: int = struct.unpack_from("<L", buf, 24)[0]
-        decimal = SwitchboardDecimal.sbd_to_decimal({"mantissa": mantissa, "scale": scale})
-        res = AggregatorHistoryRow(timestamp, decimal)
-        return res
+    """Open timestamp of the latest confirmed round"""
+    timestamp: int
 
+# Fields of latest_confirmed_round read by the dataSlice latest value path
+LATEST_VALUE_FIELDS = [
+    "latest_confirmed_round.num_success",
+    "latest_confirmed_round.result",
+    "latest_confirmed_round.round_open_timestamp",
+]
 
 class AggregatorAccount:
     """AggregatorAccount is the wrapper for an Aggregator, the structure for that keeps aggregated feed data / metadata.
@@ -226,62 +232,148 @@ class AggregatorAccount:
         AccountInvalidDiscriminator: If the discriminator doesn't match the IDL.
     """
     async def load_data(self):
-        aggregator = await self.program.account["AggregatorAccountData"].fetch(self.public_key)
-        aggregator.ebuf = None
-        return aggregator
+        return await fetch_account(self.program, "AggregatorAccountData", self.public_key)
 
     """
-    Get AggregatorAccount historical data 
+    Load and parse many AggregatorAccounts at once with batched getMultipleAccounts calls.
+
+    Args:
+        program (anchorpy.Program): Switchboard program representation holding connection and IDL
+        pubkeys (list[PublicKey]): aggregator pubkeys to load
 
     Returns:
-        name (AggregatorAccount): data parsed in accordance with the
-            Switchboard IDL.
+        list[Any | Exception]: data parsed in accordance with the Switchboard IDL,
+            or the error raised for that pubkey, in input order
+    """
+    @staticmethod
+    async def load_many(program: anchorpy.Program, pubkeys: list[PublicKey]):
+        return await load_many_accounts(program, "AggregatorAccountData", pubkeys)
+
+    """
+    Get AggregatorAccount historical data
+
+    Returns:
+        AggregatorHistory: timestamps / values arrays ordered oldest to newest,
+            Decimal values are produced lazily on access.
 
     Args:
-        aggregator (Any): Optional aggregator 
+        aggregator (Any): Optional aggregator
 
     Raises:
         AccountDoesNotExistError: If the account doesn't exist.
         AccountInvalidDiscriminator: If the discriminator doesn't match the IDL.
     """
-    async def load_history(self, aggregator: Any = None) -> Any:
+    async def load_history(self, aggregator: Any = None) -> AggregatorHistory:
 
         # if aggregator data passed in - use that, else load this aggregator
         aggregator = aggregator if aggregator else await self.load_data()
 
         # Compare History Buffer to default public key (zeroed out)
-        if (aggregator.history_buffer == 11111111111111111111111111111111):
-            return []
+        if aggregator.history_buffer == PublicKey('11111111111111111111111111111111'):
+            return decode_history(b'')
+        return decode_history(await self._load_history_buffer(aggregator.history_buffer))
 
-        # Fixed AggregatorHistoryRow size
-        ROW_SIZE = 28
+    async def _load_history_buffer(self, history_buffer: PublicKey) -> bytes:
+        info = await self.program.provider.connection.get_account_info(history_buffer, encoding="base64")
+        value = info["result"]["value"]
+        data = account_info_bytes(value) if value else b''
+        # history buffers never change size, remember it to read them with dataSlice later on
+        get_program_extensions(self.program).setdefault("history_sizes", {})[bytes(history_buffer)] = len(data)
+        return data
 
-        # Get account data
-        info = await self.program.provider.connection.get_account_info(aggregator.history_buffer) 
-        buffer = info.data if info else []
-        if not buffer or buffer.length < 12:
-            return []
-        
-        # Read UInt32 as a Little Endian val, starting at position 8
-        insert_idx: int = struct.unpack_from("<L", buffer, 8)[0] * ROW_SIZE
+    def _history_slice_rows(self, history_buffer: PublicKey, slice_min_rows: int) -> Optional[int]:
+        # number of rows of a buffer to read with dataSlice, None to download it whole
+        size = get_program_extensions(self.program).get("history_sizes", {}).get(bytes(history_buffer))
+        if size is not None and history_num_rows(size) >= slice_min_rows:
+            return history_num_rows(size)
+        return None
 
-        front = []
-        tail = []
+    """
+    Load the history rows with since <= timestamp < until.
 
-        if not isinstance(buffer, list):
-            return []
-        
-        for i in range(13, buffer.length, ROW_SIZE):
-            if i + ROW_SIZE > buffer.length:
-                break
-            row = AggregatorHistoryRow.from_buffer(buffer)
-            if row.timestamp == 0:
-                break
-            if i <= insert_idx:
-                tail.append(row)
-            else:
-                front.append(row)
-        return front.extend(tail)
+    The range is found by binary search over the chronological order of the
+    buffer. Buffers of at least slice_min_rows rows whose size is already known
+    (from a previous history load) are not downloaded: only the byte ranges
+    needed are fetched with dataSlice.
+
+    Args:
+        since (int | None): first timestamp included
+        until (int | None): first timestamp excluded
+        last (int | None): maximum number of rows, the most recent ones are kept
+        aggregator (Any): Optional aggregator
+        slice_min_rows (int): minimum buffer rows to read with dataSlice
+
+    Returns:
+        AggregatorHistory: rows in range ordered oldest to newest
+
+    Raises:
+        AccountDoesNotExistError: If the account doesn't exist.
+        AccountInvalidDiscriminator: If the discriminator doesn't match the IDL.
+    """
+    async def load_history_range(
+        self,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        last: Optional[int] = None,
+        aggregator: Any = None,
+        slice_min_rows: int = HISTORY_SLICE_MIN_ROWS
+    ) -> AggregatorHistory:
+        aggregator = aggregator if aggregator else await self.load_data()
+        history_buffer = aggregator.history_buffer
+        if history_buffer == PublicKey('11111111111111111111111111111111'):
+            return decode_history(b'')
+        num_rows = self._history_slice_rows(history_buffer, slice_min_rows)
+        if num_rows is not None:
+            return await read_history_range(self.program.provider.connection, history_buffer, num_rows, since, until, last)
+        return decode_history(await self._load_history_buffer(history_buffer)).select(since, until, last)
+
+    """
+    Lazily produce the history rows with since <= timestamp < until, oldest
+    first, see load_history_range. Buffers read with dataSlice are fetched
+    chunk_rows rows at a time, each chunk produced as soon as it arrives;
+    other buffers are downloaded whole and their rows decoded as they are produced.
+
+    Args:
+        since (int | None): first timestamp included
+        until (int | None): first timestamp excluded
+        last (int | None): maximum number of rows, the most recent ones are kept
+        aggregator (Any): Optional aggregator
+        slice_min_rows (int): minimum buffer rows to read with dataSlice
+        chunk_rows (int): maximum number of rows fetched per dataSlice request
+
+    Returns:
+        AsyncIterator[AggregatorHistoryRow]
+
+    Raises:
+        AccountDoesNotExistError: If the account doesn't exist.
+        AccountInvalidDiscriminator: If the discriminator doesn't match the IDL.
+
+    Example:
+        async for row in aggregator.iter_history(since=int(time.time()) - 3600):
+            print(row.timestamp, row.value)
+    """
+    async def iter_history(
+        self,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        last: Optional[int] = None,
+        aggregator: Any = None,
+        slice_min_rows: int = HISTORY_SLICE_MIN_ROWS,
+        chunk_rows: int = HISTORY_CHUNK_ROWS
+    ) -> AsyncIterator[AggregatorHistoryRow]:
+        aggregator = aggregator if aggregator else await self.load_data()
+        history_buffer = aggregator.history_buffer
+        if history_buffer == PublicKey('11111111111111111111111111111111'):
+            return
+        num_rows = self._history_slice_rows(history_buffer, slice_min_rows)
+        if num_rows is None:
+            for row in decode_history(await self._load_history_buffer(history_buffer)).iter_rows(since, until, last):
+                yield row
+            return
+        connection = self.program.provider.connection
+        async for chunk in iter_history_chunks(connection, history_buffer, num_rows, since, until, last, chunk_rows):
+            for row in chunk:
+                yield row
 
     """
     Get the latest confirmed value stored in the aggregator account. 
@@ -304,6 +396,81 @@ class AggregatorAccount:
         return SwitchboardDecimal.sbd_to_decimal(aggregator.latest_confirmed_round.result)
 
 
+    """
+    Decode the latest value from a latest_confirmed_round slice of the account.
+
+    Args:
+        program (anchorpy.Program): Switchboard program representation holding connection and IDL
+        value (Any): RPC account info value of the slice, None if the account doesn't exist
+        public_key (PublicKey): aggregator pubkey, used for error reporting
+
+    Returns:
+        AggregatorLatestValue
+    """
+    @staticmethod
+    def _latest_value_from_slice(program: anchorpy.Program, value: Any, public_key: PublicKey) -> AggregatorLatestValue:
+        if not value:
+            raise AccountDoesNotExistError(f"Account {public_key} does not exist")
+        if value["owner"] != str(program.program_id):
+            raise AccountInvalidDiscriminator(f"Account {public_key} is not owned by the Switchboard program")
+        decoder = get_decoder(program, "AggregatorAccountData")
+        offset, _ = decoder.field_offset("latest_confirmed_round")
+        fields = decoder.decode_fields(account_info_bytes(value), LATEST_VALUE_FIELDS, base=offset)
+        if fields["latest_confirmed_round.num_success"] == 0:
+            raise ValueError('Aggregator currently holds no value.')
+        return AggregatorLatestValue(
+            SwitchboardDecimal.sbd_to_decimal(fields["latest_confirmed_round.result"]),
+            fields["latest_confirmed_round.round_open_timestamp"]
+        )
+
+    """
+    Get the latest confirmed value and its round timestamp, downloading only the
+    latest_confirmed_round bytes of the account (dataSlice at its IDL offset)
+    instead of the whole aggregator.
+
+    Returns:
+        AggregatorLatestValue: the latest feed value and round open timestamp
+
+    Raises:
+        ValueError: If the aggregator currently holds no value
+        AccountDoesNotExistError: If the account doesn't exist.
+        AccountInvalidDiscriminator: If the account isn't owned by the program.
+    """
+    async def get_latest_value_fast(self) -> AggregatorLatestValue:
+        offset, length = get_decoder(self.program, "AggregatorAccountData").field_offset("latest_confirmed_round")
+        response = await self.program.provider.connection.get_account_info(
+            self.public_key,
+            encoding="base64",
+            data_slice=DataSliceOpts(offset=offset, length=length)
+        )
+        return AggregatorAccount._latest_value_from_slice(self.program, response["result"]["value"], self.public_key)
+
+    """
+    Batched get_latest_value_fast: read the latest_confirmed_round slice of many
+    aggregators with getMultipleAccounts.
+
+    Args:
+        program (anchorpy.Program): Switchboard program representation holding connection and IDL
+        pubkeys (list[PublicKey]): aggregator pubkeys
+
+    Returns:
+        list[AggregatorLatestValue | Exception]: latest value of each aggregator or the
+            error raised for it, in input order
+    """
+    @staticmethod
+    async def get_latest_values_fast(program: anchorpy.Program, pubkeys: list[PublicKey]) -> list[Any]:
+        offset, length = get_decoder(program, "AggregatorAccountData").field_offset("latest_confirmed_round")
+        values = await get_multiple_account_infos(program, pubkeys, data_slice=DataSliceOpts(offset=offset, length=length))
+        results: list[Any] = []
+        for pubkey, value in zip(pubkeys, values):
+            try:
+                if isinstance(value, Exception):
+                    raise value
+                results.append(AggregatorAccount._latest_value_from_slice(program, value, pubkey))
+            except Exception as e:
+                results.append(e)
+        return results
+
     """
     Get the timestamp latest confirmed round stored in the aggregator account. 
     
@@ -337,20 +504,20 @@ class AggregatorAccount:
     """
     @staticmethod
     def should_report_value(value: Decimal, aggregator: Optional[Any] = None) -> bool:
-        if aggregator.latestConfirmedRound and aggregator.latest_confirmed_round.num_success == 0:
+        if aggregator.latest_confirmed_round and aggregator.latest_confirmed_round.num_success == 0:
             return True
-        timestamp = round(int(time.time()) / 1000)
+        timestamp = int(time.time())
         if aggregator.start_after > timestamp:
             return False
-        variance_threshold = SwitchboardDecimal.sbd_to_decimal(aggregator.variance_threshold)
-        latest_result = SwitchboardDecimal.sbd_to_decimal(aggregator.latest_confirmed_round.result)
         force_report_period = aggregator.force_report_period
         last_timestamp = aggregator.latest_confirmed_round.round_open_timestamp
         if last_timestamp + force_report_period < timestamp:
             return True
-        if value < latest_result - variance_threshold:
-            return True
-        if value > latest_result + variance_threshold:
+        if SwitchboardDecimal.exceeds_threshold(
+            SwitchboardDecimal.from_decimal(value),
+            aggregator.latest_confirmed_round.result,
+            aggregator.variance_threshold
+        ):
             return True
         return False
 
@@ -371,14 +538,19 @@ class AggregatorAccount:
         aggregator = aggregator if aggregator else await self.load_data()
         if hasattr(aggregator, 'latest_confirmed_round') and aggregator.latest_confirmed_round.num_success == 0:
             raise ValueError('Aggregator currently holds no value.')
-        results: list[Any] = []
-        for i in range(aggregator.oracle_request_batch_size):
-            if aggregator.latest_confirmed_round.medians_filfilled[i]:
-                results.append({
-                    "oracle_account": OracleAccount(AccountParams(program=self.program, public_key=aggregator.latest_confirmed_round.oracle_pubkeys_data[i])),
-                    "value": SwitchboardDecimal.sbd_to_decimal(aggregator.latest_confirmed_round.medians_data[i])
-                })
-        return results
+        confirmed_round = aggregator.latest_confirmed_round
+        fulfilled = [i for i in range(aggregator.oracle_request_batch_size) if confirmed_round.medians_fulfilled[i]]
+        values = SwitchboardDecimal.to_decimal_many(
+            [confirmed_round.medians_data[i].mantissa for i in fulfilled],
+            [confirmed_round.medians_data[i].scale for i in fulfilled]
+        )
+        return [
+            {
+                "oracle_account": OracleAccount(AccountParams(program=self.program, public_key=confirmed_round.oracle_pubkeys_data[i])),
+                "value": value
+            }
+            for i, value in zip(fulfilled, values)
+        ]
 
     """
     Get the hash of a list of OracleJobs
@@ -473,8 +645,9 @@ class AggregatorAccount:
         aggregator_account = aggregator_init_params.keypair or Keypair.generate()
         authority = aggregator_init_params.authority or aggregator_account.public_key
         size = program.account["AggregatorAccountData"].size
-        state_account, state_bump = ProgramStateAccount.from_seed(program)
-        state = await state_account.load_data()
+        context = get_program_context(program)
+        state_account, state_bump = context.state_account, context.state_bump
+        author_wallet = aggregator_init_params.author_wallet or await context.token_vault()
         response = await program.provider.connection.get_minimum_balance_for_rent_exemption(size)
         lamports = response["result"]
         zero_decimal = program.type['SwitchboardDecimal'](0, 0)
@@ -498,7 +671,7 @@ class AggregatorAccount:
                     "aggregator": aggregator_account.public_key,
                     "authority": authority,
                     "queue": aggregator_init_params.queue_account.public_key,
-                    "author_wallet": aggregator_init_params.author_wallet or state.token_vault,
+                    "author_wallet": author_wallet,
                     "program_state": state_account.public_key
                 },
                 signers=[aggregator_account],
@@ -701,12 +874,13 @@ class AggregatorAccount:
         TransactionSignature
     """
     async def save_result_txn(self, aggregator: Any, oracle_account: OracleAccount, params: AggregatorSaveResultParams):
-        payer_keypair = Keypair.from_secret_key(self.program.provider.wallet.payer.secret_key)
+        context = get_program_context(self.program)
+        payer_keypair = context.payer
         remaining_accounts: list[PublicKey] = []
         for i in range(aggregator.oracle_request_batch_size):
             remaining_accounts.append(aggregator.current_round.oracle_pubkeys_data[i])
         for oracle in params.oracles:
-            remaining_accounts.push(oracle.token_account)
+            remaining_accounts.append(oracle.token_account)
         queue_pubkey = aggregator.queue_pubkey
         queue_account = OracleQueueAccount(AccountParams(program=self.program, public_key=queue_pubkey))
         lease_account, lease_bump = LeaseAccount.from_seed(
@@ -727,8 +901,8 @@ class AggregatorAccount:
             queue_account.public_key,
             oracle_account.public_key
         )
-        program_state_account, state_bump = ProgramStateAccount.from_seed(self.program)
-        digest = await self.produce_job_hash(params.jobs).digest()
+        program_state_account, state_bump = context.state_account, context.state_bump
+        digest = self.produce_job_hash(params.jobs).digest()
         history_buffer = aggregator.history_buffer
         if history_buffer == PublicKey('11111111111111111111111111111111'):
             history_buffer = self.public_key
@@ -0,0 +1,311 @@
+import math
+import numpy as np
+
+from typing import Optional
+
+from switchboardpy.history import AggregatorHistory
+
+# Largest cumulative decay exponentiated at once by Ema, e ** 300 is far from overflowing a float64.
+_MAX_DECAY = 300.0
+
+class Twap:
+    """Time-weighted average price. Each row's value holds from its timestamp until
+    the next row's, and the average at a row covers the window seconds before it,
+    or everything since the first row without a window.
+
+    Attributes:
+        window (float | None): averaging window in seconds, None for a cumulative average
+        value (float | None): average at the latest row, None before any row
+    """
+
+    def __init__(self, window: Optional[float] = None):
+        self.window = window
+        self.reset()
+
+    """
+    Forget every row seen.
+    """
+    def reset(self):
+        self.value: Optional[float] = None
+        self._first_timestamp: Optional[float] = None
+        # timestamps, values and areas under the curve since the first row, of the rows
+        # still needed to compute the average of the next ones
+        self._timestamps = np.empty(0)
+        self._values = np.empty(0)
+        self._areas = np.empty(0)
+
+    """
+    Add rows newer than the ones already seen.
+
+    Args:
+        timestamps (np.ndarray): row timestamps, ascending
+        values (np.ndarray): row values
+
+    Returns:
+        np.ndarray: average at each row
+    """
+    def update(self, timestamps: np.ndarray, values: np.ndarray) -> np.ndarray:
+        if len(values) == 0:
+            return np.empty(0)
+        seen = len(self._timestamps)
+        t = np.concatenate([self._timestamps, np.asarray(timestamps, dtype=np.float64)])
+        v = np.concatenate([self._values, np.asarray(values, dtype=np.float64)])
+        if self._first_timestamp is None:
+            self._first_timestamp = t[0]
+            areas = np.concatenate([[0.0], np.cumsum(v[:-1] * np.diff(t))])
+        else:
+            areas = np.concatenate([self._areas, self._areas[-1] + np.cumsum(v[seen - 1:-1] * np.diff(t[seen - 1:]))])
+
+        new_t = t[seen:]
+        if self.window is None:
+            starts = np.full(len(new_t), self._first_timestamp)
+            start_areas = np.zeros(len(new_t))
+        else:
+            starts = np.maximum(new_t - self.window, self._first_timestamp)
+            j = np.searchsorted(t, starts, side="right") - 1
+            start_areas = areas[j] + v[j] * (starts - t[j])
+        durations = new_t - starts
+        with np.errstate(invalid="ignore", divide="ignore"):
+            averages = np.where(durations > 0, (areas[seen:] - start_areas) / durations, v[seen:])
+
+        keep = len(t) - 1 if self.window is None else max(0, int(np.searchsorted(t, t[-1] - self.window, side="right")) - 1)
+        self._timestamps, self._values, self._areas = t[keep:], v[keep:], areas[keep:]
+        self.value = float(averages[-1])
+        return averages
+
+class Ema:
+    """Exponential moving average, either per row (span) or time-weighted
+    (half_life, so that irregularly spaced rows decay by the time between them).
+
+    Attributes:
+        half_life (float | None): seconds after which a value's weight halves
+        span (int | None): number of rows, the smoothing factor is 2 / (span + 1)
+        value (float | None): average at the latest row, None before any row
+    """
+
+    def __init__(self, half_life: Optional[float] = None, span: Optional[int] = None):
+        if (half_life is None) == (span is None):
+            raise ValueError('Ema requires exactly one of half_life or span.')
+        self.half_life = half_life
+        self.span = span
+        self.reset()
+
+    """
+    Forget every row seen.
+    """
+    def reset(self):
+        self.value: Optional[float] = None
+        self._last_timestamp: Optional[float] = None
+
+    """
+    Add rows newer than the ones already seen.
+
+    Args:
+        timestamps (np.ndarray): row timestamps, ascending
+        values (np.ndarray): row values
+
+    Returns:
+        np.ndarray: average at each row
+    """
+    def update(self, timestamps: np.ndarray, values: np.ndarray) -> np.ndarray:
+        n = len(values)
+        averages = np.empty(n)
+        if n == 0:
+            return averages
+        x = np.asarray(values, dtype=np.float64)
+        t = np.asarray(timestamps, dtype=np.float64)
+        if self.half_life is not None:
+            previous = t[0] if self._last_timestamp is None else self._last_timestamp
+            decays = np.diff(t, prepend=previous) * (math.log(2) / self.half_life)
+        else:
+            decays = np.full(n, -math.log1p(-2 / (self.span + 1)))
+        decays = np.minimum(decays, _MAX_DECAY)
+
+        i = 0
+        average = self.value
+        if average is None:
+            average = averages[0] = x[0]
+            i = 1
+        # y_k = exp(-d_k) y_k-1 + (1 - exp(-d_k)) x_k, i.e. relative to the row before a block
+        # y_k = exp(-D_k) (y + sum of (1 - exp(-d_j)) exp(D_j) x_j), D being the cumulative decay
+        while i < n:
+            cumulative = np.cumsum(decays[i:])
+            end = i + max(1, int(np.searchsorted(cumulative, _MAX_DECAY, side="right")))
+            cumulative = cumulative[:end - i]
+            weights = -np.expm1(-decays[i:end]) * np.exp(cumulative)
+            averages[i:end] = np.exp(-cumulative) * (average + np.cumsum(weights * x[i:end]))
+            average = averages[end - 1]
+            i = end
+
+        self._last_timestamp = t[-1]
+        self.value = float(averages[-1])
+        return averages
+
+class RollingStd:
+    """Standard deviation of the values of the last window rows, from prefix sums
+    of the values rebased on every update.
+
+    Attributes:
+        window (int): number of rows
+        ddof (int): delta degrees of freedom, 1 for the sample standard deviation
+        value (float | None): standard deviation at the latest row, None before any row
+    """
+
+    def __init__(self, window: int, ddof: int = 0):
+        self.window = window
+        self.ddof = ddof
+        self.reset()
+
+    """
+    Forget every row seen.
+    """
+    def reset(self):
+        self.value: Optional[float] = None
+        self._tail = np.empty(0)
+
+    """
+    Add rows newer than the ones already seen.
+
+    Args:
+        timestamps (np.ndarray): row timestamps, ascending
+        values (np.ndarray): row values
+
+    Returns:
+        np.ndarray: standard deviation at each row, nan while fewer than ddof + 1 rows were seen
+    """
+    def update(self, timestamps: np.ndarray, values: np.ndarray) -> np.ndarray:
+        if len(values) == 0:
+            return np.empty(0)
+        seen = len(self._tail)
+        x = np.concatenate([self._tail, np.asarray(values, dtype=np.float64)])
+        shifted = x - x[0]
+        sums = np.concatenate([[0.0], np.cumsum(shifted)])
+        squares = np.concatenate([[0.0], np.cumsum(shifted * shifted)])
+        ends = np.arange(seen, len(x)) + 1
+        starts = np.maximum(ends - self.window, 0)
+        counts = ends - starts
+        total = sums[ends] - sums[starts]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            variances = (squares[ends] - squares[starts] - total * total / counts) / (counts - self.ddof)
+        deviations = np.where(counts > self.ddof, np.sqrt(np.maximum(variances, 0.0)), np.nan)
+        self._tail = x[max(0, len(x) - self.window + 1):] if self.window > 1 else np.empty(0)
+        self.value = float(deviations[-1])
+        return deviations
+
+class RollingMin:
+    """Minimum of the values of the last window rows, with the van Herk / Gil-Werman
+    block prefix / suffix scans: three comparisons per row whatever the window.
+
+    Attributes:
+        window (int): number of rows
+        value (float | None): minimum at the latest row, None before any row
+    """
+
+    _ufunc = np.minimum
+    _fill = np.inf
+
+    def __init__(self, window: int):
+        self.window = window
+        self.reset()
+
+    """
+    Forget every row seen.
+    """
+    def reset(self):
+        self.value: Optional[float] = None
+        self._tail = np.empty(0)
+
+    """
+    Add rows newer than the ones already seen.
+
+    Args:
+        timestamps (np.ndarray): row timestamps, ascending
+        values (np.ndarray): row values
+
+    Returns:
+        np.ndarray: extreme at each row
+    """
+    def update(self, timestamps: np.ndarray, values: np.ndarray) -> np.ndarray:
+        if len(values) == 0:
+            return np.empty(0)
+        seen = len(self._tail)
+        x = np.concatenate([self._tail, np.asarray(values, dtype=np.float64)])
+        ufunc, window = self._ufunc, self.window
+        blocks = np.concatenate([x, np.full(-len(x) % window, self._fill)]).reshape(-1, window)
+        prefix = ufunc.accumulate(blocks, axis=1).ravel()
+        suffix = ufunc.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+        ends = np.arange(seen, len(x))
+        starts = ends - window + 1
+        # windows cut short by the start of the history sit within the first block
+        running = ufunc.accumulate(x[:window])
+        extremes = np.where(
+            starts < 0,
+            running[np.minimum(ends, window - 1)],
+            ufunc(suffix[np.maximum(starts, 0)], prefix[ends])
+        )
+        self._tail = x[max(0, len(x) - window + 1):] if window > 1 else np.empty(0)
+        self.value = float(extremes[-1])
+        return extremes
+
+class RollingMax(RollingMin):
+    """Maximum of the values of the last window rows, see RollingMin.
+
+    Attributes:
+        window (int): number of rows
+        value (float | None): maximum at the latest row, None before any row
+    """
+
+    _ufunc = np.maximum
+    _fill = -np.inf
+
+class HistoryAnalytics:
+    """Named statistics kept up to date over an aggregator history. Every update
+    only feeds the statistics the rows newer than the last timestamp seen.
+
+    Attributes:
+        statistics (dict[str, Twap | Ema | RollingStd | RollingMin | RollingMax]): statistics by name
+        last_timestamp (int | None): timestamp of the latest row seen
+
+    Example:
+        analytics = HistoryAnalytics(twap=Twap(3600), ema=Ema(half_life=600), std=RollingStd(100))
+        analytics.update(await aggregator.load_history())
+        print(analytics.snapshot())
+    """
+
+    def __init__(self, **statistics):
+        self.statistics = statistics
+        self.last_timestamp: Optional[int] = None
+
+    """
+    Feed the statistics the rows of a history newer than the last one seen.
+
+    Args:
+        history (AggregatorHistory): history, e.g. from AggregatorAccount.load_history
+
+    Returns:
+        dict[str, np.ndarray]: value of each statistic at every new row
+    """
+    def update(self, history: AggregatorHistory) -> dict:
+        start = 0 if self.last_timestamp is None else history.index_range(since=self.last_timestamp + 1)[0]
+        timestamps = history.timestamps[start:]
+        values = history.values[start:]
+        if len(timestamps):
+            self.last_timestamp = int(timestamps[-1])
+        return {name: statistic.update(timestamps, values) for name, statistic in self.statistics.items()}
+
+    """
+    Get the latest value of each statistic.
+
+    Returns:
+        dict[str, float | None]
+    """
+    def snapshot(self) -> dict:
+        return {name: statistic.value for name, statistic in self.statistics.items()}
+
+    """
+    Forget every row seen.
+    """
+    def reset(self):
+        self.last_timestamp = None
+        for statistic in self.statistics.values():
+            statistic.reset()
@@ -0,0 +1,180 @@
+import mmap
+import os
+import struct
+import numpy as np
+
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from solana.publickey import PublicKey
+
+from switchboardpy.aggregator import AggregatorAccount
+from switchboardpy.history import HISTORY_ROW_DTYPE, HISTORY_ROW_SIZE, AggregatorHistory, decode_history
+
+# File name suffix of the archive of one aggregator.
+ARCHIVE_SUFFIX = ".history"
+
+class HistoryArchive:
+    """Local, unbounded history of aggregators, kept across restarts.
+
+    Each aggregator has an append-only file of HISTORY_ROW_SIZE byte records,
+    in the on-chain AggregatorHistoryRow layout, ordered by strictly increasing
+    timestamp. Rows are appended from the history buffer of the aggregator and
+    read back through a memory map, ranges being found by binary search over
+    the mapped records. An archive expects a single writer per aggregator.
+
+    Attributes:
+        directory (Path): directory holding one file per aggregator
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    """
+    Get the archive file of an aggregator.
+
+    Args:
+        aggregator (PublicKey): aggregator account pubkey
+
+    Returns:
+        Path
+    """
+    def path(self, aggregator: PublicKey) -> Path:
+        return self.directory / f"{aggregator}{ARCHIVE_SUFFIX}"
+
+    """
+    List the aggregators with an archive.
+
+    Returns:
+        list[PublicKey]
+    """
+    def aggregators(self) -> list[PublicKey]:
+        return [PublicKey(path.name[:-len(ARCHIVE_SUFFIX)]) for path in sorted(self.directory.glob(f"*{ARCHIVE_SUFFIX}"))]
+
+    """
+    Get the number of archived rows of an aggregator.
+
+    Args:
+        aggregator (PublicKey): aggregator account pubkey
+
+    Returns:
+        int
+    """
+    def count(self, aggregator: PublicKey) -> int:
+        try:
+            return os.path.getsize(self.path(aggregator)) // HISTORY_ROW_SIZE
+        except FileNotFoundError:
+            return 0
+
+    """
+    Get the timestamp of the latest archived row of an aggregator.
+
+    Args:
+        aggregator (PublicKey): aggregator account pubkey
+
+    Returns:
+        int | None: None if nothing is archived
+    """
+    def last_timestamp(self, aggregator: PublicKey) -> Optional[int]:
+        count = self.count(aggregator)
+        if count == 0:
+            return None
+        with open(self.path(aggregator), "rb") as f:
+            f.seek((count - 1) * HISTORY_ROW_SIZE)
+            return struct.unpack("<q", f.read(8))[0]
+
+    """
+    Append the rows of a history newer than the latest archived one.
+
+    Args:
+        aggregator (PublicKey): aggregator account pubkey
+        history (AggregatorHistory): history, e.g. from AggregatorAccount.load_history
+
+    Returns:
+        int: number of rows appended
+    """
+    def append(self, aggregator: PublicKey, history: AggregatorHistory) -> int:
+        path = self.path(aggregator)
+        # drop a record left incomplete by an interrupted append
+        size = os.path.getsize(path) if path.exists() else 0
+        if size % HISTORY_ROW_SIZE:
+            os.truncate(path, size - size % HISTORY_ROW_SIZE)
+        last = self.last_timestamp(aggregator)
+        timestamps = history.timestamps
+        previous = np.maximum.accumulate(np.concatenate([[0 if last is None else last], timestamps[:-1]]))
+        keep = timestamps > previous
+        count = int(keep.sum())
+        if count:
+            with open(path, "ab") as f:
+                offset = 0
+                for segment in history.segments:
+                    f.write(segment[keep[offset:offset + len(segment)]].tobytes())
+                    offset += len(segment)
+        return count
+
+    """
+    Fetch the history rows of an aggregator newer than the latest archived one
+    and append them.
+
+    Args:
+        aggregator_account (AggregatorAccount): aggregator to archive
+        aggregator (Any): Optional aggregator
+
+    Returns:
+        int: number of rows appended
+
+    Raises:
+        AccountDoesNotExistError: If the account doesn't exist.
+        AccountInvalidDiscriminator: If the discriminator doesn't match the IDL.
+    """
+    async def sync(self, aggregator_account: AggregatorAccount, aggregator: Any = None) -> int:
+        last = self.last_timestamp(aggregator_account.public_key)
+        history = await aggregator_account.load_history_range(
+            since=None if last is None else last + 1,
+            aggregator=aggregator
+        )
+        return self.append(aggregator_account.public_key, history)
+
+    """
+    Read the archived rows with since <= timestamp < until of an aggregator.
+    The rows and timestamps are views over a read-only memory map of the
+    archive, only the records in range are paged in; the values are computed
+    from them into a new array.
+
+    Args:
+        aggregator (PublicKey): aggregator account pubkey
+        since (int | None): first timestamp included
+        until (int | None): first timestamp excluded
+        last (int | None): maximum number of rows, the most recent ones are kept
+
+    Returns:
+        AggregatorHistory: rows in range ordered oldest to newest
+    """
+    def read(
+        self,
+        aggregator: PublicKey,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        last: Optional[int] = None
+    ) -> AggregatorHistory:
+        count = self.count(aggregator)
+        if count == 0:
+            return decode_history(b'')
+        with open(self.path(aggregator), "rb") as f:
+            mapped = mmap.mmap(f.fileno(), count * HISTORY_ROW_SIZE, access=mmap.ACCESS_READ)
+        start = 0 if since is None else _lower_bound(mapped, since, 0, count)
+        stop = count if until is None else _lower_bound(mapped, until, start, count)
+        if last is not None:
+            start = max(start, stop - last)
+        rows = np.frombuffer(mapped, dtype=HISTORY_ROW_DTYPE, count=stop - start, offset=start * HISTORY_ROW_SIZE)
+        return AggregatorHistory(rows)
+
+def _lower_bound(mapped: Any, timestamp: int, lo: int, hi: int) -> int:
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if struct.unpack_from("<q", mapped, mid * HISTORY_ROW_SIZE)[0] < timestamp:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
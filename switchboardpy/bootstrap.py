@@ -0,0 +1,173 @@
+import anchorpy
+import hashlib
+import json
+import os
+
+from pathlib import Path
+from typing import Optional, Union
+
+from anchorpy import Idl, Program, Provider
+from solana.publickey import PublicKey
+
+from switchboardpy.common import SBV2_DEVNET_PID
+
+# Switchboard v2 IDL fetched from chain and shipped with the package, written by update_bundled_idl.
+BUNDLED_IDL_PATH = Path(__file__).parent / "idl" / "switchboard_v2.json"
+
+# Program id, RPC endpoint and hash the bundled IDL was fetched with.
+BUNDLED_IDL_SOURCE_PATH = BUNDLED_IDL_PATH.with_suffix(".source.json")
+
+# Directory of IDLs previously fetched from chain, stored by content hash.
+IDL_CACHE_DIR = Path(os.environ.get("SWITCHBOARDPY_IDL_CACHE", Path.home() / ".cache" / "switchboardpy" / "idl"))
+
+"""
+Get the content hash under which an IDL is cached.
+
+Args:
+    raw_idl (str): IDL json
+
+Returns:
+    str: hex encoded sha256 of the IDL json
+"""
+def idl_hash(raw_idl: str) -> str:
+    return hashlib.sha256(raw_idl.encode()).hexdigest()
+
+"""
+Read the cached IDL for a program. The cache holds one <hash>.json file per
+IDL version and a <program_id>.sha256 file pointing at the latest one.
+
+Args:
+    pid (PublicKey): program id
+    cache_dir (Path): IDL cache directory
+
+Returns:
+    str | None: IDL json, None if not cached or the cached copy is corrupt
+"""
+def read_cached_idl(pid: PublicKey, cache_dir: Path = IDL_CACHE_DIR) -> Optional[str]:
+    try:
+        digest = (cache_dir / f"{pid}.sha256").read_text().strip()
+        raw_idl = (cache_dir / f"{digest}.json").read_text()
+    except OSError:
+        return None
+    if idl_hash(raw_idl) != digest:
+        return None
+    return raw_idl
+
+"""
+Store an IDL in the on-disk cache and point the program at it.
+
+Args:
+    pid (PublicKey): program id
+    raw_idl (str): IDL json
+    cache_dir (Path): IDL cache directory
+
+Returns:
+    str: hash of the cached IDL
+"""
+def write_cached_idl(pid: PublicKey, raw_idl: str, cache_dir: Path = IDL_CACHE_DIR) -> str:
+    digest = idl_hash(raw_idl)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    (cache_dir / f"{digest}.json").write_text(raw_idl)
+    (cache_dir / f"{pid}.sha256").write_text(digest)
+    return digest
+
+"""
+Fetch the on-chain IDL of a program.
+
+Args:
+    provider (anchorpy.Provider): provider holding the RPC connection
+    pid (PublicKey): program id
+
+Returns:
+    str: IDL json
+"""
+async def fetch_idl(provider: Provider, pid: PublicKey = SBV2_DEVNET_PID) -> str:
+    return json.dumps(await Program.fetch_raw_idl(pid, provider), indent=2)
+
+"""
+Read the IDL bundled with the package.
+
+Args:
+    pid (PublicKey): program id
+
+Returns:
+    str | None: IDL json, None if none is bundled, it was fetched for another
+        program or does not match the hash recorded with it
+"""
+def read_bundled_idl(pid: PublicKey = SBV2_DEVNET_PID) -> Optional[str]:
+    try:
+        source = json.loads(BUNDLED_IDL_SOURCE_PATH.read_text())
+        raw_idl = BUNDLED_IDL_PATH.read_text()
+    except (OSError, ValueError):
+        return None
+    if source.get("program_id") != str(pid) or idl_hash(raw_idl) != source.get("sha256"):
+        return None
+    return raw_idl
+
+"""
+Fetch the on-chain IDL and overwrite the copy bundled with the package,
+recording the program id, RPC endpoint and hash it was fetched with next to it.
+
+Args:
+    provider (anchorpy.Provider): provider holding the RPC connection
+    pid (PublicKey): program id
+
+Returns:
+    str: hash of the bundled IDL
+"""
+async def update_bundled_idl(provider: Provider, pid: PublicKey = SBV2_DEVNET_PID) -> str:
+    raw_idl = await fetch_idl(provider, pid)
+    digest = idl_hash(raw_idl)
+    source = {
+        "program_id": str(pid),
+        "rpc_url": provider.connection._provider.endpoint_uri,
+        "sha256": digest,
+    }
+    BUNDLED_IDL_PATH.parent.mkdir(parents=True, exist_ok=True)
+    BUNDLED_IDL_PATH.write_text(raw_idl)
+    BUNDLED_IDL_SOURCE_PATH.write_text(json.dumps(source, indent=2))
+    return digest
+
+"""
+Build the Switchboard anchorpy.Program without fetching the IDL from chain.
+
+The IDL is taken, in order, from the idl argument, the on-disk cache and the
+copy bundled with the package by update_bundled_idl. The network is only used
+when fetch=True, in which case the fetched IDL also refreshes the cache.
+
+Args:
+    provider (anchorpy.Provider): provider holding the RPC connection
+    pid (PublicKey): program id, defaults to the devnet program
+    idl (Idl | str | None): IDL or IDL json to use
+    fetch (bool): fetch the IDL from chain
+    cache_dir (Path | None): IDL cache directory, None to disable the cache
+
+Returns:
+    anchorpy.Program
+
+Raises:
+    ValueError: If no IDL is available without going to the network.
+"""
+async def load_program(
+    provider: Provider,
+    pid: PublicKey = SBV2_DEVNET_PID,
+    idl: Optional[Union[Idl, str]] = None,
+    fetch: bool = False,
+    cache_dir: Optional[Path] = IDL_CACHE_DIR
+) -> anchorpy.Program:
+    if idl is None:
+        raw_idl = None
+        if fetch:
+            raw_idl = await fetch_idl(provider, pid)
+            if cache_dir is not None:
+                write_cached_idl(pid, raw_idl, cache_dir)
+        if raw_idl is None and cache_dir is not None:
+            raw_idl = read_cached_idl(pid, cache_dir)
+        if raw_idl is None:
+            raw_idl = read_bundled_idl(pid)
+        if raw_idl is None:
+            raise ValueError('No Switchboard IDL available locally, call load_program with fetch=True.')
+        idl = raw_idl
+    if isinstance(idl, str):
+        idl = Idl.from_json(json.loads(idl))
+    return Program(idl, pid, provider)
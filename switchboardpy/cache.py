@@ -0,0 +1,287 @@
+import asyncio
+import base64
+import logging
+import time
+
+from typing import Any, NamedTuple, Optional, Union
+
+import anchorpy
+
+from cachetools import LRUCache
+from solana.publickey import PublicKey
+from solana.rpc.types import TxOpts
+from solana.transaction import Transaction
+
+from switchboardpy.common import get_program_extensions
+
+# Default number of accounts kept by an AccountCache.
+DEFAULT_ACCOUNT_CACHE_SIZE = 4096
+
+# Default seconds a decoded account stays fresh, by account type. Types missing
+# here (or with a ttl of 0) are never cached.
+DEFAULT_ACCOUNT_TTLS = {
+    "SbState": 300.0,
+    "JobAccountData": 300.0,
+    "PermissionAccountData": 60.0,
+    "OracleQueueAccountData": 30.0,
+    "LeaseAccountData": 30.0,
+    "OracleAccountData": 5.0,
+    "AggregatorAccountData": 2.0,
+    "CrankAccountData": 1.0,
+}
+
+logger = logging.getLogger(__name__)
+
+# A cached account
+class AccountCacheEntry(NamedTuple):
+    account_name: str
+    data: Any
+    expires_at: float
+    slot: Optional[int]
+
+# Counters describing the state of an AccountCache
+class AccountCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+class AccountCache:
+    """Bounded LRU cache of decoded accounts with per account type TTLs.
+
+    Once attached, every wrapper's load_data is served from the cache while an
+    entry is fresh. Accounts written by transactions sent through the program's
+    connection (provider.send, send_transaction and send_raw_transaction, which
+    CrankTurner uses) are invalidated, and are not cached again until the
+    transaction is confirmed: for sends with skip_confirmation, confirmation is
+    awaited in the background.
+
+    Attributes:
+        program (anchorpy.Program): Switchboard program representation holding connection and IDL
+        ttls (dict[str, float]): seconds an account stays fresh, by account type
+        hits (int): number of lookups served from the cache
+        misses (int): number of lookups which had to go to the RPC
+    """
+
+    def __init__(self, program: anchorpy.Program, ttls: Optional[dict] = None, maxsize: int = DEFAULT_ACCOUNT_CACHE_SIZE):
+        self.program = program
+        self.ttls = {**DEFAULT_ACCOUNT_TTLS, **(ttls or {})}
+        self.hits = 0
+        self.misses = 0
+        self._entries = LRUCache(maxsize=maxsize)
+        self._version = 0
+        self._provider: Any = None
+        self._connection: Any = None
+        self._overridden: Any = None
+        self._pending_writes: dict[bytes, int] = {}
+        self._confirmations: set = set()
+
+    """
+    Whether accounts of a type are cached.
+
+    Args:
+        account_name (str): IDL name of the account type
+
+    Returns:
+        bool
+    """
+    def caches(self, account_name: str) -> bool:
+        return self.ttls.get(account_name, 0) > 0
+
+    """
+    Get a fresh cached account.
+
+    Args:
+        account_name (str): IDL name of the account type
+        public_key (PublicKey): account pubkey
+
+    Returns:
+        Any | None: decoded account data, None if missing or expired
+    """
+    def get(self, account_name: str, public_key: PublicKey) -> Optional[Any]:
+        key = bytes(public_key)
+        entry = self._entries.get(key)
+        if entry is not None and entry.account_name == account_name:
+            if entry.expires_at > time.monotonic():
+                self.hits += 1
+                return entry.data
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    """
+    Get the invalidation counter, to pass to put() once a fetch started now completes.
+
+    Returns:
+        int
+    """
+    def version(self) -> int:
+        return self._version
+
+    """
+    Cache a decoded account.
+
+    Args:
+        account_name (str): IDL name of the account type
+        public_key (PublicKey): account pubkey
+        data (Any): decoded account data
+        slot (int | None): slot the account was read at
+        version (int | None): version() when the fetch started, the account is
+            not cached if anything was invalidated since
+    """
+    def put(self, account_name: str, public_key: PublicKey, data: Any, slot: Optional[int] = None, version: Optional[int] = None):
+        if not self.caches(account_name) or (version is not None and version != self._version):
+            return
+        if bytes(public_key) in self._pending_writes:
+            return
+        self._entries[bytes(public_key)] = AccountCacheEntry(
+            account_name,
+            data,
+            time.monotonic() + self.ttls[account_name],
+            slot
+        )
+
+    """
+    Drop cached accounts and any fetch of them in flight.
+
+    Args:
+        public_keys (list[PublicKey]): accounts to drop
+    """
+    def invalidate(self, public_keys: list):
+        keys = {bytes(public_key) for public_key in public_keys}
+        self._version += 1
+        for key in keys:
+            self._entries.pop(key, None)
+        in_flight = get_program_extensions(self.program).get("in_flight") if self._provider else None
+        if in_flight:
+            for in_flight_key in [k for k in in_flight if k[1] in keys]:
+                del in_flight[in_flight_key]
+
+    """
+    Drop every account read before a slot, e.g. once the program is known to
+    have changed state at that slot.
+
+    Args:
+        slot (int): oldest slot still considered current
+    """
+    def invalidate_before(self, slot: int):
+        self._version += 1
+        for key, entry in list(self._entries.items()):
+            if entry.slot is None or entry.slot < slot:
+                del self._entries[key]
+
+    """
+    Drop every cached account and reset the counters.
+    """
+    def clear(self):
+        self._version += 1
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    """
+    Get hit / miss counters and the size of the cache.
+
+    Returns:
+        AccountCacheInfo
+    """
+    def cache_info(self) -> AccountCacheInfo:
+        return AccountCacheInfo(self.hits, self.misses, int(self._entries.maxsize), len(self._entries))
+
+    """
+    Get the accounts written by sent transactions which are not confirmed yet,
+    and are therefore not cached.
+
+    Returns:
+        list[PublicKey]
+    """
+    def pending_writes(self) -> list[PublicKey]:
+        return [PublicKey(key) for key in self._pending_writes]
+
+    def _begin_write(self, public_keys: list):
+        for key in {bytes(public_key) for public_key in public_keys}:
+            self._pending_writes[key] = self._pending_writes.get(key, 0) + 1
+        self.invalidate(public_keys)
+
+    def _end_write(self, public_keys: list):
+        for key in {bytes(public_key) for public_key in public_keys}:
+            count = self._pending_writes.pop(key, 0) - 1
+            if count > 0:
+                self._pending_writes[key] = count
+        # reads made while the transaction was landing may predate it
+        self.invalidate(public_keys)
+
+    async def _end_write_on_confirmation(self, signature: str, commitment: Any, public_keys: list):
+        try:
+            await self._connection.confirm_transaction(signature, commitment)
+        except Exception:
+            logger.warning("Could not confirm %s, its accounts are cached again", signature, exc_info=True)
+        finally:
+            self._end_write(public_keys)
+
+    def _written_accounts(self, tx: Union[bytes, str]) -> list:
+        if isinstance(tx, str):
+            tx = base64.b64decode(tx)
+        return [
+            meta.pubkey
+            for instruction in Transaction.deserialize(tx).instructions
+            if instruction.program_id == self.program.program_id
+            for meta in instruction.keys
+            if meta.is_writable
+        ]
+
+    """
+    Serve load_data() of wrappers for this program from the cache, and keep
+    the accounts written by transactions sent through the program's connection
+    out of it until they are confirmed. Every send goes through
+    connection.send_raw_transaction, which is wrapped here.
+    """
+    def attach(self):
+        extensions = get_program_extensions(self.program)
+        if extensions.get("account_cache") is self:
+            return
+        connection = self.program.provider.connection
+        send_raw_transaction = connection.send_raw_transaction
+
+        async def invalidating_send_raw_transaction(txn: Union[bytes, str], opts: TxOpts = TxOpts()) -> Any:
+            written = self._written_accounts(txn)
+            self._begin_write(written)
+            try:
+                response = await send_raw_transaction(txn, opts=opts)
+            except BaseException:
+                self._end_write(written)
+                raise
+            if not opts.skip_confirmation:
+                self._end_write(written)
+                return response
+            confirmation = asyncio.ensure_future(
+                self._end_write_on_confirmation(response["result"], opts.preflight_commitment, written)
+            )
+            self._confirmations.add(confirmation)
+            confirmation.add_done_callback(self._confirmations.discard)
+            return response
+
+        self._overridden = connection.__dict__.get("send_raw_transaction")
+        connection.send_raw_transaction = invalidating_send_raw_transaction
+        self._provider = self.program.provider
+        self._connection = connection
+        extensions["account_cache"] = self
+
+    """
+    Stop serving load_data() from the cache and restore the connection.
+    Confirmations still awaited are abandoned.
+    """
+    def detach(self):
+        extensions = get_program_extensions(self.program)
+        if extensions.get("account_cache") is not self:
+            return
+        if self._overridden is None:
+            self._connection.__dict__.pop("send_raw_transaction", None)
+        else:
+            self._connection.send_raw_transaction = self._overridden
+        for confirmation in list(self._confirmations):
+            confirmation.cancel()
+        self._pending_writes.clear()
+        self._provider = None
+        self._connection = None
+        del extensions["account_cache"]
@@ -1,17 +1,58 @@
 import anchorpy
+import asyncio
+import base64
+import contextvars
+import functools
+import hashlib
+import struct
+import sys
+import weakref
+import numpy as np
 
 from dataclasses import dataclass
-from functools import reduce
-from typing import Any
+from typing import Any, Iterable, Optional, Union
 from decimal import Decimal
+from anchorpy.error import AccountDoesNotExistError, AccountInvalidDiscriminator
 from solana.publickey import PublicKey
 from solana.keypair import Keypair
+from solana.rpc.types import DataSliceOpts
 
 # Devnet Program ID.
 SBV2_DEVNET_PID = PublicKey(
     '2TfB33aLaneQb5TNVwyDz3jSZXS6jdW2ARw1Dgf84XCG'
 )
 
+# Powers of ten for scales 0..MAX_TABLE_SCALE, correctly rounded to float64, used to
+# convert SwitchboardDecimals in bulk. Larger scales are computed on the fly.
+MAX_TABLE_SCALE = 64
+_FLOAT_POWERS_OF_TEN = np.array([float(10 ** scale) for scale in range(MAX_TABLE_SCALE + 1)])
+
+# Size of a serialized SwitchboardDecimal: i128 mantissa followed by a u32 scale.
+SWITCHBOARD_DECIMAL_SIZE = 20
+
+# Serialized SwitchboardDecimal with the i128 mantissa split into its low (unsigned)
+# and high (signed) 64 bit halves, which struct can pack and unpack in place.
+_SWITCHBOARD_DECIMAL = struct.Struct("<QqI")
+_U64_MASK = (1 << 64) - 1
+_I128_MIN = -(1 << 127)
+_I128_MAX = (1 << 127) - 1
+
+# Maximum number of pubkeys the RPC accepts in a single getMultipleAccounts call.
+MAX_MULTIPLE_ACCOUNTS = 100
+
+# Default number of getMultipleAccounts requests allowed in flight at once.
+DEFAULT_LOAD_MANY_CONCURRENCY = 4
+
+# Default seconds an AccountFetchBatcher waits for more requests before fetching.
+DEFAULT_FETCH_BATCH_WINDOW = 0.002
+
+# Frame of the SDK call which spawned the current background fetch task, used to
+# attribute the task's RPC requests to it.
+SPAWNING_FRAME: contextvars.ContextVar = contextvars.ContextVar("switchboardpy_spawning_frame", default=None)
+
+# Optional SDK components (subscribers, caches...) attached to a program.
+_PROGRAM_EXTENSIONS: "weakref.WeakKeyDictionary[anchorpy.Program, dict]" = weakref.WeakKeyDictionary()
+
 # Input parameters for constructing wrapped representations of Switchboard accounts. 
 @dataclass
 class AccountParams:
@@ -30,6 +71,16 @@ class AccountParams:
 
 @dataclass
 class SwitchboardDecimal:
+    """Fixed point decimal worth mantissa / 10 ** scale, serialized on chain as an
+    i128 mantissa followed by a u32 scale, little endian.
+
+    Attributes:
+        mantissa (int): i128 mantissa
+        scale (int): u32 number of decimal places
+    """
+
+    __slots__ = ("mantissa", "scale")
+
     mantissa: int
     scale: int
 
@@ -50,22 +101,186 @@ class SwitchboardDecimal:
         )
     
     def to_decimal(self, sbd: object):
-        mantissa = Decimal(sbd.mantissa)
-        scale = sbd.scale
-        return mantissa / Decimal(10 ** scale)
+        return SwitchboardDecimal.sbd_to_decimal(sbd)
+
+    """
+    Convert a Decimal to the SwitchboardDecimal representing exactly the same value.
+
+    Args:
+        dec (Decimal): finite value
+
+    Returns:
+        sbd (SwitchboardDecimal): SwitchboardDecimal
 
+    Raises:
+        ValueError: If the value is NaN or infinite.
+    """
     @staticmethod
     def from_decimal(dec: Decimal):
-        _, digits, exponent = dec.as_tuple()
-        integer = reduce(lambda rst, x: rst * 10 + x, digits)
-        return SwitchboardDecimal(integer, exponent)
+        if not dec.is_finite():
+            raise ValueError(f'{dec} cannot be represented as a SwitchboardDecimal.')
+        sign, digits, exponent = dec.as_tuple()
+        mantissa = int(''.join(map(str, digits)))
+        if sign:
+            mantissa = -mantissa
+        if exponent > 0:
+            return SwitchboardDecimal(mantissa * 10 ** exponent, 0)
+        return SwitchboardDecimal(mantissa, -exponent)
 
     # convert any switchboard-decimal-like object to a decimal
     @staticmethod
     def sbd_to_decimal(sbd: object) -> Decimal:
-        mantissa = Decimal(sbd.mantissa)
-        scale = sbd.scale
-        return mantissa / Decimal(10 ** scale)
+        return Decimal(sbd.mantissa) / _decimal_divisor(sbd.scale)
+
+    """
+    Convert many mantissa / scale pairs to Decimals, reusing the divisor of each scale.
+
+    Args:
+        mantissas (Iterable[int]): mantissas
+        scales (Iterable[int]): scale of each mantissa
+
+    Returns:
+        list[Decimal]
+    """
+    @staticmethod
+    def to_decimal_many(mantissas: Iterable[int], scales: Iterable[int]) -> list[Decimal]:
+        return [Decimal(int(mantissa)) / _decimal_divisor(int(scale)) for mantissa, scale in zip(mantissas, scales)]
+
+    """
+    Convert many mantissa / scale pairs to float64 with a single NumPy division.
+
+    Args:
+        mantissas (Sequence[int] | np.ndarray): mantissas, as Python ints (i128 allowed) or a numeric array
+        scales (Sequence[int] | np.ndarray): scale of each mantissa
+
+    Returns:
+        np.ndarray: float64 values
+    """
+    @staticmethod
+    def to_float_array(mantissas: Any, scales: Any) -> np.ndarray:
+        mantissas = np.asarray(mantissas)
+        # Python ints beyond int64 come in as an object array, float() each of them
+        mantissas = mantissas.astype(np.float64)
+        scales = np.asarray(scales, dtype=np.int64)
+        if scales.size and (scales.min() < 0 or scales.max() > MAX_TABLE_SCALE):
+            return mantissas / np.power(10.0, scales.astype(np.float64))
+        return mantissas / _FLOAT_POWERS_OF_TEN[scales]
+
+    """
+    Compare two switchboard-decimal-like values exactly, with integer arithmetic only.
+
+    Args:
+        a (Any): object with integer fields mantissa and scale
+        b (Any): object with integer fields mantissa and scale
+
+    Returns:
+        int: -1 if a < b, 0 if a == b, 1 if a > b
+    """
+    @staticmethod
+    def compare(a: Any, b: Any) -> int:
+        scale = max(a.scale, b.scale)
+        left = _rescale(a.mantissa, a.scale, scale)
+        right = _rescale(b.mantissa, b.scale, scale)
+        return (left > right) - (left < right)
+
+    """
+    Check whether a value is further than a threshold from a reference value,
+    i.e. |value - reference| > threshold, exactly and without Decimal.
+
+    Args:
+        value (Any): object with integer fields mantissa and scale
+        reference (Any): object with integer fields mantissa and scale
+        threshold (Any): object with integer fields mantissa and scale
+
+    Returns:
+        bool
+    """
+    @staticmethod
+    def exceeds_threshold(value: Any, reference: Any, threshold: Any) -> bool:
+        scale = max(value.scale, reference.scale, threshold.scale)
+        difference = _rescale(value.mantissa, value.scale, scale) - _rescale(reference.mantissa, reference.scale, scale)
+        return abs(difference) > _rescale(threshold.mantissa, threshold.scale, scale)
+
+    """
+    Decode a serialized SwitchboardDecimal.
+
+    Args:
+        data (bytes): SWITCHBOARD_DECIMAL_SIZE bytes
+
+    Returns:
+        sbd (SwitchboardDecimal): SwitchboardDecimal
+
+    Raises:
+        ValueError: If data is not SWITCHBOARD_DECIMAL_SIZE bytes long.
+    """
+    @staticmethod
+    def from_bytes(data: bytes):
+        if len(data) != SWITCHBOARD_DECIMAL_SIZE:
+            raise ValueError(f'A SwitchboardDecimal is {SWITCHBOARD_DECIMAL_SIZE} bytes, got {len(data)}.')
+        return SwitchboardDecimal(
+            int.from_bytes(data[:16], "little", signed=True),
+            int.from_bytes(data[16:], "little")
+        )
+
+    """
+    Serialize the SwitchboardDecimal.
+
+    Returns:
+        bytes: SWITCHBOARD_DECIMAL_SIZE bytes
+
+    Raises:
+        OverflowError: If the mantissa does not fit in an i128 or the scale in a u32.
+    """
+    def to_bytes(self) -> bytes:
+        return self.mantissa.to_bytes(16, "little", signed=True) + self.scale.to_bytes(4, "little")
+
+    """
+    Serialize the SwitchboardDecimal directly into a writable buffer.
+
+    Args:
+        buffer (bytearray | memoryview): destination
+        offset (int): position of the SwitchboardDecimal in the buffer
+
+    Raises:
+        OverflowError: If the mantissa does not fit in an i128.
+        struct.error: If the scale does not fit in a u32 or the buffer is too small.
+    """
+    def pack_into(self, buffer: Any, offset: int = 0):
+        mantissa = self.mantissa
+        if not _I128_MIN <= mantissa <= _I128_MAX:
+            raise OverflowError(f'{mantissa} does not fit in an i128.')
+        _SWITCHBOARD_DECIMAL.pack_into(buffer, offset, mantissa & _U64_MASK, mantissa >> 64, self.scale)
+
+    """
+    Decode a SwitchboardDecimal in place from a buffer.
+
+    Args:
+        buffer (bytes | bytearray | memoryview): source
+        offset (int): position of the SwitchboardDecimal in the buffer
+
+    Returns:
+        sbd (SwitchboardDecimal): SwitchboardDecimal
+    """
+    @staticmethod
+    def unpack_from(buffer: Any, offset: int = 0):
+        low, high, scale = _SWITCHBOARD_DECIMAL.unpack_from(buffer, offset)
+        return SwitchboardDecimal((high << 64) | low, scale)
+
+    """
+    Decode a serialized SwitchboardDecimal in place from a buffer straight to a
+    Decimal, without building a SwitchboardDecimal.
+
+    Args:
+        buffer (bytes | bytearray | memoryview): source
+        offset (int): position of the SwitchboardDecimal in the buffer
+
+    Returns:
+        Decimal
+    """
+    @staticmethod
+    def unpack_decimal_from(buffer: Any, offset: int = 0) -> Decimal:
+        low, high, scale = _SWITCHBOARD_DECIMAL.unpack_from(buffer, offset)
+        return Decimal((high << 64) | low) / _decimal_divisor(scale)
 
     # for sending as argument in transaction
     def as_proper_sbd(self, program: anchorpy.Program):
@@ -75,3 +290,335 @@ class SwitchboardDecimal:
         if not (hasattr(__o, 'mantissa') and hasattr(__o, 'scale')):
             return False
         return self.mantissa == __o.mantissa and self.scale == __o.scale
+
+@functools.lru_cache(maxsize=None)
+def _decimal_divisor(scale: int) -> Decimal:
+    return Decimal(10 ** scale)
+
+def _rescale(mantissa: int, scale: int, target_scale: int) -> int:
+    return mantissa * 10 ** (target_scale - scale)
+
+"""
+Get the 8 byte Anchor discriminator for an account type.
+
+Args:
+    account_name (str): IDL name of the account type, e.g. "AggregatorAccountData"
+
+Returns:
+    bytes: sha256("account:<name>")[:8]
+"""
+def account_discriminator(account_name: str) -> bytes:
+    return hashlib.sha256(f"account:{account_name}".encode()).digest()[:8]
+
+"""
+Decode the base64 data field of an RPC account info value.
+
+Args:
+    value (Any): the "value" of a getAccountInfo / getMultipleAccounts response
+
+Returns:
+    bytes: raw account data
+"""
+def account_info_bytes(value: Any) -> bytes:
+    data = value["data"]
+    if isinstance(data, list):
+        data = data[0]
+    return base64.b64decode(data)
+
+"""
+Decode raw account data with the program IDL coder.
+
+Args:
+    program (anchorpy.Program): Switchboard program representation holding connection and IDL
+    account_name (str): IDL name of the account type
+    public_key (PublicKey): pubkey of the account, used for error reporting
+    data (bytes | None): raw account data, None if the account does not exist
+
+Returns:
+    Any: data parsed in accordance with the Switchboard IDL.
+
+Raises:
+    AccountDoesNotExistError: If the account doesn't exist.
+    AccountInvalidDiscriminator: If the discriminator doesn't match the IDL.
+"""
+def decode_account(program: anchorpy.Program, account_name: str, public_key: PublicKey, data: Optional[bytes]) -> Any:
+    if data is None:
+        raise AccountDoesNotExistError(f"Account {public_key} does not exist")
+    if data[:8] != account_discriminator(account_name):
+        raise AccountInvalidDiscriminator(f"Account {public_key} has an invalid discriminator for {account_name}")
+    decoded = program.coder.accounts.decode(data)
+    decoded.ebuf = None
+    return decoded
+
+"""
+Fetch the raw data of many accounts with getMultipleAccounts.
+
+Pubkeys are split into chunks of MAX_MULTIPLE_ACCOUNTS which are requested
+concurrently, bounded by max_concurrency. A failed request only affects the
+keys of its chunk.
+
+Args:
+    program (anchorpy.Program): Switchboard program representation holding connection and IDL
+    pubkeys (list[PublicKey]): accounts to fetch
+    max_concurrency (int): maximum number of getMultipleAccounts calls in flight
+    data_slice (DataSliceOpts | None): only fetch this byte range of each account
+
+Returns:
+    list[dict | None | Exception]: RPC account info value (None if the account does
+        not exist) or the error of the request, in input order
+"""
+async def get_multiple_account_infos(
+    program: anchorpy.Program,
+    pubkeys: list[PublicKey],
+    max_concurrency: int = DEFAULT_LOAD_MANY_CONCURRENCY,
+    data_slice: Optional[DataSliceOpts] = None
+) -> list[Union[dict, None, Exception]]:
+    semaphore = asyncio.Semaphore(max_concurrency)
+    results: list[Union[dict, None, Exception]] = [None] * len(pubkeys)
+
+    async def load_chunk(start: int):
+        chunk = pubkeys[start:start + MAX_MULTIPLE_ACCOUNTS]
+        try:
+            async with semaphore:
+                response = await program.provider.connection.get_multiple_accounts(chunk, encoding="base64", data_slice=data_slice)
+            results[start:start + len(chunk)] = response["result"]["value"]
+        except Exception as e:
+            results[start:start + len(chunk)] = [e] * len(chunk)
+
+    # only RpcInstrumentation reads the spawning frame, skip the stack walk when it is not installed
+    token = None
+    if "instrumentation" in get_program_extensions(program):
+        token = SPAWNING_FRAME.set(SPAWNING_FRAME.get() or _caller_frame())
+    try:
+        chunks = [asyncio.ensure_future(load_chunk(start)) for start in range(0, len(pubkeys), MAX_MULTIPLE_ACCOUNTS)]
+    finally:
+        if token is not None:
+            SPAWNING_FRAME.reset(token)
+    await asyncio.gather(*chunks)
+    return results
+
+"""
+Load and decode many accounts of one type with getMultipleAccounts.
+
+A failure only affects the keys it concerns: the returned list holds either
+the decoded account or the exception raised for that key, in the same order
+as the input.
+
+Args:
+    program (anchorpy.Program): Switchboard program representation holding connection and IDL
+    account_name (str): IDL name of the account type, e.g. "AggregatorAccountData"
+    pubkeys (list[PublicKey]): accounts to load
+    max_concurrency (int): maximum number of getMultipleAccounts calls in flight
+
+Returns:
+    list[Any | Exception]: decoded account data or the per-key error
+"""
+async def load_many_accounts(
+    program: anchorpy.Program,
+    account_name: str,
+    pubkeys: list[PublicKey],
+    max_concurrency: int = DEFAULT_LOAD_MANY_CONCURRENCY
+) -> list[Union[Any, Exception]]:
+    results: list[Union[Any, Exception]] = []
+    for pubkey, value in zip(pubkeys, await get_multiple_account_infos(program, pubkeys, max_concurrency)):
+        if isinstance(value, Exception):
+            results.append(value)
+            continue
+        try:
+            data = account_info_bytes(value) if value else None
+            results.append(decode_account(program, account_name, pubkey, data))
+        except Exception as e:
+            results.append(e)
+    return results
+
+def _caller_frame() -> Any:
+    frame = sys._getframe(1)
+    while frame is not None and frame.f_globals.get("__name__") == __name__:
+        frame = frame.f_back
+    return frame
+
+"""
+Get the registry of optional SDK components attached to a program.
+
+Args:
+    program (anchorpy.Program): Switchboard program representation holding connection and IDL
+
+Returns:
+    dict: mutable mapping of component name to component, released with the program
+"""
+def get_program_extensions(program: anchorpy.Program) -> dict:
+    extensions = _PROGRAM_EXTENSIONS.get(program)
+    if extensions is None:
+        extensions = _PROGRAM_EXTENSIONS[program] = {}
+    return extensions
+
+class AccountFetchBatcher:
+    """Merges account fetches issued within a short window into getMultipleAccounts calls.
+
+    The first request starts a timer of `window` seconds; every request made
+    before it fires, up to max_batch, is fetched by the same getMultipleAccounts
+    call and decoded with its own account type.
+
+    Attributes:
+        window (float): seconds to wait for more requests
+        max_batch (int): number of requests which triggers an immediate fetch
+        batches (int): number of getMultipleAccounts batches dispatched
+    """
+
+    def __init__(self, program: anchorpy.Program, window: float = DEFAULT_FETCH_BATCH_WINDOW, max_batch: int = MAX_MULTIPLE_ACCOUNTS):
+        self.program = program
+        self.window = window
+        self.max_batch = max_batch
+        self.batches = 0
+        self._pending: list[tuple[str, PublicKey, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    """
+    Queue an account fetch for the next batch.
+
+    Args:
+        account_name (str): IDL name of the account type
+        public_key (PublicKey): account to load
+
+    Returns:
+        asyncio.Future: resolves to the decoded account data
+    """
+    def load(self, account_name: str, public_key: PublicKey) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((account_name, public_key, future))
+        if len(self._pending) >= self.max_batch:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self.flush)
+        return future
+
+    """
+    Dispatch the queued fetches now.
+    """
+    def flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        if pending:
+            self.batches += 1
+            asyncio.ensure_future(self._dispatch(pending))
+
+    async def _dispatch(self, pending: list):
+        try:
+            values = await get_multiple_account_infos(self.program, [public_key for _, public_key, _ in pending])
+        except Exception as e:
+            values = [e] * len(pending)
+        for (account_name, public_key, future), value in zip(pending, values):
+            if future.done():
+                continue
+            try:
+                if isinstance(value, Exception):
+                    raise value
+                data = account_info_bytes(value) if value else None
+                future.set_result(decode_account(self.program, account_name, public_key, data))
+            except Exception as e:
+                future.set_exception(e)
+
+"""
+Merge the account fetches of every load_data call on a program issued within
+`window` seconds into getMultipleAccounts calls.
+
+Args:
+    program (anchorpy.Program): Switchboard program representation holding connection and IDL
+    window (float): seconds to wait for more requests before fetching
+
+Returns:
+    AccountFetchBatcher: the batcher attached to the program
+"""
+def enable_fetch_batching(program: anchorpy.Program, window: float = DEFAULT_FETCH_BATCH_WINDOW) -> AccountFetchBatcher:
+    batcher = AccountFetchBatcher(program, window)
+    get_program_extensions(program)["fetch_batcher"] = batcher
+    return batcher
+
+"""
+Go back to one getAccountInfo call per account fetch.
+
+Args:
+    program (anchorpy.Program): Switchboard program representation holding connection and IDL
+"""
+def disable_fetch_batching(program: anchorpy.Program):
+    batcher = get_program_extensions(program).pop("fetch_batcher", None)
+    if batcher is not None:
+        batcher.flush()
+
+async def _fetch_account(program: anchorpy.Program, account_name: str, public_key: PublicKey, batcher: Any, cache: Any) -> Any:
+    slot = None
+    version = cache.version() if cache is not None else None
+    if batcher is not None:
+        account = await batcher.load(account_name, public_key)
+    elif cache is not None and cache.caches(account_name):
+        response = await program.provider.connection.get_account_info(public_key, encoding="base64")
+        value = response["result"]["value"]
+        slot = response["result"]["context"]["slot"]
+        account = decode_account(program, account_name, public_key, account_info_bytes(value) if value else None)
+    else:
+        account = await program.account[account_name].fetch(public_key)
+        account.ebuf = None
+    if cache is not None:
+        cache.put(account_name, public_key, account, slot, version)
+    return account
+
+def _forget_in_flight(in_flight: dict, key: tuple, future: asyncio.Future):
+    if in_flight.get(key) is future:
+        del in_flight[key]
+    if not future.cancelled():
+        # mark the error as retrieved when every waiter went away
+        future.exception()
+
+"""
+Fetch and decode a single account. This is the account fetch path shared by
+every wrapper's load_data; a fresh entry from an attached AccountSubscriber
+or AccountCache is returned without going to the RPC.
+
+Concurrent fetches of the same account and commitment share a single
+in-flight request (and therefore the same decoded object), and are merged
+with fetches of other accounts when batching is enabled on the program.
+
+Args:
+    program (anchorpy.Program): Switchboard program representation holding connection and IDL
+    account_name (str): IDL name of the account type, e.g. "AggregatorAccountData"
+    public_key (PublicKey): account to load
+
+Returns:
+    Any: data parsed in accordance with the Switchboard IDL.
+
+Raises:
+    AccountDoesNotExistError: If the account doesn't exist.
+    AccountInvalidDiscriminator: If the discriminator doesn't match the IDL.
+"""
+async def fetch_account(program: anchorpy.Program, account_name: str, public_key: PublicKey) -> Any:
+    extensions = get_program_extensions(program)
+    subscriber = extensions.get("subscriber")
+    if subscriber is not None:
+        update = subscriber.get(public_key)
+        # a key subscribed under another account type is not what the caller expects
+        if update is not None and update.account_name == account_name:
+            return update.data
+    cache = extensions.get("account_cache")
+    if cache is not None:
+        account = cache.get(account_name, public_key)
+        if account is not None:
+            return account
+    key = (account_name, bytes(public_key), getattr(program.provider.connection, "_commitment", None))
+    in_flight = extensions.setdefault("in_flight", {})
+    future = in_flight.get(key)
+    if future is None:
+        token = SPAWNING_FRAME.set(_caller_frame()) if "instrumentation" in extensions else None
+        try:
+            future = asyncio.ensure_future(
+                _fetch_account(program, account_name, public_key, extensions.get("fetch_batcher"), cache)
+            )
+        finally:
+            if token is not None:
+                SPAWNING_FRAME.reset(token)
+        in_flight[key] = future
+        future.add_done_callback(lambda done: _forget_in_flight(in_flight, key, done))
+    # shielded so a cancelled caller does not cancel the fetch of the others
+    return await asyncio.shield(future)
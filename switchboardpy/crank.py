@@ -1,23 +1,35 @@
 import anchorpy
+import heapq
+import itertools
 import math
+import struct
 import time
 
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional
 from solana import system_program
 
+from anchorpy.error import AccountDoesNotExistError
 from solana.keypair import Keypair
 from solana.publickey import PublicKey
+from solana.rpc.types import DataSliceOpts
 from spl.token.constants import TOKEN_PROGRAM_ID
 from spl.token.instructions import get_associated_token_address
 from switchboardpy.lease import LeaseAccount
 from switchboardpy.permission import PermissionAccount
-from switchboardpy.common import AccountParams
+from switchboardpy.common import AccountParams, account_info_bytes, fetch_account, load_many_accounts
 from switchboardpy.oraclequeue import OracleQueueAccount
 from switchboardpy.aggregator import AggregatorAccount
 from solana.system_program import CreateAccountParams, create_account
+from solana.transaction import AccountMeta
 
-from switchboardpy.program import ProgramStateAccount
+from switchboardpy.program import get_program_context
+
+# Bytes preceding the rows of a crank data buffer.
+CRANK_BUFFER_HEADER_SIZE = 8
+
+# Size of a row of a crank data buffer: aggregator pubkey followed by an i64 next timestamp.
+CRANK_ROW_SIZE = 40
 
 # Parameters for initializing a CrankAccount
 @dataclass
@@ -82,9 +94,35 @@ class CrankRow:
     """Next aggregator update timestamp to order the crank by"""
     next_timestamp: int
 
+    """
+    Decode a row of a crank data buffer.
+
+    Args:
+        buf (bytes): CRANK_ROW_SIZE bytes
+
+    Returns:
+        CrankRow
+    """
     @staticmethod
     def from_bytes(buf: bytes):
-        pass
+        return CrankRow(PublicKey(bytes(buf[:32])), struct.unpack_from("<q", buf, 32)[0])
+
+"""
+Decode the rows of a crank data buffer.
+
+Args:
+    data (bytes): data buffer account data, header included
+    size (int): number of rows in use, the crank's pq_size
+
+Returns:
+    list[CrankRow]: rows in buffer order, truncated to the rows present in data
+"""
+def decode_crank_rows(data: bytes, size: int) -> list[CrankRow]:
+    size = min(size, max(0, (len(data) - CRANK_BUFFER_HEADER_SIZE) // CRANK_ROW_SIZE))
+    return [
+        CrankRow.from_bytes(data[offset:offset + CRANK_ROW_SIZE])
+        for offset in range(CRANK_BUFFER_HEADER_SIZE, CRANK_BUFFER_HEADER_SIZE + size * CRANK_ROW_SIZE, CRANK_ROW_SIZE)
+    ]
 
 class CrankAccount:
     """ A Switchboard account representing a crank of aggregators ordered by next update time.
@@ -129,9 +167,50 @@ class CrankAccount:
         AccountInvalidDiscriminator: If the discriminator doesn't match the IDL.
     """
     async def load_data(self):
-        crank = await self.program.account["CrankAccountData"].fetch(self.public_key)
-        crank.ebuf = None
-        return crank
+        return await fetch_account(self.program, "CrankAccountData", self.public_key)
+
+    """
+    Load the rows of the crank from its data buffer. Only the pq_size rows in
+    use are fetched.
+
+    Args:
+        crank (Any): Optional crank data, loaded if not given
+
+    Returns:
+        list[CrankRow]: rows in buffer order
+
+    Raises:
+        AccountDoesNotExistError: If the crank or its data buffer doesn't exist.
+        AccountInvalidDiscriminator: If the discriminator doesn't match the IDL.
+    """
+    async def load_rows(self, crank: Any = None) -> list[CrankRow]:
+        crank = crank if crank else await self.load_data()
+        if crank.pq_size == 0:
+            return []
+        info = await self.program.provider.connection.get_account_info(
+            crank.data_buffer,
+            encoding="base64",
+            data_slice=DataSliceOpts(offset=0, length=CRANK_BUFFER_HEADER_SIZE + crank.pq_size * CRANK_ROW_SIZE)
+        )
+        value = info["result"]["value"]
+        if value is None:
+            raise AccountDoesNotExistError(f"Account {crank.data_buffer} does not exist")
+        return decode_crank_rows(account_info_bytes(value), crank.pq_size)
+
+    """
+    Load and parse many CrankAccounts at once with batched getMultipleAccounts calls.
+
+    Args:
+        program (anchorpy.Program): Switchboard program representation holding connection and IDL
+        pubkeys (list[PublicKey]): crank pubkeys to load
+
+    Returns:
+        list[Any | Exception]: data parsed in accordance with the Switchboard IDL,
+            or the error raised for that pubkey, in input order
+    """
+    @staticmethod
+    async def load_many(program: anchorpy.Program, pubkeys: list[PublicKey]):
+        return await load_many_accounts(program, "CrankAccountData", pubkeys)
 
     """
     Create and initialize the CrankAccount.
@@ -214,7 +293,8 @@ class CrankAccount:
             await lease_account.load_data()
         except Exception:
             raise ValueError('A requested permission pda account has not been initialized.')
-        program_state_account, state_bump = ProgramStateAccount.from_seed(self.program)
+        context = get_program_context(self.program)
+        program_state_account, state_bump = context.state_account, context.state_bump
         return await self.program.rpc["crank_push"](
             {
                 "state_bump": state_bump,
@@ -285,8 +365,9 @@ class CrankAccount:
         for key in remaining_accounts:
             lease_bumps.append(lease_bumps_map.get(key.to_base58()) or 0)
             permission_bumps.append(permission_bumps_map.get(key.to_base58()) or 0)
-        program_state_account, state_bump = ProgramStateAccount.from_seed(self.program)
-        payer_keypair = Keypair.from_secret_key(self.program.provider.wallet.payer.secret_key)
+        context = get_program_context(self.program)
+        program_state_account, state_bump = context.state_account, context.state_bump
+        payer_keypair = context.payer
         return self.program.transaction["crank_pop"](
             {
                 "state_bump": state_bump,
@@ -306,7 +387,7 @@ class CrankAccount:
                     "crank_data_buffer": crank.data_buffer,
                     "queue_data_buffer": queue.data_buffer
                 },
-                remaining_accounts=[{ "is_signer": False, "is_writable": True, "pubkey": pubkey } for pubkey in remaining_accounts],
+                remaining_accounts=[AccountMeta(pubkey=pubkey, is_signer=False, is_writable=True) for pubkey in remaining_accounts],
                 signers=[payer_keypair]
             )
         )
@@ -321,7 +402,7 @@ class CrankAccount:
         TransactionSignature
     """
     async def pop(self, params: CrankPopParams):
-        payer_keypair = Keypair.from_secret_key(self.program.provider.wallet.payer.secret_key)
+        payer_keypair = get_program_context(self.program).payer
         txn = await self.pop_txn(params)
         return await self.program.provider.connection.send_transaction(txn, [payer_keypair])
     
@@ -335,16 +416,10 @@ class CrankAccount:
         list[CrankRow]: Pubkey list of Aggregators and next timestamp to be popped, ordered by timestamp
     """
     async def peak_next_with_time(self, n: int):
-        crank = await self.load_data()
+        pq_data: list[CrankRow] = await self.load_rows()
 
-        # get list slice of length pq_size 
-        pq_data: list[CrankRow] = crank.pq_data[:crank.pq_size]
-
-        # sort by CrankRow next timestamp
-        pq_data.sort(key=lambda crank_row: crank_row.next_timestamp)
-
-        # return items
-        return pq_data[:n]
+        # n smallest by CrankRow next timestamp
+        return heapq.nsmallest(n, pq_data, key=lambda crank_row: crank_row.next_timestamp)
 
     """
     Get an array of the next readily updateable aggregator pubkeys to be popped
@@ -358,10 +433,9 @@ class CrankAccount:
     """
     async def peak_next_ready(self, n: Optional[int] = None):
         now = math.floor(time.time())
-        crank = await self.load_data()
-        pq_data: list[CrankRow] = crank.pq_data[:crank.pq_size]
-        key = lambda crank_row: crank_row.next_timestamp
-        return [item.pubkey for item in list(filter(lambda item: now >= item.next_timestamp, pq_data)).sort(key=key)[:(n or len(pq_data))]]
+        pq_data: list[CrankRow] = await self.load_rows()
+        ready = [item for item in pq_data if now >= item.next_timestamp]
+        return [item.pubkey for item in heapq.nsmallest(n or len(ready), ready, key=lambda crank_row: crank_row.next_timestamp)]
         
     """
     Get an array of the next aggregator pubkeys to be popped from the crank, limited by n
@@ -373,7 +447,108 @@ class CrankAccount:
         list[PublicKey]: Pubkey list of Aggregators and next timestamp to be popped, ordered by timestamp
     """
     async def peak_next(self, n: int):
-        crank = await self.load_data()
-        pq_data: list[CrankRow] = crank.pq_data[:crank.pq_size]
-        pq_data.sort(key=lambda crank_row: crank_row.next_timestamp)
-        return [item.pubkey for item in pq_data[:n]]
\ No newline at end of file
+        pq_data: list[CrankRow] = await self.load_rows()
+        return [item.pubkey for item in heapq.nsmallest(n, pq_data, key=lambda crank_row: crank_row.next_timestamp)]
+
+
+class CrankMirror:
+    """A local mirror of a crank's rows kept in a binary heap keyed by next_timestamp.
+
+    New crank snapshots are applied as diffs: only rows which were added, removed
+    or rescheduled touch the heap. Removed and rescheduled rows leave stale heap
+    entries behind which are skipped on read and dropped on compaction.
+
+    Attributes:
+        crank_account (CrankAccount | None): crank refreshed by refresh()
+    """
+
+    def __init__(self, crank_account: Optional[CrankAccount] = None, rows: Optional[list[CrankRow]] = None):
+        self.crank_account = crank_account
+        self._heap: list[tuple] = []
+        self._entries: Dict[bytes, tuple] = {}
+        self._seq = itertools.count()
+        if rows:
+            self.update(rows)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    """
+    Apply a new crank snapshot.
+
+    Args:
+        rows (list[CrankRow]): the crank rows, see CrankAccount.load_rows
+    """
+    def update(self, rows: list[CrankRow]):
+        snapshot = {bytes(row.pubkey): row for row in rows}
+        for key in list(self._entries):
+            if key not in snapshot:
+                del self._entries[key]
+        for key, row in snapshot.items():
+            entry = self._entries.get(key)
+            if entry is None or entry[2].next_timestamp != row.next_timestamp:
+                entry = (row.next_timestamp, next(self._seq), row)
+                self._entries[key] = entry
+                heapq.heappush(self._heap, entry)
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = list(self._entries.values())
+            heapq.heapify(self._heap)
+
+    """
+    Reload the crank rows and apply them as a new snapshot.
+
+    Args:
+        crank (Any): Optional crank data, loaded if not given
+
+    Returns:
+        CrankMirror: self
+    """
+    async def refresh(self, crank: Any = None):
+        self.update(await self.crank_account.load_rows(crank))
+        return self
+
+    # Live entries in next_timestamp order, visiting the heap as a tree so the
+    # first k entries cost O(k log k) without popping anything.
+    def _iter_ordered(self) -> Iterator[CrankRow]:
+        heap = self._heap
+        if not heap:
+            return
+        frontier = [(heap[0], 0)]
+        while frontier:
+            entry, i = heapq.heappop(frontier)
+            if self._entries.get(bytes(entry[2].pubkey)) is entry:
+                yield entry[2]
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+
+    """
+    Get the next rows to be popped from the crank, limited by n
+
+    Args:
+        n (int): limit of rows to return
+
+    Returns:
+        list[CrankRow]: rows ordered by next timestamp
+    """
+    def next_with_time(self, n: int) -> list[CrankRow]:
+        return list(itertools.islice(self._iter_ordered(), n))
+
+    """
+    Get the next readily updateable aggregator pubkeys, limited by n
+
+    Args:
+        n (Optional[int]): limit of pubkeys to return
+        now (Optional[int]): unix timestamp to compare against, defaults to the current time
+
+    Returns:
+        list[PublicKey]: Pubkey list of ready Aggregators ordered by next timestamp
+    """
+    def next_ready(self, n: Optional[int] = None, now: Optional[int] = None) -> list[PublicKey]:
+        now = math.floor(time.time()) if now is None else now
+        ready: list[PublicKey] = []
+        for row in self._iter_ordered():
+            if row.next_timestamp > now or (n is not None and len(ready) >= n):
+                break
+            ready.append(row.pubkey)
+        return ready
@@ -0,0 +1,315 @@
+import asyncio
+import logging
+import random
+import time
+
+from typing import Any, Optional
+
+from solana.publickey import PublicKey
+from solana.rpc.types import TxOpts
+
+from switchboardpy.common import AccountParams
+from switchboardpy.crank import CrankAccount, CrankMirror, CrankPopParams
+from switchboardpy.metrics import LatencyHistogram
+from switchboardpy.oraclequeue import OracleQueueAccount
+from switchboardpy.program import get_program_context
+
+# Default number of crank_pop transactions awaiting confirmation at once.
+DEFAULT_MAX_IN_FLIGHT = 4
+
+# Default number of aggregators attempted per crank_pop.
+DEFAULT_POP_BATCH_SIZE = 5
+
+# Seconds a cached blockhash is reused before fetching a new one.
+DEFAULT_BLOCKHASH_TTL = 20.0
+
+# Seconds after which an unconfirmed pop is considered dropped.
+DEFAULT_CONFIRM_TIMEOUT = 60.0
+
+# Bounds of the exponential backoff applied after account mismatch failures.
+MIN_MISMATCH_BACKOFF = 0.5
+MAX_MISMATCH_BACKOFF = 10.0
+
+# Seconds after which the crank and queue accounts are reloaded.
+DEFAULT_ACCOUNTS_REFRESH_INTERVAL = 60.0
+
+logger = logging.getLogger(__name__)
+
+class CrankTurner:
+    """Pipelined crank turner.
+
+    Several independent crank_pop transactions are signed against one cached
+    blockhash, made distinct by the CrankPopParams nonce, and up to max_in_flight
+    of them await confirmation at once. Confirmations are tracked in the
+    background with getSignatureStatuses. The crank and queue accounts are
+    reloaded every accounts_refresh_interval seconds. A failure caused by crank /
+    queue accounts having moved on (an account mismatch) backs the turner off
+    exponentially and reloads them before the next pop.
+
+    Attributes:
+        crank_account (CrankAccount): the crank to turn
+        payout_wallet (PublicKey): wallet rewarded for turning the crank
+        sent (int): crank_pop transactions sent
+        confirmed (int): crank_pop transactions confirmed
+        failed (int): crank_pop transactions which failed, mismatches included
+        mismatches (int): failures caused by an account mismatch
+        expired (int): transactions not confirmed within confirm_timeout
+        errors (int): exceptions raised while sending, confirming or refreshing, each one logged
+        confirmation_latency (LatencyHistogram): send to confirmation latency
+    """
+
+    def __init__(
+        self,
+        crank_account: CrankAccount,
+        payout_wallet: PublicKey,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        batch_size: int = DEFAULT_POP_BATCH_SIZE,
+        blockhash_ttl: float = DEFAULT_BLOCKHASH_TTL,
+        confirm_timeout: float = DEFAULT_CONFIRM_TIMEOUT,
+        poll_interval: float = 0.5,
+        fail_open_on_mismatch: bool = False,
+        accounts_refresh_interval: float = DEFAULT_ACCOUNTS_REFRESH_INTERVAL
+    ):
+        self.crank_account = crank_account
+        self.program = crank_account.program
+        self.payout_wallet = payout_wallet
+        self.max_in_flight = max_in_flight
+        self.batch_size = batch_size
+        self.blockhash_ttl = blockhash_ttl
+        self.confirm_timeout = confirm_timeout
+        self.poll_interval = poll_interval
+        self.fail_open_on_mismatch = fail_open_on_mismatch
+        self.accounts_refresh_interval = accounts_refresh_interval
+        self.mirror = CrankMirror(crank_account)
+        self.payer = get_program_context(self.program).payer
+        self.slots = asyncio.Semaphore(max_in_flight)
+        self.in_flight: dict[str, tuple[float, list[PublicKey]]] = {}
+        self.sent = 0
+        self.confirmed = 0
+        self.failed = 0
+        self.mismatches = 0
+        self.expired = 0
+        self.errors = 0
+        self.confirmation_latency = LatencyHistogram()
+        self._blockhash: Optional[str] = None
+        self._blockhash_at = 0.0
+        self._backoff = 0.0
+        self._backoff_until = 0.0
+        self._nonce = random.getrandbits(32)
+        self._started_at: Optional[float] = None
+        self._accounts_loaded_at: Optional[float] = None
+        self._crank: Any = None
+        self._queue: Any = None
+        self._queue_authority: Optional[PublicKey] = None
+        self._token_mint: Optional[PublicKey] = None
+        self._mismatch_codes = {
+            error.code for error in (getattr(self.program.idl, "errors", None) or [])
+            if "mismatch" in error.name.lower()
+        }
+
+    """
+    Load the crank, its queue and the program token mint.
+    """
+    async def start(self):
+        await self.refresh_accounts()
+        self._token_mint = await get_program_context(self.program).token_mint()
+        self._started_at = time.monotonic()
+
+    """
+    Reload the crank, its rows and its queue, e.g. after their configuration changed.
+    """
+    async def refresh_accounts(self):
+        await self.refresh_crank()
+        queue_account = OracleQueueAccount(AccountParams(program=self.program, public_key=self._crank.queue_pubkey))
+        self._queue = await queue_account.load_data()
+        self._queue_authority = self._queue.authority
+        self._accounts_loaded_at = time.monotonic()
+
+    """
+    Reload the crank and mirror its rows.
+    """
+    async def refresh_crank(self):
+        self._crank = await self.crank_account.load_data()
+        await self.mirror.refresh(self._crank)
+
+    def _accounts_stale(self) -> bool:
+        return self._accounts_loaded_at is None or time.monotonic() - self._accounts_loaded_at > self.accounts_refresh_interval
+
+    def _error(self, message: str):
+        self.errors += 1
+        logger.warning(message, exc_info=True)
+
+    async def _recent_blockhash(self) -> str:
+        now = time.monotonic()
+        if self._blockhash is None or now - self._blockhash_at > self.blockhash_ttl:
+            response = await self.program.provider.connection.get_recent_blockhash()
+            self._blockhash = response["result"]["value"]["blockhash"]
+            self._blockhash_at = now
+        return self._blockhash
+
+    # nonces cycle through 1..2**32 - 1, pop_txn sends a 0 nonce as none at all
+    def _next_nonce(self) -> int:
+        self._nonce = self._nonce % ((1 << 32) - 1) + 1
+        return self._nonce
+
+    """
+    Sign and send one crank_pop for a batch of ready aggregators.
+
+    Args:
+        ready_pubkeys (list[PublicKey]): aggregators to pop
+
+    Returns:
+        str: transaction signature
+    """
+    async def pop(self, ready_pubkeys: list[PublicKey]) -> str:
+        txn = await self.crank_account.pop_txn(
+            CrankPopParams(
+                payout_wallet=self.payout_wallet,
+                queue_pubkey=self._crank.queue_pubkey,
+                queue_authority=self._queue_authority,
+                crank=self._crank,
+                queue=self._queue,
+                token_mint=self._token_mint,
+                ready_pubkeys=ready_pubkeys,
+                nonce=self._next_nonce(),
+                fail_open_on_mismatch=self.fail_open_on_mismatch
+            )
+        )
+        txn.recent_blockhash = await self._recent_blockhash()
+        txn.sign(self.payer)
+        response = await self.program.provider.connection.send_raw_transaction(
+            txn.serialize(),
+            opts=TxOpts(skip_confirmation=True, skip_preflight=True)
+        )
+        signature = response["result"]
+        self.in_flight[signature] = (time.monotonic(), ready_pubkeys)
+        self.sent += 1
+        return signature
+
+    """
+    Send crank_pop transactions for every ready aggregator not already in
+    flight, while in-flight slots are available.
+
+    Returns:
+        list[str]: signatures of the transactions sent
+    """
+    async def turn(self) -> list[str]:
+        if time.monotonic() < self._backoff_until:
+            return []
+        pending = {bytes(pubkey) for _, pubkeys in self.in_flight.values() for pubkey in pubkeys}
+        ready = [pubkey for pubkey in self.mirror.next_ready() if bytes(pubkey) not in pending]
+        signatures = []
+        for i in range(0, len(ready), self.batch_size):
+            if self.slots.locked():
+                break
+            await self.slots.acquire()
+            try:
+                signatures.append(await self.pop(ready[i:i + self.batch_size]))
+            except Exception:
+                self._error(f"crank_pop of {self.crank_account.public_key} could not be sent")
+                self.slots.release()
+                self.failed += 1
+                self._blockhash = None
+                break
+        return signatures
+
+    def _is_mismatch(self, err: Any) -> bool:
+        instruction_error = err.get("InstructionError") if isinstance(err, dict) else None
+        if not instruction_error:
+            return False
+        custom = instruction_error[1].get("Custom") if isinstance(instruction_error[1], dict) else None
+        return custom in self._mismatch_codes
+
+    def _settle(self, signature: str):
+        del self.in_flight[signature]
+        self.slots.release()
+
+    """
+    Check the status of every in-flight transaction once.
+    """
+    async def check_confirmations(self):
+        signatures = list(self.in_flight)
+        now = time.monotonic()
+        for i in range(0, len(signatures), 256):
+            chunk = signatures[i:i + 256]
+            response = await self.program.provider.connection.get_signature_statuses(chunk)
+            for signature, status in zip(chunk, response["result"]["value"]):
+                sent_at, _ = self.in_flight[signature]
+                if status is None:
+                    if now - sent_at > self.confirm_timeout:
+                        self.expired += 1
+                        self._settle(signature)
+                    continue
+                if status.get("err"):
+                    self.failed += 1
+                    if self._is_mismatch(status["err"]):
+                        self.mismatches += 1
+                        self._accounts_loaded_at = None
+                        self._backoff = min(MAX_MISMATCH_BACKOFF, max(MIN_MISMATCH_BACKOFF, self._backoff * 2))
+                        self._backoff_until = time.monotonic() + self._backoff * random.uniform(0.5, 1.0)
+                    self._settle(signature)
+                elif status.get("confirmationStatus") in ("confirmed", "finalized"):
+                    self.confirmed += 1
+                    self._backoff = 0.0
+                    self.confirmation_latency.observe(now - sent_at)
+                    self._settle(signature)
+
+    async def _confirm_loop(self):
+        while True:
+            if self.in_flight:
+                try:
+                    await self.check_confirmations()
+                except Exception:
+                    self._error(f"Confirmations of {self.crank_account.public_key} pops could not be checked")
+            await asyncio.sleep(self.poll_interval)
+
+    """
+    Turn the crank until cancelled or for a fixed duration.
+
+    Args:
+        duration (float | None): seconds to run for, None to run until cancelled
+
+    Returns:
+        dict: stats() at the end of the run
+    """
+    async def run(self, duration: Optional[float] = None) -> dict:
+        if self._started_at is None:
+            await self.start()
+        confirm_task = asyncio.ensure_future(self._confirm_loop())
+        deadline = None if duration is None else time.monotonic() + duration
+        try:
+            while deadline is None or time.monotonic() < deadline:
+                try:
+                    if self._accounts_stale():
+                        await self.refresh_accounts()
+                    else:
+                        await self.refresh_crank()
+                    await self.turn()
+                except Exception:
+                    self._error(f"Crank {self.crank_account.public_key} could not be turned")
+                    self._blockhash = None
+                await asyncio.sleep(self.poll_interval)
+        finally:
+            confirm_task.cancel()
+            await asyncio.gather(confirm_task, return_exceptions=True)
+        return self.stats()
+
+    """
+    Get throughput and latency statistics.
+
+    Returns:
+        dict: transaction counters, confirmed pops/sec and the confirmation latency histogram
+    """
+    def stats(self) -> dict:
+        elapsed = time.monotonic() - self._started_at if self._started_at else 0.0
+        return {
+            "sent": self.sent,
+            "confirmed": self.confirmed,
+            "failed": self.failed,
+            "mismatches": self.mismatches,
+            "expired": self.expired,
+            "errors": self.errors,
+            "in_flight": len(self.in_flight),
+            "pops_per_sec": self.confirmed / elapsed if elapsed else 0.0,
+            "confirmation_latency": self.confirmation_latency.snapshot(),
+        }
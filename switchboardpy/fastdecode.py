@@ -0,0 +1,240 @@
+import anchorpy
+import inflection
+import struct
+
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Callable, Iterator, Optional
+
+from anchorpy.error import AccountInvalidDiscriminator
+from construct import Container
+from solana.publickey import PublicKey
+
+from switchboardpy.common import account_discriminator, get_program_extensions
+
+# Account types decoded on hot paths, for which decoders are generated up front.
+FAST_DECODED_ACCOUNTS = (
+    "AggregatorAccountData",
+    "CrankAccountData",
+    "OracleQueueAccountData",
+    "LeaseAccountData",
+)
+
+# Size of the anchor account discriminator preceding the account fields.
+DISCRIMINATOR_SIZE = 8
+
+# struct format of each fixed size borsh primitive
+_PRIMITIVE_FORMATS = {
+    "bool": "?",
+    "u8": "B",
+    "i8": "b",
+    "u16": "H",
+    "i16": "h",
+    "u32": "I",
+    "i32": "i",
+    "u64": "Q",
+    "i64": "q",
+    "f32": "f",
+    "f64": "d",
+}
+
+@dataclass
+class _Node:
+    """Compiled layout of one IDL type.
+
+    Attributes:
+        fmt (str): struct format of the type, without byte order
+        size (int): encoded size in bytes
+        build (Callable): consumes the unpacked values of the type and returns the decoded value
+        fields (dict | None): for structs, field name -> (offset, _Node)
+    """
+    fmt: str
+    size: int
+    build: Callable[[Iterator[Any]], Any]
+    fields: Optional[dict] = None
+
+def _get(obj: Any, key: str) -> Any:
+    if isinstance(obj, dict):
+        return obj.get(key)
+    return getattr(obj, key, None)
+
+def _build_int128(signed: bool) -> Callable[[Iterator[Any]], int]:
+    return lambda values: int.from_bytes(next(values), "little", signed=signed)
+
+def _compile_fields(fields: list, types: dict, type_classes: dict, name: Optional[str]) -> _Node:
+    compiled: dict = {}
+    offset = 0
+    for field in fields:
+        node = _compile_type(_get(field, "type"), types, type_classes)
+        compiled[inflection.underscore(_get(field, "name"))] = (offset, node)
+        offset += node.size
+    nodes = [node for _, node in compiled.values()]
+    names = list(compiled.keys())
+    cls = type_classes.get(name) if name else None
+    if cls is not None:
+        build = lambda values: cls(*[node.build(values) for node in nodes])
+    else:
+        build = lambda values: Container(zip(names, [node.build(values) for node in nodes]))
+    return _Node("".join(node.fmt for node in nodes), offset, build, compiled)
+
+def _compile_type(ty: Any, types: dict, type_classes: dict) -> _Node:
+    if isinstance(ty, str):
+        if ty in _PRIMITIVE_FORMATS:
+            fmt = _PRIMITIVE_FORMATS[ty]
+            return _Node(fmt, struct.calcsize("<" + fmt), next)
+        if ty in ("u128", "i128"):
+            return _Node("16s", 16, _build_int128(ty == "i128"))
+        if ty == "publicKey":
+            return _Node("32s", 32, lambda values: PublicKey(next(values)))
+        raise ValueError(f"{ty} is not a fixed size type.")
+    array = _get(ty, "array")
+    if array is not None:
+        inner_ty, length = array
+        inner = _compile_type(inner_ty, types, type_classes)
+        if inner.build is next:
+            return _Node(f"{length}{inner.fmt}", inner.size * length, lambda values: list(islice(values, length)))
+        return _Node(inner.fmt * length, inner.size * length, lambda values: [inner.build(values) for _ in range(length)])
+    defined = _get(ty, "defined")
+    if defined is not None:
+        typedef = _get(types[defined], "type")
+        if _get(typedef, "variants") is not None:
+            if any(_get(variant, "fields") for variant in _get(typedef, "variants")):
+                raise ValueError(f"{defined} is an enum with data and is not fixed size.")
+            return _Node("B", 1, next)
+        return _compile_fields(_get(typedef, "fields"), types, type_classes, defined)
+    raise ValueError(f"{ty} is not a fixed size type.")
+
+
+class FastDecoder:
+    """Flat struct.Struct decoder for one fixed size account type, generated from the IDL.
+
+    The whole account is unpacked by a single precompiled struct.Struct and the
+    flat values are then regrouped into the nested structure the anchorpy coder
+    produces. Individual fields can be decoded without touching the rest.
+
+    Attributes:
+        account_name (str): IDL name of the account type
+        size (int): size of the account data, discriminator included
+    """
+
+    def __init__(self, account_name: str, layout: _Node):
+        self.account_name = account_name
+        self.discriminator = account_discriminator(account_name)
+        self.size = DISCRIMINATOR_SIZE + layout.size
+        self._layout = layout
+        self._struct = struct.Struct("<" + layout.fmt)
+        self._fields: dict = {}
+
+    def _check_discriminator(self, data: bytes):
+        if data[:DISCRIMINATOR_SIZE] != self.discriminator:
+            raise AccountInvalidDiscriminator(f"Account data has an invalid discriminator for {self.account_name}")
+
+    """
+    Decode a full account.
+
+    Args:
+        data (bytes): raw account data, discriminator included
+
+    Returns:
+        Container: data parsed in accordance with the Switchboard IDL
+
+    Raises:
+        AccountInvalidDiscriminator: If the discriminator doesn't match the IDL.
+    """
+    def decode(self, data: bytes) -> Any:
+        self._check_discriminator(data)
+        return self._layout.build(iter(self._struct.unpack_from(data, DISCRIMINATOR_SIZE)))
+
+    """
+    Get the position of a (possibly nested) field in the account data.
+
+    Args:
+        path (str): dotted snake_case field path, e.g. "latest_confirmed_round.result"
+
+    Returns:
+        Tuple[int, int]: offset of the field from the start of the account data
+            (discriminator included) and its size in bytes
+    """
+    def field_offset(self, path: str) -> tuple:
+        offset, node = self._field(path)
+        return offset, node.size
+
+    def _field(self, path: str) -> tuple:
+        offset = DISCRIMINATOR_SIZE
+        node = self._layout
+        for name in path.split("."):
+            if node.fields is None or name not in node.fields:
+                raise KeyError(f"{self.account_name} has no field {path}")
+            field_offset, node = node.fields[name]
+            offset += field_offset
+        return offset, node
+
+    def _field_decoder(self, path: str) -> Callable[[bytes, int], Any]:
+        decoder = self._fields.get(path)
+        if decoder is None:
+            offset, node = self._field(path)
+            field_struct = struct.Struct("<" + node.fmt)
+            build = node.build
+            decoder = lambda data, base: build(iter(field_struct.unpack_from(data, offset - base)))
+            self._fields[path] = decoder
+        return decoder
+
+    """
+    Decode only the requested fields of an account.
+
+    Args:
+        data (bytes): raw account data, or a slice of it starting at `base`
+        fields (list[str]): dotted snake_case field paths,
+            e.g. ["latest_confirmed_round.result", "latest_confirmed_round.round_open_timestamp"]
+        base (int): offset in the account of the first byte of data. The
+            discriminator is only checked when data starts at the account start.
+
+    Returns:
+        dict[str, Any]: decoded value of each requested field
+
+    Raises:
+        AccountInvalidDiscriminator: If the discriminator doesn't match the IDL.
+    """
+    def decode_fields(self, data: bytes, fields: list[str], base: int = 0) -> dict:
+        if base == 0:
+            self._check_discriminator(data)
+        return {path: self._field_decoder(path)(data, base) for path in fields}
+
+"""
+Generate a FastDecoder for an account type from an IDL.
+
+Args:
+    idl (anchorpy.Idl | dict): program IDL
+    account_name (str): IDL name of the account type
+    type_classes (dict | None): classes to build defined types with, e.g. program.type,
+        so decoded values match those of the anchorpy coder
+
+Returns:
+    FastDecoder
+
+Raises:
+    ValueError: If the account is not fixed size.
+"""
+def build_decoder(idl: Any, account_name: str, type_classes: Optional[dict] = None) -> FastDecoder:
+    types = {_get(typedef, "name"): typedef for typedef in _get(idl, "types") or []}
+    accounts = {_get(typedef, "name"): typedef for typedef in _get(idl, "accounts") or []}
+    fields = _get(_get(accounts[account_name], "type"), "fields")
+    layout = _compile_fields(fields, types, dict(type_classes or {}), None)
+    return FastDecoder(account_name, layout)
+
+"""
+Get the FastDecoder of an account type for a program, generating it on first use.
+
+Args:
+    program (anchorpy.Program): Switchboard program representation holding connection and IDL
+    account_name (str): IDL name of the account type
+
+Returns:
+    FastDecoder
+"""
+def get_decoder(program: anchorpy.Program, account_name: str) -> FastDecoder:
+    decoders = get_program_extensions(program).setdefault("fast_decoders", {})
+    decoder = decoders.get(account_name)
+    if decoder is None:
+        decoder = decoders[account_name] = build_decoder(program.idl, account_name, getattr(program, "type", None))
+    return decoder
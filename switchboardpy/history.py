@@ -0,0 +1,384 @@
+import asyncio
+import struct
+import numpy as np
+
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, AsyncIterator, Iterator, Optional, Union
+
+from solana.publickey import PublicKey
+from solana.rpc.types import DataSliceOpts
+
+from switchboardpy.common import SWITCHBOARD_DECIMAL_SIZE, SwitchboardDecimal, account_info_bytes
+
+# Fixed AggregatorHistoryRow size: i64 timestamp followed by a SwitchboardDecimal
+HISTORY_ROW_SIZE = 8 + SWITCHBOARD_DECIMAL_SIZE
+
+# Account discriminator followed by the u32 insert index
+HISTORY_HEADER_SIZE = 12
+
+# Buffers with at least this many rows are read with dataSlice requests for the
+# rows needed, once their size is known, rather than downloaded whole.
+HISTORY_SLICE_MIN_ROWS = 2048
+
+# Number of timestamps probed concurrently per round trip when searching a buffer remotely.
+HISTORY_SEARCH_FANOUT = 8
+
+# Rows fetched per dataSlice request when iterating over a buffer remotely.
+HISTORY_CHUNK_ROWS = 1024
+
+# Packed layout of an AggregatorHistoryRow. NumPy has no 128 bit integer, so the
+# mantissa is viewed as its low (unsigned) and high (signed) 64 bit halves.
+HISTORY_ROW_DTYPE = np.dtype([
+    ("timestamp", "<i8"),
+    ("mantissa_lo", "<u8"),
+    ("mantissa_hi", "<i8"),
+    ("scale", "<u4"),
+])
+
+@dataclass
+class AggregatorHistoryRow:
+    """AggregatorHistoryRow is a wrapper for the row structure of elements in the aggregator history buffer.
+
+    Attributes:
+        timestamp (int): timestamp of the aggregator result
+        value (Decimal): Aggregator value at the timestamp
+    """
+    timestamp: int
+    value: Decimal
+
+    """
+    Generate an AggregatorHistoryRow from a retrieved buffer representation
+
+    Args:
+        buf (bytes | memoryview): HISTORY_ROW_SIZE bytes of a serialized AggregatorHistoryRow
+
+    Returns:
+        AggregatorHistoryRow
+    """
+    @staticmethod
+    def from_buffer(buf: bytes):
+        timestamp: int = struct.unpack_from("<q", buf)[0]
+        return AggregatorHistoryRow(timestamp, SwitchboardDecimal.unpack_decimal_from(buf, 8))
+
+
+class AggregatorHistory:
+    """Decoded aggregator history buffer in chronological order.
+
+    The rows are a NumPy view over the account data; the ring buffer rotation at
+    insert_idx is applied by reading the rows as (at most) two basic slices of
+    the buffer rather than by copying them.
+
+    Attributes:
+        rows (np.ndarray): structured view of every row in the buffer, in storage order
+        start (int): storage index of the oldest row
+        count (int): number of rows
+        segments (tuple[np.ndarray, ...]): views of the rows oldest first, a
+            second one when they wrap around the end of the buffer
+        timestamps (np.ndarray): int64 row timestamps, oldest first, a view of
+            the rows unless they wrap
+        values (np.ndarray): float64 row values, oldest first
+    """
+
+    def __init__(self, rows: np.ndarray, start: int = 0, count: Optional[int] = None):
+        self.rows = rows
+        self.count = len(rows) if count is None else count
+        self.start = start % len(rows) if len(rows) else 0
+        end = self.start + self.count
+        if end <= len(rows):
+            self.segments = (rows[self.start:end],)
+        else:
+            self.segments = (rows[self.start:], rows[:end - len(rows)])
+        if len(self.segments) == 1:
+            self.timestamps = self.segments[0]["timestamp"]
+            self.values = self._segment_values(self.segments[0])
+        else:
+            self.timestamps = np.concatenate([segment["timestamp"] for segment in self.segments])
+            self.values = np.concatenate([self._segment_values(segment) for segment in self.segments])
+
+    @staticmethod
+    def _segment_values(segment: np.ndarray) -> np.ndarray:
+        high = segment["mantissa_hi"]
+        low = segment["mantissa_lo"].view(np.int64)
+        # mantissas which fit in an int64 convert exactly, summing the halves as floats would cancel out
+        mantissas = np.where(
+            high == (low >> 63),
+            low.astype(np.float64),
+            high.astype(np.float64) * 2.0 ** 64 + segment["mantissa_lo"].astype(np.float64)
+        )
+        return SwitchboardDecimal.to_float_array(mantissas, segment["scale"])
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _storage_index(self, i: int) -> int:
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("history row index out of range")
+        return (self.start + i) % len(self.rows)
+
+    """
+    Get the exact value of a row as a Decimal.
+
+    Args:
+        i (int): chronological index of the row
+
+    Returns:
+        Decimal
+    """
+    def decimal_at(self, i: int) -> Decimal:
+        return SwitchboardDecimal.unpack_decimal_from(self.rows, self._storage_index(i) * HISTORY_ROW_SIZE + 8)
+
+    """
+    Lazily produce the exact value of every row as a Decimal, oldest first.
+
+    Returns:
+        Iterator[Decimal]
+    """
+    def decimals(self) -> Iterator[Decimal]:
+        for i in range(self.count):
+            yield self.decimal_at(i)
+
+    """
+    Find the chronological index range of the rows with since <= timestamp < until,
+    limited to the last rows of that range, by binary search.
+
+    Args:
+        since (int | None): first timestamp included
+        until (int | None): first timestamp excluded
+        last (int | None): maximum number of rows, the most recent ones are kept
+
+    Returns:
+        tuple[int, int]: start and stop chronological indexes
+    """
+    def index_range(self, since: Optional[int] = None, until: Optional[int] = None, last: Optional[int] = None) -> tuple[int, int]:
+        start = 0 if since is None else int(np.searchsorted(self.timestamps, since, side="left"))
+        stop = self.count if until is None else max(start, int(np.searchsorted(self.timestamps, until, side="left")))
+        if last is not None:
+            start = max(start, stop - last)
+        return start, stop
+
+    """
+    Select the rows with since <= timestamp < until, without copying them.
+
+    Args:
+        since (int | None): first timestamp included
+        until (int | None): first timestamp excluded
+        last (int | None): maximum number of rows, the most recent ones are kept
+
+    Returns:
+        AggregatorHistory
+    """
+    def select(self, since: Optional[int] = None, until: Optional[int] = None, last: Optional[int] = None) -> "AggregatorHistory":
+        start, stop = self.index_range(since, until, last)
+        return AggregatorHistory(self.rows, self.start + start, stop - start)
+
+    """
+    Lazily produce the rows with since <= timestamp < until, oldest first.
+
+    Args:
+        since (int | None): first timestamp included
+        until (int | None): first timestamp excluded
+        last (int | None): maximum number of rows, the most recent ones are kept
+
+    Returns:
+        Iterator[AggregatorHistoryRow]
+    """
+    def iter_rows(self, since: Optional[int] = None, until: Optional[int] = None, last: Optional[int] = None) -> Iterator[AggregatorHistoryRow]:
+        start, stop = self.index_range(since, until, last)
+        for i in range(start, stop):
+            yield self[i]
+
+    def __getitem__(self, i: int) -> AggregatorHistoryRow:
+        return AggregatorHistoryRow(int(self.rows[self._storage_index(i)]["timestamp"]), self.decimal_at(i))
+
+    def __iter__(self) -> Iterator[AggregatorHistoryRow]:
+        for i in range(self.count):
+            yield self[i]
+
+"""
+Decode an aggregator history buffer account without copying its rows.
+
+Args:
+    buf (bytes | memoryview): raw history buffer account data
+
+Returns:
+    AggregatorHistory: rows ordered oldest to newest
+"""
+def decode_history(buf: Union[bytes, memoryview]) -> AggregatorHistory:
+    view = memoryview(buf)
+    num_rows = history_num_rows(len(view))
+    if num_rows == 0:
+        return _empty_history()
+    insert_idx: int = struct.unpack_from("<L", view, 8)[0] % num_rows
+    rows = np.frombuffer(view, dtype=HISTORY_ROW_DTYPE, count=num_rows, offset=HISTORY_HEADER_SIZE)
+
+    # Until the buffer wraps, the row at insert_idx has never been written and
+    # only [0, insert_idx) holds data. Afterwards the oldest row is at insert_idx.
+    if rows["timestamp"][insert_idx] == 0:
+        return AggregatorHistory(rows, 0, insert_idx)
+    return AggregatorHistory(rows, insert_idx, num_rows)
+
+"""
+Get the number of rows of a history buffer account.
+
+Args:
+    size (int): account data length
+
+Returns:
+    int
+"""
+def history_num_rows(size: int) -> int:
+    return max(0, (size - HISTORY_HEADER_SIZE) // HISTORY_ROW_SIZE)
+
+def _empty_history() -> AggregatorHistory:
+    return AggregatorHistory(np.empty(0, dtype=HISTORY_ROW_DTYPE))
+
+async def _fetch_slice(connection: Any, public_key: PublicKey, offset: int, length: int) -> bytes:
+    info = await connection.get_account_info(
+        public_key,
+        encoding="base64",
+        data_slice=DataSliceOpts(offset=offset, length=length)
+    )
+    value = info["result"]["value"]
+    return account_info_bytes(value) if value else b''
+
+"""
+Find the storage segments of the rows with since <= timestamp < until of a
+history buffer account, fetching only the byte ranges needed with dataSlice.
+
+The insert index is read first, then each bound is found with a search over the
+chronological order probing HISTORY_SEARCH_FANOUT row timestamps concurrently
+per round trip.
+
+Args:
+    connection (AsyncClient): RPC connection
+    public_key (PublicKey): history buffer account
+    num_rows (int): number of rows of the buffer, see history_num_rows
+    since (int | None): first timestamp included
+    until (int | None): first timestamp excluded
+    last (int | None): maximum number of rows, the most recent ones are kept
+
+Returns:
+    list[tuple[int, int]]: (first storage index, number of rows) of the rows in
+        range oldest to newest, two segments when they wrap around the end of the buffer
+"""
+async def _history_range_segments(
+    connection: Any,
+    public_key: PublicKey,
+    num_rows: int,
+    since: Optional[int],
+    until: Optional[int],
+    last: Optional[int]
+) -> list:
+    header = await _fetch_slice(connection, public_key, 0, HISTORY_HEADER_SIZE)
+    if num_rows == 0 or len(header) < HISTORY_HEADER_SIZE:
+        return []
+    insert_idx: int = struct.unpack_from("<L", header, 8)[0] % num_rows
+
+    async def timestamps_at(storage_indexes: list) -> list:
+        slices = await asyncio.gather(*[
+            _fetch_slice(connection, public_key, HISTORY_HEADER_SIZE + i * HISTORY_ROW_SIZE, 8)
+            for i in storage_indexes
+        ])
+        return [struct.unpack_from("<q", data)[0] for data in slices]
+
+    # Same rotation as decode_history: the buffer has wrapped once the row at insert_idx was written
+    (oldest_timestamp,) = await timestamps_at([insert_idx])
+    count, base = (insert_idx, 0) if oldest_timestamp == 0 else (num_rows, insert_idx)
+
+    async def lower_bound(timestamp: int, lo: int, hi: int) -> int:
+        while lo < hi:
+            probes = sorted({lo + (hi - lo) * (k + 1) // (HISTORY_SEARCH_FANOUT + 1) for k in range(HISTORY_SEARCH_FANOUT)})
+            timestamps = await timestamps_at([(base + i) % num_rows for i in probes])
+            for probe, probe_timestamp in zip(probes, timestamps):
+                if probe_timestamp >= timestamp:
+                    hi = probe
+                    break
+                lo = probe + 1
+        return lo
+
+    start = 0 if since is None else await lower_bound(since, 0, count)
+    stop = count if until is None else await lower_bound(until, start, count)
+    if last is not None:
+        start = max(start, stop - last)
+    if start >= stop:
+        return []
+
+    first = (base + start) % num_rows
+    segments = [(first, min(stop - start, num_rows - first))]
+    if segments[0][1] < stop - start:
+        segments.append((0, stop - start - segments[0][1]))
+    return segments
+
+def _history_from_slices(slices: list) -> AggregatorHistory:
+    data = b''.join(slices)
+    rows = np.frombuffer(data, dtype=HISTORY_ROW_DTYPE, count=len(data) // HISTORY_ROW_SIZE)
+    return AggregatorHistory(rows)
+
+"""
+Read the rows with since <= timestamp < until of a history buffer account,
+fetching only the byte ranges needed with dataSlice: the range is searched
+remotely (see _history_range_segments), then the rows in range are fetched
+concurrently.
+
+Args:
+    connection (AsyncClient): RPC connection
+    public_key (PublicKey): history buffer account
+    num_rows (int): number of rows of the buffer, see history_num_rows
+    since (int | None): first timestamp included
+    until (int | None): first timestamp excluded
+    last (int | None): maximum number of rows, the most recent ones are kept
+
+Returns:
+    AggregatorHistory: rows in range ordered oldest to newest
+"""
+async def read_history_range(
+    connection: Any,
+    public_key: PublicKey,
+    num_rows: int,
+    since: Optional[int] = None,
+    until: Optional[int] = None,
+    last: Optional[int] = None
+) -> AggregatorHistory:
+    segments = await _history_range_segments(connection, public_key, num_rows, since, until, last)
+    if not segments:
+        return _empty_history()
+    return _history_from_slices(await asyncio.gather(*[
+        _fetch_slice(connection, public_key, HISTORY_HEADER_SIZE + i * HISTORY_ROW_SIZE, n * HISTORY_ROW_SIZE)
+        for i, n in segments
+    ]))
+
+"""
+Read the rows with since <= timestamp < until of a history buffer account like
+read_history_range, but fetch them chunk_rows at a time, producing each chunk
+as soon as it arrives.
+
+Args:
+    connection (AsyncClient): RPC connection
+    public_key (PublicKey): history buffer account
+    num_rows (int): number of rows of the buffer, see history_num_rows
+    since (int | None): first timestamp included
+    until (int | None): first timestamp excluded
+    last (int | None): maximum number of rows, the most recent ones are kept
+    chunk_rows (int): maximum number of rows fetched per request
+
+Returns:
+    AsyncIterator[AggregatorHistory]: chunks of rows in range ordered oldest to newest
+"""
+async def iter_history_chunks(
+    connection: Any,
+    public_key: PublicKey,
+    num_rows: int,
+    since: Optional[int] = None,
+    until: Optional[int] = None,
+    last: Optional[int] = None,
+    chunk_rows: int = HISTORY_CHUNK_ROWS
+) -> AsyncIterator[AggregatorHistory]:
+    for first, n in await _history_range_segments(connection, public_key, num_rows, since, until, last):
+        for i in range(first, first + n, chunk_rows):
+            length = min(chunk_rows, first + n - i)
+            yield _history_from_slices([
+                await _fetch_slice(connection, public_key, HISTORY_HEADER_SIZE + i * HISTORY_ROW_SIZE, length * HISTORY_ROW_SIZE)
+            ])
@@ -0,0 +1,325 @@
+import contextvars
+import sys
+import threading
+import time
+
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, NamedTuple, Optional
+
+import anchorpy
+
+from switchboardpy.common import SPAWNING_FRAME, get_program_extensions
+from switchboardpy.metrics import LatencyHistogram
+
+# Modules skipped when attributing an RPC call to the SDK function which made it.
+INTERNAL_MODULES = frozenset(("switchboardpy.common", "switchboardpy.instrumentation", "switchboardpy.pda"))
+
+# Label of calls made outside of any SDK function or caller() scope.
+UNKNOWN_CALLER = "unknown"
+
+# Label set by caller(), used when no SDK function is found on the stack.
+_CALLER: contextvars.ContextVar = contextvars.ContextVar("switchboardpy_rpc_caller", default=None)
+
+# SDK function label of each code object, resolved once.
+_LABELS: dict = {}
+
+# One completed RPC request, as passed to RpcInstrumentation callbacks
+class RpcCall(NamedTuple):
+    method: str
+    caller: str
+    seconds: float
+    bytes: int
+    error: bool
+
+class RpcMethodStats:
+    """Counters of the RPC requests for one (method, caller) pair.
+
+    Attributes:
+        count (int): number of requests
+        errors (int): requests which raised or returned a JSON-RPC error
+        bytes (int): response body bytes received
+        latency (LatencyHistogram): request latency
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.bytes = 0
+        self.latency = LatencyHistogram()
+
+    def record(self, call: RpcCall):
+        self.count += 1
+        self.errors += call.error
+        self.bytes += call.bytes
+        self.latency.observe(call.seconds)
+
+def _label(frame: Any) -> str:
+    code = frame.f_code
+    label = _LABELS.get(code)
+    if label is None:
+        label = code.co_name
+        module_name = frame.f_globals.get("__name__")
+        for obj in list(frame.f_globals.values()):
+            if isinstance(obj, type) and obj.__module__ == module_name:
+                attr = obj.__dict__.get(code.co_name)
+                if getattr(getattr(attr, "__func__", attr), "__code__", None) is code:
+                    label = f"{obj.__name__}.{code.co_name}"
+                    break
+        _LABELS[code] = label
+    return label
+
+def _sdk_label(frame: Any) -> Optional[str]:
+    while frame is not None:
+        module_name = frame.f_globals.get("__name__", "")
+        if module_name.startswith("switchboardpy.") and module_name not in INTERNAL_MODULES:
+            return _label(frame)
+        frame = frame.f_back
+    return None
+
+"""
+Find the SDK function an RPC call originates from: the innermost switchboardpy
+frame outside of the shared helpers, looking through background fetch tasks
+spawned by the SDK, then the caller() label, if any.
+
+Returns:
+    str: e.g. "CrankAccount.push"
+"""
+def current_caller() -> str:
+    label = _sdk_label(sys._getframe(1))
+    if label is None:
+        label = _sdk_label(SPAWNING_FRAME.get())
+    return label or _CALLER.get() or UNKNOWN_CALLER
+
+"""
+Attribute RPC calls made outside of SDK functions, e.g. from application code
+or tasks spawned by the SDK, to a label.
+
+Args:
+    label (str): caller label reported in the stats
+
+Example:
+    with caller("settlement"):
+        await connection.get_balance(wallet)
+"""
+@contextmanager
+def caller(label: str) -> Iterator[None]:
+    token = _CALLER.set(label)
+    try:
+        yield
+    finally:
+        _CALLER.reset(token)
+
+class RpcInstrumentation:
+    """Records count, errors, bytes received and latency of every RPC request made
+    through a program's connection, per RPC method and per calling SDK function.
+
+    The connection provider's make_request is wrapped on install and restored on
+    uninstall, so an uninstrumented program has no overhead at all. While
+    installed but disabled, each request costs one attribute check.
+
+    Attributes:
+        enabled (bool): whether requests are being recorded
+        track_callers (bool): attribute requests to SDK functions, which walks the stack
+        stats (dict[tuple[str, str], RpcMethodStats]): stats by (method, caller)
+        callbacks (list[Callable[[RpcCall], None]]): called after every recorded request
+    """
+
+    def __init__(self, callbacks: Optional[list] = None, track_callers: bool = True, enabled: bool = True):
+        self.enabled = enabled
+        self.track_callers = track_callers
+        self.stats: dict[tuple[str, str], RpcMethodStats] = {}
+        self.callbacks: list[Callable[[RpcCall], None]] = list(callbacks or [])
+        self._lock = threading.Lock()
+        self._provider: Any = None
+        self._response_bytes = contextvars.ContextVar("switchboardpy_rpc_response_bytes", default=None)
+
+    """
+    Register a function called with an RpcCall after every recorded request.
+
+    Args:
+        callback (Callable[[RpcCall], None])
+    """
+    def add_callback(self, callback: Callable[[RpcCall], None]):
+        self.callbacks.append(callback)
+
+    """
+    Wrap the connection of a program. Does nothing if already installed on it.
+
+    Args:
+        program (anchorpy.Program): Switchboard program representation holding connection and IDL
+
+    Returns:
+        RpcInstrumentation: self
+
+    Raises:
+        ValueError: If another RpcInstrumentation is installed on the program.
+    """
+    def install(self, program: anchorpy.Program) -> "RpcInstrumentation":
+        extensions = get_program_extensions(program)
+        installed = extensions.get("instrumentation")
+        if installed is self:
+            return self
+        if installed is not None:
+            raise ValueError("Program connection is already instrumented.")
+        provider = program.provider.connection._provider
+        make_request = provider.make_request
+        after_request = getattr(provider, "_after_request", None)
+        response_bytes = self._response_bytes
+
+        async def instrumented_make_request(method: Any, *params: Any) -> Any:
+            if not self.enabled:
+                return await make_request(method, *params)
+            caller_label = current_caller() if self.track_callers else UNKNOWN_CALLER
+            size = [0]
+            token = response_bytes.set(size)
+            error = True
+            start = time.perf_counter()
+            try:
+                response = await make_request(method, *params)
+                error = isinstance(response, dict) and "error" in response
+                return response
+            finally:
+                seconds = time.perf_counter() - start
+                response_bytes.reset(token)
+                self.record(RpcCall(str(method), caller_label, seconds, size[0], error))
+
+        def instrumented_after_request(raw_response: Any, *args: Any, **kwargs: Any) -> Any:
+            size = response_bytes.get()
+            if size is not None:
+                size[0] = len(raw_response.content)
+            return after_request(raw_response, *args, **kwargs)
+
+        provider.make_request = instrumented_make_request
+        if after_request is not None:
+            provider._after_request = instrumented_after_request
+        self._provider = provider
+        extensions["instrumentation"] = self
+        return self
+
+    """
+    Restore the original connection of a program.
+
+    Args:
+        program (anchorpy.Program): Switchboard program representation holding connection and IDL
+    """
+    def uninstall(self, program: anchorpy.Program):
+        extensions = get_program_extensions(program)
+        if extensions.get("instrumentation") is not self:
+            return
+        self._provider.__dict__.pop("make_request", None)
+        self._provider.__dict__.pop("_after_request", None)
+        self._provider = None
+        del extensions["instrumentation"]
+
+    """
+    Record a completed request and notify the callbacks.
+
+    Args:
+        call (RpcCall)
+    """
+    def record(self, call: RpcCall):
+        key = (call.method, call.caller)
+        with self._lock:
+            stats = self.stats.get(key)
+            if stats is None:
+                stats = self.stats[key] = RpcMethodStats()
+            stats.record(call)
+        for callback in self.callbacks:
+            callback(call)
+
+    """
+    Drop all recorded stats.
+    """
+    def reset(self):
+        with self._lock:
+            self.stats = {}
+
+    """
+    Get the recorded stats as plain dicts.
+
+    Returns:
+        list[dict]: method, caller, count, errors, bytes and latency snapshot per (method, caller)
+    """
+    def snapshot(self) -> list[dict]:
+        with self._lock:
+            return [
+                {
+                    "method": method,
+                    "caller": caller_label,
+                    "count": stats.count,
+                    "errors": stats.errors,
+                    "bytes": stats.bytes,
+                    "latency": stats.latency.snapshot(),
+                }
+                for (method, caller_label), stats in sorted(self.stats.items())
+            ]
+
+    """
+    Export the recorded stats in the Prometheus text exposition format.
+
+    Args:
+        prefix (str): metric name prefix
+
+    Returns:
+        str: switchboardpy_rpc_requests_total, _errors_total, _response_bytes_total
+            counters and the switchboardpy_rpc_latency_seconds histogram
+    """
+    def prometheus(self, prefix: str = "switchboardpy_rpc") -> str:
+        with self._lock:
+            items = sorted(self.stats.items())
+            counters = {
+                "requests_total": ("RPC requests.", [stats.count for _, stats in items]),
+                "errors_total": ("RPC requests which failed.", [stats.errors for _, stats in items]),
+                "response_bytes_total": ("RPC response bytes received.", [stats.bytes for _, stats in items]),
+            }
+            lines = []
+            labels = [f'method="{_escape(method)}",caller="{_escape(caller_label)}"' for (method, caller_label), _ in items]
+            for name, (help_text, values) in counters.items():
+                lines.append(f"# HELP {prefix}_{name} {help_text}")
+                lines.append(f"# TYPE {prefix}_{name} counter")
+                lines.extend(f"{prefix}_{name}{{{label}}} {value}" for label, value in zip(labels, values))
+            lines.append(f"# HELP {prefix}_latency_seconds RPC request latency.")
+            lines.append(f"# TYPE {prefix}_latency_seconds histogram")
+            for label, (_, stats) in zip(labels, items):
+                histogram = stats.latency
+                cumulative = 0
+                for bound, count in zip(list(histogram.buckets) + ["+Inf"], histogram.counts):
+                    cumulative += count
+                    lines.append(f'{prefix}_latency_seconds_bucket{{{label},le="{bound}"}} {cumulative}')
+                lines.append(f"{prefix}_latency_seconds_sum{{{label}}} {histogram.sum}")
+                lines.append(f"{prefix}_latency_seconds_count{{{label}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+"""
+Instrument the connection of a program.
+
+Args:
+    program (anchorpy.Program): Switchboard program representation holding connection and IDL
+    callbacks (list[Callable[[RpcCall], None]] | None): called after every recorded request
+    track_callers (bool): attribute requests to SDK functions
+
+Returns:
+    RpcInstrumentation: the installed instrumentation, the existing one if already instrumented
+"""
+def instrument(program: anchorpy.Program, callbacks: Optional[list] = None, track_callers: bool = True) -> RpcInstrumentation:
+    installed = get_instrumentation(program)
+    if installed is not None:
+        for callback in callbacks or []:
+            installed.add_callback(callback)
+        return installed
+    return RpcInstrumentation(callbacks, track_callers).install(program)
+
+"""
+Get the instrumentation installed on a program.
+
+Args:
+    program (anchorpy.Program): Switchboard program representation holding connection and IDL
+
+Returns:
+    RpcInstrumentation | None
+"""
+def get_instrumentation(program: anchorpy.Program) -> Optional[RpcInstrumentation]:
+    return get_program_extensions(program).get("instrumentation")
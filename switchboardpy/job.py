@@ -6,8 +6,8 @@ from solana.publickey import PublicKey
 from solana.system_program import CreateAccountParams, create_account
 
 from switchboardpy.compiled import OracleJob
-from switchboardpy.common import AccountParams
-from switchboardpy.program import ProgramStateAccount
+from switchboardpy.common import AccountParams, fetch_account, load_many_accounts
+from switchboardpy.program import get_program_context
 
 # Parameters for initializing a JobAccount
 @dataclass
@@ -68,9 +68,22 @@ class JobAccount:
         AccountInvalidDiscriminator: If the discriminator doesn't match the IDL.
     """
     async def load_data(self):
-        job = await self.program.account["JobAccountData"].fetch(self.public_key)
-        job.ebuf = None
-        return job
+        return await fetch_account(self.program, "JobAccountData", self.public_key)
+
+    """
+    Load and parse many JobAccounts at once with batched getMultipleAccounts calls.
+
+    Args:
+        program (anchorpy.Program): Switchboard program representation holding connection and IDL
+        pubkeys (list[PublicKey]): job pubkeys to load
+
+    Returns:
+        list[Any | Exception]: data parsed in accordance with the Switchboard IDL,
+            or the error raised for that pubkey, in input order
+    """
+    @staticmethod
+    async def load_many(program: anchorpy.Program, pubkeys: list[PublicKey]):
+        return await load_many_accounts(program, "JobAccountData", pubkeys)
 
     """
     Load and parse the protobuf from the raw buffer stored in the JobAccount.
@@ -117,8 +130,9 @@ class JobAccount:
 
         job_account = params.keypair or Keypair.generate()
         size = 280 + len(params.data) + (''.join(params.variables) if params.variables else 0)
-        state_account, state_bump = ProgramStateAccount.from_seed(program)
-        state = await state_account.load_data()
+        context = get_program_context(program)
+        state_account, state_bump = context.state_account, context.state_bump
+        author_wallet = params.author_wallet or await context.token_vault()
         response = await program.provider.connection.get_minimum_balance_for_rent_exemption(size)
         lamports = response["result"]
         await program.rpc["job_init"](
@@ -132,7 +146,7 @@ class JobAccount:
             ctx=anchorpy.Context(
                 accounts={
                     "job": job_account.public_key,
-                    "author_wallet": params.author_wallet or state.token_vault,
+                    "author_wallet": author_wallet,
                     "program_state": state_account.public_key
                 },
                 signers=[job_account],
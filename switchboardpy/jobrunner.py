@@ -0,0 +1,543 @@
+import asyncio
+import contextvars
+import functools
+import json
+import re
+import statistics
+import time
+
+from collections import OrderedDict
+from decimal import Decimal, InvalidOperation
+from typing import Any, Awaitable, Callable, NamedTuple, Optional
+from urllib.parse import urlsplit
+
+import anchorpy
+import httpx
+
+from solana.publickey import PublicKey
+
+from switchboardpy import jsonpath
+from switchboardpy.aggregator import AggregatorAccount
+from switchboardpy.analytics import Twap
+from switchboardpy.common import AccountParams
+from switchboardpy.compiled import OracleJob
+from switchboardpy.metrics import LatencyHistogram
+from switchboardpy.streams import StreamManager
+
+# Default seconds before an HTTP request made by a job times out.
+DEFAULT_HTTP_TIMEOUT = 10.0
+
+# Default maximum number of open connections, across all hosts and to a single host.
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_CONNECTIONS_PER_HOST = 10
+
+# Default seconds an idle keep-alive connection stays in the pool.
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+
+# Default seconds during which identical HTTP requests share one response.
+DEFAULT_FETCH_WINDOW = 2.0
+
+# Default maximum number of MedianTask, MeanTask and MaxTask children evaluated at once, across all jobs.
+DEFAULT_MAX_CONCURRENT_CHILDREN = 64
+
+# Default maximum number of HTTP requests in flight at once, across all hosts and jobs.
+DEFAULT_MAX_CONCURRENT_FETCHES = DEFAULT_MAX_CONNECTIONS
+
+# Set within a child holding a slot of the children budget, so that its own children
+# run within that slot instead of waiting for slots held by their ancestors.
+_IN_CHILD_SLOT: contextvars.ContextVar = contextvars.ContextVar("switchboardpy_in_child_slot", default=False)
+
+class TaskError(ValueError):
+    """Raised when a task of an OracleJob cannot be evaluated.
+
+    Attributes:
+        task (str): name of the task, e.g. "http_task"
+    """
+
+    def __init__(self, task: str, message: str):
+        super().__init__(f"{task}: {message}")
+        self.task = task
+
+class HttpBody(jsonpath.JsonText):
+    """Body of an HTTP response, shared by every task that made the same request
+    within a round. The JSON document is parsed once, on first use.
+    """
+
+# Outcome of one subtask or subjob of a MedianTask, MeanTask or MaxTask
+class ChildResult(NamedTuple):
+
+    """Name of the parent task, e.g. median_task"""
+    task: str
+
+    """Position among the parent's subtasks followed by its subjobs"""
+    index: int
+
+    """Seconds taken to evaluate the child"""
+    seconds: float
+
+    """Result, None if the child failed"""
+    value: Optional[Decimal]
+
+    """Error, None if the child succeeded"""
+    error: Optional[BaseException]
+
+# Outcome of running the jobs of an aggregator
+class JobResults(NamedTuple):
+
+    """Median of the successful job results, None if every job failed"""
+    value: Optional[Decimal]
+
+    """Smallest successful job result"""
+    min_response: Optional[Decimal]
+
+    """Largest successful job result"""
+    max_response: Optional[Decimal]
+
+    """Result of each job, None where it failed"""
+    results: list
+
+    """Error of each job, None where it succeeded"""
+    errors: list
+
+class JobRunner:
+    """Evaluates OracleJob task pipelines locally.
+
+    Every HttpTask goes through one pooled httpx.AsyncClient (HTTP keep-alive,
+    connection limits and timeouts), at most max_connections_per_host requests
+    are in flight to any single host and max_concurrent_fetches overall. Identical requests (same method,
+    URL, headers and body) issued within fetch_window seconds of each other are
+    sent once and share the response and its parsed JSON, so the jobs of many
+    aggregators hitting the same endpoint in a round cost a single request.
+    The subtasks and subjobs of MedianTask, MeanTask and MaxTask run
+    concurrently, at most max_concurrent_children at once across the runner.
+    Children nested in a running child share its slot, so only the top level
+    of a tree counts against that budget; the requests of the whole tree are
+    bounded by max_concurrent_fetches. Failed children are ignored as long as
+    min_child_successes succeed.
+    WebsocketTasks read the latest message of long-lived streams shared by
+    every job (see StreamManager).
+    Tasks reading aggregators (aggregator_pubkey operands, TwapTask) need a
+    program.
+
+    Task handlers are looked up by the name of the Task oneof field in
+    handlers, so deployments can add or override handlers.
+
+    Attributes:
+        program (anchorpy.Program | None): Switchboard program, for tasks reading aggregators
+        client (httpx.AsyncClient): pooled HTTP client
+        max_connections_per_host (int): concurrent requests allowed per host
+        max_concurrent_fetches (int): concurrent requests allowed across all hosts
+        fetch_window (float): seconds a response is reused for identical requests,
+            0 to only merge identical requests in flight at the same time
+        max_concurrent_children (int): top-level children of MedianTask, MeanTask and MaxTask evaluated at once
+        min_child_successes (int): children that must succeed for such a task to succeed
+        child_latency (dict[str, LatencyHistogram]): child evaluation latency by parent task name
+        on_child (Callable[[ChildResult], None] | None): called with every evaluated child
+        streams (StreamManager): websocket streams of WebsocketTasks
+        handlers (dict[str, Callable]): async handler(task, input) by Task oneof field name
+    """
+
+    def __init__(
+        self,
+        program: Optional[anchorpy.Program] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        timeout: float = DEFAULT_HTTP_TIMEOUT,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_connections_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+        fetch_window: float = DEFAULT_FETCH_WINDOW,
+        max_concurrent_fetches: int = DEFAULT_MAX_CONCURRENT_FETCHES,
+        max_concurrent_children: int = DEFAULT_MAX_CONCURRENT_CHILDREN,
+        min_child_successes: int = 1,
+        streams: Optional[StreamManager] = None
+    ):
+        self.program = program
+        self._owns_client = client is None
+        self.client = client or httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=keepalive_expiry
+            )
+        )
+        self.max_connections_per_host = max_connections_per_host
+        self._host_limits: dict[str, asyncio.Semaphore] = {}
+        self.max_concurrent_fetches = max_concurrent_fetches
+        self._fetches_budget: Optional[asyncio.Semaphore] = None
+        self.fetch_window = fetch_window
+        # request key -> (time issued, task fetching the response), oldest first
+        self._fetches: OrderedDict = OrderedDict()
+        self.max_concurrent_children = max_concurrent_children
+        self.min_child_successes = min_child_successes
+        self._children_budget: Optional[asyncio.Semaphore] = None
+        self.child_latency: dict[str, LatencyHistogram] = {}
+        self.on_child: Optional[Callable[[ChildResult], None]] = None
+        self._owns_streams = streams is None
+        self.streams = streams or StreamManager()
+        self.handlers: dict[str, Callable[[Any, Any], Awaitable[Any]]] = {
+            "http_task": self._http_task,
+            "websocket_task": self._websocket_task,
+            "json_parse_task": self._json_parse_task,
+            "median_task": self._median_task,
+            "mean_task": self._mean_task,
+            "max_task": self._max_task,
+            "value_task": self._value_task,
+            "conditional_task": self._conditional_task,
+            "divide_task": self._divide_task,
+            "multiply_task": self._multiply_task,
+            "add_task": self._add_task,
+            "subtract_task": self._subtract_task,
+            "regex_extract_task": self._regex_extract_task,
+            "twap_task": self._twap_task,
+        }
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_t, exc_v, exc_tb):
+        await self.close()
+
+    """
+    Close the HTTP client and websocket streams, if created by the runner.
+    """
+    async def close(self):
+        if self._owns_client:
+            await self.client.aclose()
+        if self._owns_streams:
+            await self.streams.close()
+
+    """
+    Forget the responses kept for identical requests, e.g. to start a new update
+    round before fetch_window has elapsed.
+    """
+    def clear_fetches(self):
+        self._fetches.clear()
+
+    """
+    Run the jobs of several aggregators concurrently, identical requests across
+    all of them being sent once.
+
+    Args:
+        aggregator_jobs (list[list[OracleJob]]): jobs of each aggregator
+
+    Returns:
+        list[JobResults]: results of each aggregator
+    """
+    async def run_round(self, aggregator_jobs: list) -> list:
+        return list(await asyncio.gather(*[self.run_jobs(jobs) for jobs in aggregator_jobs]))
+
+    """
+    Run the jobs of an aggregator concurrently and aggregate their results.
+
+    Args:
+        jobs (list[OracleJob]): jobs to run
+
+    Returns:
+        JobResults: median, min and max of the successful results, as needed by
+            AggregatorSaveResultParams, and each job's result or error
+    """
+    async def run_jobs(self, jobs: list) -> JobResults:
+        outcomes = await asyncio.gather(*[self.run_job(job) for job in jobs], return_exceptions=True)
+        results = [None if isinstance(outcome, BaseException) else outcome for outcome in outcomes]
+        errors = [outcome if isinstance(outcome, BaseException) else None for outcome in outcomes]
+        successes = [result for result in results if result is not None]
+        if not successes:
+            return JobResults(None, None, None, results, errors)
+        return JobResults(statistics.median(successes), min(successes), max(successes), results, errors)
+
+    """
+    Run the task pipeline of a job.
+
+    Args:
+        job (OracleJob): job to run
+
+    Returns:
+        Decimal: result of the last task
+
+    Raises:
+        TaskError: If a task fails or the result is not a number.
+    """
+    async def run_job(self, job: OracleJob) -> Decimal:
+        return _to_decimal("job", await self.run_tasks(job.tasks, None))
+
+    """
+    Run tasks in sequence, each one receiving the output of the previous one.
+
+    Args:
+        tasks (list[OracleJob.Task]): tasks to run
+        value (Any): input of the first task
+
+    Returns:
+        Any: output of the last task
+    """
+    async def run_tasks(self, tasks: Any, value: Any) -> Any:
+        for task in tasks:
+            value = await self.run_task(task, value)
+        return value
+
+    """
+    Run one task.
+
+    Args:
+        task (OracleJob.Task): task to run
+        value (Any): output of the previous task, None for the first one
+
+    Returns:
+        Any: output of the task
+
+    Raises:
+        TaskError: If the task fails or is not supported.
+    """
+    async def run_task(self, task: Any, value: Any) -> Any:
+        name = task.WhichOneof("Task")
+        handler = self.handlers.get(name)
+        if handler is None:
+            raise TaskError(name or "task", "not supported by JobRunner")
+        return await handler(getattr(task, name), value)
+
+    """
+    Fetch a URL through the pooled client, within the per host limit. A request
+    identical to one issued less than fetch_window seconds ago, or still in
+    flight, shares its response instead of being sent again.
+
+    Args:
+        method (str): HTTP method
+        url (str): URL
+        headers (dict[str, str]): request headers
+        body (str | None): request body
+
+    Returns:
+        HttpBody: response body
+
+    Raises:
+        TaskError: If the request fails, times out or returns an error status.
+    """
+    async def fetch(self, method: str, url: str, headers: dict, body: Optional[str] = None) -> HttpBody:
+        key = (method, url, tuple(sorted(headers.items())), body)
+        now = time.monotonic()
+        while self._fetches:
+            issued, request = next(iter(self._fetches.values()))
+            if now - issued <= self.fetch_window or not request.done():
+                break
+            self._fetches.popitem(last=False)
+        entry = self._fetches.get(key)
+        if entry is None or (entry[1].done() and now - entry[0] > self.fetch_window):
+            request = asyncio.ensure_future(self._fetch(method, url, headers, body))
+            self._fetches[key] = entry = (now, request)
+            self._fetches.move_to_end(key)
+            request.add_done_callback(lambda done: self._forget_failed(key, done))
+        # shielded so that a cancelled task does not cancel the request shared with other ones
+        return await asyncio.shield(entry[1])
+
+    def _forget_failed(self, key: tuple, request: asyncio.Future):
+        if (request.cancelled() or request.exception() is not None) and self._fetches.get(key, (None, None))[1] is request:
+            del self._fetches[key]
+
+    async def _fetch(self, method: str, url: str, headers: dict, body: Optional[str]) -> HttpBody:
+        host = urlsplit(url).netloc
+        limit = self._host_limits.get(host)
+        if limit is None:
+            limit = self._host_limits[host] = asyncio.Semaphore(self.max_connections_per_host)
+        if self._fetches_budget is None:
+            self._fetches_budget = asyncio.Semaphore(self.max_concurrent_fetches)
+        # the host slot comes first, so that requests queued for a busy host do not hold back other hosts
+        async with limit, self._fetches_budget:
+            try:
+                response = await self.client.request(method, url, headers=headers, content=body)
+            except httpx.HTTPError as e:
+                raise TaskError("http_task", f"{method} {url} failed: {e!r}")
+        if response.status_code >= 400:
+            raise TaskError("http_task", f"{method} {url} returned {response.status_code}")
+        return HttpBody(response.text)
+
+    async def _http_task(self, task: Any, value: Any) -> HttpBody:
+        method = "POST" if task.method == OracleJob.HttpTask.METHOD_POST else "GET"
+        headers = {header.key: header.value for header in task.headers}
+        return await self.fetch(method, task.url, headers, task.body or None)
+
+    async def _websocket_task(self, task: Any, value: Any) -> jsonpath.JsonText:
+        max_age = task.max_data_age_seconds or None
+        try:
+            message = await self.streams.latest(task.url, task.subscription, task.filter, max_age)
+        except ValueError as e:
+            raise TaskError("websocket_task", str(e))
+        if message is None:
+            fresh = f" in the last {max_age}s" if max_age else ""
+            error = self.streams.last_error(task.url, task.subscription)
+            cause = f" (last connection error: {error!r})" if error is not None else ""
+            raise TaskError("websocket_task", f"no message matching {task.filter or 'any filter'} from {task.url}{fresh}{cause}")
+        return message
+
+    async def _json_parse_task(self, task: Any, value: Any) -> Any:
+        document = value
+        if isinstance(value, (str, bytes)):
+            try:
+                document = value.document() if isinstance(value, jsonpath.JsonText) else json.loads(value)
+            except ValueError as e:
+                raise TaskError("json_parse_task", f"input is not JSON: {e}")
+        try:
+            parse_document = compile_json_parse_task(task.path, task.aggregation_method)
+        except ValueError as e:
+            raise TaskError("json_parse_task", str(e))
+        return parse_document(document)
+
+    async def _children(self, name: str, task: Any, value: Any) -> list:
+        children = [self.run_task(child, value) for child in task.tasks] + [self.run_job(job) for job in task.jobs]
+        outcomes = await asyncio.gather(*[self._child(name, i, child) for i, child in enumerate(children)])
+        results = [outcome.value for outcome in outcomes if outcome.error is None]
+        if len(results) < max(1, self.min_child_successes):
+            errors = "; ".join(str(outcome.error) for outcome in outcomes if outcome.error is not None)
+            raise TaskError(name, f"{len(results)} of {len(outcomes)} subtasks and subjobs succeeded: {errors}")
+        return results
+
+    async def _child(self, name: str, index: int, child: Awaitable) -> ChildResult:
+        if self._children_budget is None:
+            self._children_budget = asyncio.Semaphore(self.max_concurrent_children)
+        if _IN_CHILD_SLOT.get():
+            return await self._timed_child(name, index, child)
+        async with self._children_budget:
+            _IN_CHILD_SLOT.set(True)
+            return await self._timed_child(name, index, child)
+
+    async def _timed_child(self, name: str, index: int, child: Awaitable) -> ChildResult:
+        start = time.perf_counter()
+        try:
+            outcome = ChildResult(name, index, 0.0, _to_decimal(name, await child), None)
+        except Exception as e:
+            outcome = ChildResult(name, index, 0.0, None, e)
+        outcome = outcome._replace(seconds=time.perf_counter() - start)
+        histogram = self.child_latency.get(name)
+        if histogram is None:
+            histogram = self.child_latency[name] = LatencyHistogram()
+        histogram.observe(outcome.seconds)
+        if self.on_child is not None:
+            self.on_child(outcome)
+        return outcome
+
+    async def _median_task(self, task: Any, value: Any) -> Decimal:
+        return statistics.median(await self._children("median_task", task, value))
+
+    async def _mean_task(self, task: Any, value: Any) -> Decimal:
+        results = await self._children("mean_task", task, value)
+        return sum(results) / len(results)
+
+    async def _max_task(self, task: Any, value: Any) -> Decimal:
+        return max(await self._children("max_task", task, value))
+
+    async def _value_task(self, task: Any, value: Any) -> Decimal:
+        return _to_decimal("value_task", task.value)
+
+    async def _conditional_task(self, task: Any, value: Any) -> Any:
+        try:
+            return await self.run_tasks(task.attempt, value)
+        except Exception:
+            if not task.on_failure:
+                raise
+            return await self.run_tasks(task.on_failure, value)
+
+    async def _operand(self, name: str, task: Any, oneof: str) -> Decimal:
+        operand = task.WhichOneof(oneof)
+        if operand == "scalar":
+            return _to_decimal(name, task.scalar)
+        if operand == "aggregator_pubkey":
+            return await self._aggregator(name, task.aggregator_pubkey).get_latest_value()
+        if operand == "job":
+            return await self.run_job(task.job)
+        raise TaskError(name, "missing operand")
+
+    async def _divide_task(self, task: Any, value: Any) -> Decimal:
+        denominator = await self._operand("divide_task", task, "Denominator")
+        if denominator == 0:
+            raise TaskError("divide_task", "division by zero")
+        return _to_decimal("divide_task", value) / denominator
+
+    async def _multiply_task(self, task: Any, value: Any) -> Decimal:
+        return _to_decimal("multiply_task", value) * await self._operand("multiply_task", task, "Multiple")
+
+    async def _add_task(self, task: Any, value: Any) -> Decimal:
+        return _to_decimal("add_task", value) + await self._operand("add_task", task, "Addition")
+
+    async def _subtract_task(self, task: Any, value: Any) -> Decimal:
+        return _to_decimal("subtract_task", value) - await self._operand("subtract_task", task, "Subtraction")
+
+    async def _regex_extract_task(self, task: Any, value: Any) -> str:
+        match = re.search(task.pattern, value if isinstance(value, str) else json.dumps(value, default=str))
+        if match is None:
+            raise TaskError("regex_extract_task", f"{task.pattern!r} did not match")
+        try:
+            return match.group(task.group_number)
+        except IndexError:
+            raise TaskError("regex_extract_task", f"{task.pattern!r} has no group {task.group_number}")
+
+    async def _twap_task(self, task: Any, value: Any) -> Decimal:
+        aggregator = self._aggregator("twap_task", task.aggregator_pubkey)
+        history = await aggregator.load_history_range(since=int(time.time()) - task.period)
+        if len(history) == 0:
+            raise TaskError("twap_task", f"no history of {task.aggregator_pubkey} in the last {task.period}s")
+        twap = Twap()
+        twap.update(history.timestamps, history.values)
+        return _to_decimal("twap_task", twap.value)
+
+    def _aggregator(self, name: str, pubkey: str) -> AggregatorAccount:
+        if self.program is None:
+            raise TaskError(name, "reading aggregators requires a JobRunner program")
+        return AggregatorAccount(AccountParams(program=self.program, public_key=PublicKey(pubkey)))
+
+"""
+Build the function evaluating a JsonParseTask, cached by path and aggregation
+method so that recurring tasks neither reparse their path nor dispatch on their
+aggregation method again. Malformed paths are kept by jsonpath.compile_path.
+
+Args:
+    path (str): JSONPath expression
+    method (int): OracleJob.JsonParseTask.AggregationMethod
+
+Returns:
+    Callable[[Any], Any]: function of the parsed JSON returning the task output
+
+Raises:
+    ValueError: If the path is malformed or unsupported.
+"""
+@functools.lru_cache(maxsize=jsonpath.JSONPATH_CACHE_SIZE)
+def compile_json_parse_task(path: str, method: int) -> Callable[[Any], Any]:
+    select = jsonpath.compile_path(path)
+    if method == OracleJob.JsonParseTask.NONE:
+        def first(document: Any) -> Any:
+            matches = select(document)
+            if not matches:
+                raise TaskError("json_parse_task", f"{path} matched nothing")
+            return matches[0]
+        return first
+
+    aggregate = {OracleJob.JsonParseTask.MIN: min, OracleJob.JsonParseTask.MAX: max}.get(method, sum)
+
+    def aggregated(document: Any) -> Decimal:
+        numbers = [_to_decimal("json_parse_task", match) for match in _flatten(select(document))]
+        if not numbers:
+            raise TaskError("json_parse_task", f"{path} matched no number")
+        return aggregate(numbers)
+    return aggregated
+
+def _flatten(values: list) -> list:
+    flat = []
+    for value in values:
+        if isinstance(value, list):
+            flat.extend(_flatten(value))
+        else:
+            flat.append(value)
+    return flat
+
+def _to_decimal(name: str, value: Any) -> Decimal:
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, bool) or value is None:
+        raise TaskError(name, f"{value!r} is not a number")
+    try:
+        # repr keeps floats to their shortest round trip digits, e.g. 0.1 rather than 0.1000000000000000055
+        number = Decimal(repr(value) if isinstance(value, float) else str(value).strip())
+    except InvalidOperation:
+        raise TaskError(name, f"{value!r} is not a number")
+    if not number.is_finite():
+        raise TaskError(name, f"{value!r} is not a finite number")
+    return number
@@ -0,0 +1,352 @@
+import functools
+import json
+import operator
+import re
+
+from typing import Any, Callable, Union
+
+# Comparison operators supported in filter expressions, longest first.
+_COMPARISONS = (
+    ("==", operator.eq),
+    ("!=", operator.ne),
+    ("<=", operator.le),
+    (">=", operator.ge),
+    ("<", operator.lt),
+    (">", operator.gt),
+)
+
+_NAME = re.compile(r"[A-Za-z_$][\w$-]*|\*")
+_SLICE = re.compile(r"^\s*(-?\d*)\s*:\s*(-?\d*)\s*(?::\s*(-?\d*)\s*)?$")
+
+# Marker of a missing value in filter expressions
+_MISSING = object()
+
+# Number of compiled paths, and malformed paths, kept by compile_path.
+JSONPATH_CACHE_SIZE = 1024
+
+class JsonText(str):
+    """Text holding a JSON document, parsed once on first use and then shared by
+    everything reading it.
+    """
+
+    """
+    Parse the text as JSON, once.
+
+    Returns:
+        Any: parsed JSON
+
+    Raises:
+        ValueError: If the text is not JSON.
+    """
+    def document(self) -> Any:
+        try:
+            return self._document
+        except AttributeError:
+            self._document = json.loads(self)
+            return self._document
+
+"""
+Split a JSONPath expression into steps.
+
+Supports the subset used by OracleJob JsonParseTasks: the root $, .name and
+['name'] children (several names separated by commas), [n] indexes, [a:b:c]
+slices, .* and [*] wildcards, .. recursive descent, and [?(...)] filters
+comparing @ relative paths to literals with ==, !=, <, <=, >, >=, joined by
+&& and ||.
+
+Args:
+    path (str): JSONPath expression, e.g. $.data[?(@.symbol == 'BTCUSDT')].price
+
+Returns:
+    list[tuple]: steps, each a (kind, argument) pair
+
+Raises:
+    ValueError: If the expression is malformed or unsupported.
+"""
+def parse(path: str) -> list:
+    path = path.strip()
+    if not path.startswith("$") and not path.startswith("@"):
+        raise ValueError(f"JSONPath {path!r} must start with $.")
+    steps = []
+    i = 1
+    while i < len(path):
+        if path.startswith("..", i):
+            i += 2
+            if i < len(path) and path[i] == "[":
+                step, i = _parse_bracket(path, i)
+            else:
+                step, i = _parse_name(path, i)
+            steps.append(("descend", step))
+        elif path[i] == ".":
+            step, i = _parse_name(path, i + 1)
+            steps.append(step)
+        elif path[i] == "[":
+            step, i = _parse_bracket(path, i)
+            steps.append(step)
+        elif path[i].isspace():
+            i += 1
+        else:
+            raise ValueError(f"Unexpected {path[i]!r} at {i} in JSONPath {path!r}.")
+    return steps
+
+def _parse_name(path: str, i: int) -> tuple:
+    match = _NAME.match(path, i)
+    if match is None:
+        raise ValueError(f"Expected a name at {i} in JSONPath {path!r}.")
+    name = match.group()
+    return ("wildcard", None) if name == "*" else ("child", [name]), match.end()
+
+def _closing_bracket(path: str, i: int) -> int:
+    depth = 0
+    quote = None
+    for j in range(i, len(path)):
+        c = path[j]
+        if quote:
+            if c == quote:
+                quote = None
+        elif c in "'\"":
+            quote = c
+        elif c in "[(":
+            depth += 1
+        elif c in "])":
+            depth -= 1
+            if depth == 0:
+                return j
+    raise ValueError(f"Unbalanced brackets in JSONPath {path!r}.")
+
+def _parse_bracket(path: str, i: int) -> tuple:
+    end = _closing_bracket(path, i)
+    inner = path[i + 1:end].strip()
+    if inner == "*":
+        return ("wildcard", None), end + 1
+    if inner.startswith("?"):
+        expression = inner[1:].strip()
+        if expression.startswith("(") and expression.endswith(")"):
+            expression = expression[1:-1]
+        return ("filter", _parse_filter(expression)), end + 1
+    slice_match = _SLICE.match(inner)
+    if slice_match:
+        start, stop, step = (int(part) if part else None for part in slice_match.groups())
+        return ("slice", slice(start, stop, step)), end + 1
+    items = [_literal(item.strip()) for item in _split(inner, ",")]
+    if all(isinstance(item, int) and not isinstance(item, bool) for item in items):
+        return ("index", items), end + 1
+    if all(isinstance(item, str) for item in items):
+        return ("child", items), end + 1
+    raise ValueError(f"Unsupported selector [{inner}] in JSONPath {path!r}.")
+
+def _split(expression: str, separator: str) -> list:
+    parts = []
+    quote = None
+    depth = 0
+    start = 0
+    i = 0
+    while i < len(expression):
+        c = expression[i]
+        if quote:
+            if c == quote:
+                quote = None
+        elif c in "'\"":
+            quote = c
+        elif c in "[(":
+            depth += 1
+        elif c in "])":
+            depth -= 1
+        elif depth == 0 and expression.startswith(separator, i):
+            parts.append(expression[start:i])
+            i += len(separator)
+            start = i
+            continue
+        i += 1
+    parts.append(expression[start:])
+    return parts
+
+def _literal(token: str) -> Any:
+    if len(token) >= 2 and token[0] == token[-1] and token[0] in "'\"":
+        return token[1:-1]
+    try:
+        return json.loads(token)
+    except ValueError:
+        raise ValueError(f"Invalid literal {token!r} in JSONPath.")
+
+def _parse_filter(expression: str) -> Callable[[Any], bool]:
+    alternatives = [
+        [_parse_comparison(term.strip()) for term in _split(alternative, "&&")]
+        for alternative in _split(expression, "||")
+    ]
+    if len(alternatives) == 1 and len(alternatives[0]) == 1:
+        return alternatives[0][0]
+    return lambda node: any(all(term(node) for term in terms) for terms in alternatives)
+
+def _parse_comparison(term: str) -> Callable[[Any], bool]:
+    for symbol, compare in _COMPARISONS:
+        parts = _split(term, symbol)
+        if len(parts) == 2:
+            left, right = parts[0].strip(), parts[1].strip()
+            left_path = _compile_steps(parse(left)) if left.startswith("@") else None
+            right_path = _compile_steps(parse(right)) if right.startswith("@") else None
+            left_value = None if left_path is not None else _literal(left)
+            right_value = None if right_path is not None else _literal(right)
+            if left_path is not None and right_path is None:
+                # the usual @.field == literal, without resolving the literal side
+                def path_comparison(node: Any) -> bool:
+                    matches = left_path(node)
+                    if not matches:
+                        return False
+                    try:
+                        return bool(compare(matches[0], right_value))
+                    except TypeError:
+                        return False
+                return path_comparison
+
+            def comparison(node: Any) -> bool:
+                a = _first(left_path, node) if left_path is not None else left_value
+                b = _first(right_path, node) if right_path is not None else right_value
+                if a is _MISSING or b is _MISSING:
+                    return False
+                try:
+                    return bool(compare(a, b))
+                except TypeError:
+                    return False
+            return comparison
+    if term.startswith("@"):
+        select = _compile_steps(parse(term))
+        return lambda node: _first(select, node) is not _MISSING
+    raise ValueError(f"Unsupported filter expression {term!r} in JSONPath.")
+
+def _first(select: Callable[[Any], list], node: Any) -> Any:
+    matches = select(node)
+    return matches[0] if matches else _MISSING
+
+def _children(node: Any) -> list:
+    if isinstance(node, dict):
+        return list(node.values())
+    if isinstance(node, list):
+        return node
+    return []
+
+def _select(step: tuple, node: Any) -> list:
+    kind, argument = step
+    if kind == "child":
+        return [node[name] for name in argument if isinstance(node, dict) and name in node]
+    if kind == "index":
+        if not isinstance(node, list):
+            return []
+        return [node[index] for index in argument if -len(node) <= index < len(node)]
+    if kind == "wildcard":
+        return _children(node)
+    if kind == "slice":
+        return node[argument] if isinstance(node, list) else []
+    if kind == "filter":
+        return [child for child in _children(node) if argument(child)]
+    if kind == "descend":
+        matches = []
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            matches.extend(_select(argument, current))
+            stack.extend(reversed(_children(current)))
+        return matches
+    raise ValueError(f"Unknown JSONPath step {kind}.")
+
+"""
+Apply parsed steps to a list of nodes.
+
+Args:
+    steps (list[tuple]): steps from parse
+    nodes (list[Any]): starting nodes
+
+Returns:
+    list[Any]: matched nodes, in document order
+"""
+def apply(steps: list, nodes: list) -> list:
+    for step in steps:
+        nodes = [match for node in nodes for match in _select(step, node)]
+    return nodes
+
+"""
+Evaluate a JSONPath expression against a parsed JSON document.
+
+Args:
+    path (str): JSONPath expression, see parse for the supported syntax
+    document (Any): parsed JSON
+
+Returns:
+    list[Any]: matched values, in document order
+
+Raises:
+    ValueError: If the expression is malformed or unsupported.
+"""
+def evaluate(path: str, document: Any) -> list:
+    return apply(parse(path), [document])
+
+"""
+Compile a JSONPath expression into a function of a parsed JSON document, cached
+by path in an LRU of JSONPATH_CACHE_SIZE paths. Malformed paths are cached too,
+so a broken task does not reparse its path on every evaluation. Runs of plain
+.name and [n] steps, e.g. $.result.XXBTZUSD.c[0], become a single walk down
+the document.
+
+Args:
+    path (str): JSONPath expression, see parse for the supported syntax
+
+Returns:
+    Callable[[Any], list[Any]]: function returning the matched values, in document order
+
+Raises:
+    ValueError: If the expression is malformed or unsupported.
+"""
+def compile_path(path: str) -> Callable[[Any], list]:
+    compiled = _compile_path(path)
+    if isinstance(compiled, ValueError):
+        # a new exception, re-raising the cached one would grow its traceback on every call
+        raise ValueError(*compiled.args)
+    return compiled
+
+@functools.lru_cache(maxsize=JSONPATH_CACHE_SIZE)
+def _compile_path(path: str) -> Union[Callable[[Any], list], ValueError]:
+    try:
+        return _compile_steps(parse(path))
+    except ValueError as e:
+        return e
+
+def _is_key(step: tuple) -> bool:
+    kind, argument = step
+    return kind in ("child", "index") and len(argument) == 1
+
+def _compile_steps(steps: list) -> Callable[[Any], list]:
+    selectors = []
+    i = 0
+    while i < len(steps):
+        if _is_key(steps[i]):
+            j = i
+            while j < len(steps) and _is_key(steps[j]):
+                j += 1
+            selectors.append(_compile_keys([(kind == "index", argument[0]) for kind, argument in steps[i:j]]))
+            i = j
+        else:
+            selectors.append(functools.partial(_select, steps[i]))
+            i += 1
+    if not selectors:
+        return lambda document: [document]
+    if len(selectors) == 1:
+        return selectors[0]
+
+    def select(document: Any) -> list:
+        nodes = [document]
+        for selector in selectors:
+            nodes = [match for node in nodes for match in selector(node)]
+        return nodes
+    return select
+
+def _compile_keys(keys: list) -> Callable[[Any], list]:
+    def select(node: Any) -> list:
+        for is_index, key in keys:
+            if is_index:
+                if not isinstance(node, list) or not -len(node) <= key < len(node):
+                    return []
+            elif not isinstance(node, dict) or key not in node:
+                return []
+            node = node[key]
+        return [node]
+    return select
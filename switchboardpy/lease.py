@@ -6,15 +6,16 @@ from typing import TYPE_CHECKING
 from dataclasses import dataclass
 
 from decimal import Decimal
-from solana import publickey, system_program
+from solana import system_program
 from solana.keypair import Keypair
 from solana.publickey import PublicKey
 from spl.token.constants import ASSOCIATED_TOKEN_PROGRAM_ID, TOKEN_PROGRAM_ID
 from spl.token.instructions import get_associated_token_address
 
 from switchboardpy.oraclequeue import OracleQueueAccount
-from switchboardpy.common import AccountParams
-from switchboardpy.program import ProgramStateAccount
+from switchboardpy.common import AccountParams, fetch_account, load_many_accounts
+from switchboardpy.pda import find_program_address
+from switchboardpy.program import get_program_context
 
 if TYPE_CHECKING:
     from switchboardpy.aggregator import AggregatorAccount
@@ -113,9 +114,22 @@ class LeaseAccount:
         AccountInvalidDiscriminator: If the discriminator doesn't match the IDL.
     """
     async def load_data(self):
-        lease = await self.program.account["LeaseAccountData"].fetch(self.public_key)
-        lease.ebuf = None
-        return lease
+        return await fetch_account(self.program, "LeaseAccountData", self.public_key)
+
+    """
+    Load and parse many LeaseAccounts at once with batched getMultipleAccounts calls.
+
+    Args:
+        program (anchorpy.Program): Switchboard program representation holding connection and IDL
+        pubkeys (list[PublicKey]): lease pubkeys to load
+
+    Returns:
+        list[Any | Exception]: data parsed in accordance with the Switchboard IDL,
+            or the error raised for that pubkey, in input order
+    """
+    @staticmethod
+    async def load_many(program: anchorpy.Program, pubkeys: list[PublicKey]):
+        return await load_many_accounts(program, "LeaseAccountData", pubkeys)
 
     """
     Loads a LeaseAccount from the expected PDA seed format
@@ -130,7 +144,7 @@ class LeaseAccount:
     """
     @staticmethod
     def from_seed(program: anchorpy.Program, queue_account: OracleQueueAccount, aggregator_account: AggregatorAccount):
-        pubkey, bump = publickey.PublicKey.find_program_address(
+        pubkey, bump = find_program_address(
             [
                 bytes(b'LeaseAccountData'), 
                 bytes(queue_account.public_key),
@@ -153,8 +167,9 @@ class LeaseAccount:
     """
     @staticmethod
     async def create(program: anchorpy.Program, params: LeaseInitParams):
-        program_state_account, state_bump = ProgramStateAccount.from_seed(program)
-        switch_token_mint = await program_state_account.get_token_mint()
+        context = get_program_context(program)
+        program_state_account, state_bump = context.state_account, context.state_bump
+        switch_token_mint = await context.token()
         lease_account, lease_bump = LeaseAccount.from_seed(
             program,
             params.oracle_queue_account,
@@ -204,8 +219,8 @@ class LeaseAccount:
         escrow = lease.escrow
         queue = lease.queue
         aggregator = lease.aggregator
-        program_state_account, state_bump = ProgramStateAccount.from_seed(program)
-        switch_token_mint = await program_state_account.get_token_mint()
+        context = get_program_context(program)
+        program_state_account, state_bump = context.state_account, context.state_bump
         lease_account, lease_bump = LeaseAccount.from_seed(
             program,
             OracleQueueAccount(AccountParams(program=program, public_key=queue)),
@@ -251,7 +266,8 @@ class LeaseAccount:
         escrow = lease.escrow
         queue = lease.queue
         aggregator = lease.aggregator
-        program_state_account, state_bump = ProgramStateAccount.from_seed(program)
+        context = get_program_context(program)
+        program_state_account, state_bump = context.state_account, context.state_bump
         lease_account, lease_bump = LeaseAccount.from_seed(
             program,
             OracleQueueAccount(AccountParams(program=program, public_key=queue)),
@@ -0,0 +1,75 @@
+import bisect
+
+from typing import Optional, Sequence
+
+# Default latency histogram bucket upper bounds, in seconds.
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+class LatencyHistogram:
+    """Fixed bucket latency histogram.
+
+    Attributes:
+        buckets (tuple[float]): bucket upper bounds in seconds, the last bucket is +Inf
+        counts (list[int]): number of observations per bucket (not cumulative)
+        count (int): number of observations
+        sum (float): sum of all observations in seconds
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    """
+    Record one observation.
+
+    Args:
+        seconds (float): observed latency
+    """
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    """
+    Estimate a quantile as the upper bound of the bucket it falls in.
+
+    Args:
+        q (float): quantile between 0 and 1
+
+    Returns:
+        float | None: upper bound in seconds, inf for the overflow bucket, None if empty
+    """
+    def quantile(self, q: float) -> Optional[float]:
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return self.buckets[i] if i < len(self.buckets) else float("inf")
+        return float("inf")
+
+    """
+    Get the histogram as a plain dict.
+
+    Returns:
+        dict: count, sum, mean, p50/p90/p99 estimates and cumulative bucket counts
+    """
+    def snapshot(self) -> dict:
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(list(self.buckets) + [float("inf")], self.counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else None,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            "buckets": buckets,
+        }
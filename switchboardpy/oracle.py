@@ -9,9 +9,10 @@ from solana.keypair import Keypair
 from solana.publickey import PublicKey
 from spl.token.constants import TOKEN_PROGRAM_ID
 from switchboardpy.permission import PermissionAccount
-from switchboardpy.program import ProgramStateAccount
+from switchboardpy.program import get_program_context
 
-from switchboardpy.common import AccountParams
+from switchboardpy.common import AccountParams, fetch_account, load_many_accounts
+from switchboardpy.pda import find_program_address
 from switchboardpy.oraclequeue import OracleQueueAccount
 
 
@@ -85,9 +86,22 @@ class OracleAccount:
         AccountInvalidDiscriminator: If the discriminator doesn't match the IDL.
     """
     async def load_data(self):
-        oracle = await self.program.account["OracleAccountData"].fetch(self.public_key)
-        oracle.ebuf = None
-        return oracle
+        return await fetch_account(self.program, "OracleAccountData", self.public_key)
+
+    """
+    Load and parse many OracleAccounts at once with batched getMultipleAccounts calls.
+
+    Args:
+        program (anchorpy.Program): Switchboard program representation holding connection and IDL
+        pubkeys (list[PublicKey]): oracle pubkeys to load
+
+    Returns:
+        list[Any | Exception]: data parsed in accordance with the Switchboard IDL,
+            or the error raised for that pubkey, in input order
+    """
+    @staticmethod
+    async def load_many(program: anchorpy.Program, pubkeys: list[PublicKey]):
+        return await load_many_accounts(program, "OracleAccountData", pubkeys)
 
     """
     Loads a OracleAccount from the expected PDA seed format
@@ -102,7 +116,7 @@ class OracleAccount:
     """
     @staticmethod
     def from_seed(program: anchorpy.Program, queue_account: OracleQueueAccount, wallet: PublicKey):
-        oracle_pubkey, bump = PublicKey.find_program_address(
+        oracle_pubkey, bump = find_program_address(
             [
                 bytes(b'OracleAccountData'), 
                 bytes(queue_account.public_key),
@@ -126,9 +140,10 @@ class OracleAccount:
     """
     @staticmethod
     async def create(program: anchorpy.Program, params: OracleInitParams):
-        payer_keypair = Keypair.from_secret_key(program.provider.wallet.payer.secret_key)
-        program_state_account, state_bump = ProgramStateAccount.from_seed(program)
-        switch_token_mint = await program_state_account.get_token_mint()
+        context = get_program_context(program)
+        payer_keypair = context.payer
+        program_state_account, state_bump = context.state_account, context.state_bump
+        switch_token_mint = await context.token()
         wallet = await switch_token_mint.create_account(program.provider.wallet.public_key)
         await switch_token_mint.set_authority(
             wallet,
@@ -177,7 +192,7 @@ class OracleAccount:
         AccountInvalidDiscriminator: If the discriminator doesn't match the IDL.
     """
     async def heartbeat(self):
-        payer_keypair = Keypair.from_secret_key(self.program.provider.wallet.payer.secret_key)
+        payer_keypair = get_program_context(self.program).payer
         oracle = await self.load_data()
         queue_account = OracleQueueAccount(AccountParams(program=self.program,public_key=oracle.queue_pubkey))
         queue_data = await queue_account.load_data()
@@ -228,13 +243,13 @@ class OracleAccount:
         AccountInvalidDiscriminator: If the discriminator doesn't match the IDL.
     """
     async def withdraw(self, params: OracleWithdrawParams):
-        payer_keypair = Keypair.from_secret_key(self.program.provider.wallet.payer.secret_key)
+        context = get_program_context(self.program)
         oracle = await self.load_data()
         queue_pubkey = oracle.queue_pubkey
         queue_account = OracleQueueAccount(AccountParams(program=self.program, public_key=queue_pubkey))
         queue = await queue_account.load_data()
         queue_authority = queue.authority
-        state_account, state_bump = ProgramStateAccount.from_seed(self.program)
+        state_account, state_bump = context.state_account, context.state_bump
         permission_account, permission_bump = PermissionAccount.from_seed(
             self.program,
             queue_authority,
@@ -10,7 +10,7 @@ from solana.keypair import Keypair
 from solana.system_program import CreateAccountParams, create_account
 from switchboardpy.common import SwitchboardDecimal
 
-from switchboardpy.common import AccountParams
+from switchboardpy.common import AccountParams, fetch_account, load_many_accounts
 
 # Parameters for initializing OracleQueueAccount
 @dataclass
@@ -117,9 +117,22 @@ class OracleQueueAccount:
         AccountInvalidDiscriminator: If the discriminator doesn't match the IDL.
     """
     async def load_data(self):
-        queue = await self.program.account["OracleQueueAccountData"].fetch(self.public_key)
-        queue.ebuf = None
-        return queue
+        return await fetch_account(self.program, "OracleQueueAccountData", self.public_key)
+
+    """
+    Load and parse many OracleQueueAccounts at once with batched getMultipleAccounts calls.
+
+    Args:
+        program (anchorpy.Program): Switchboard program representation holding connection and IDL
+        pubkeys (list[PublicKey]): oracle queue pubkeys to load
+
+    Returns:
+        list[Any | Exception]: data parsed in accordance with the Switchboard IDL,
+            or the error raised for that pubkey, in input order
+    """
+    @staticmethod
+    async def load_many(program: anchorpy.Program, pubkeys: list[PublicKey]):
+        return await load_many_accounts(program, "OracleQueueAccountData", pubkeys)
 
     """
     Create and initialize the OracleQueueAccount
@@ -0,0 +1,124 @@
+import threading
+
+from typing import Any, Iterable, NamedTuple, Optional, Tuple
+from cachetools import LRUCache
+from solana.publickey import PublicKey
+
+# Default number of derived addresses kept by the process-wide PDA cache.
+DEFAULT_PDA_CACHE_SIZE = 16_384
+
+# Counters describing the state of a PdaCache
+class PdaCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+class PdaCache:
+    """Bounded LRU cache of program derived addresses keyed by (program_id, seeds).
+
+    find_program_address loops sha256 and an ed25519 curve check, so PDAs which are
+    derived repeatedly (leases, permissions, program state) are memoized here.
+
+    Attributes:
+        hits (int): number of lookups served from the cache
+        misses (int): number of lookups which had to derive the address
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_PDA_CACHE_SIZE):
+        self._cache = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    """
+    Find a valid program address, deriving it only on a cache miss.
+
+    Args:
+        seeds (list[bytes]): seeds of the program derived address
+        program_id (PublicKey): program which owns the address
+
+    Returns:
+        Tuple[PublicKey, int]: program address and PDA bump
+    """
+    def find_program_address(self, seeds: Iterable[bytes], program_id: PublicKey) -> Tuple[PublicKey, int]:
+        seeds = [bytes(seed) for seed in seeds]
+        key = (bytes(program_id), tuple(seeds))
+        with self._lock:
+            result = self._cache.get(key)
+            if result is not None:
+                self.hits += 1
+                return result
+            self.misses += 1
+        result = PublicKey.find_program_address(seeds, program_id)
+        with self._lock:
+            self._cache[key] = result
+        return result
+
+    """
+    Get hit / miss counters and the size of the cache.
+
+    Returns:
+        PdaCacheInfo
+    """
+    def cache_info(self) -> PdaCacheInfo:
+        with self._lock:
+            return PdaCacheInfo(self.hits, self.misses, int(self._cache.maxsize), len(self._cache))
+
+    """
+    Drop all cached addresses and reset the counters.
+    """
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+# Process-wide cache used by every from_seed helper.
+PDA_CACHE = PdaCache()
+
+"""
+Find a valid program address through the process-wide PDA cache.
+
+Args:
+    seeds (list[bytes]): seeds of the program derived address
+    program_id (PublicKey): program which owns the address
+
+Returns:
+    Tuple[PublicKey, int]: program address and PDA bump
+"""
+def find_program_address(seeds: Iterable[bytes], program_id: PublicKey) -> Tuple[PublicKey, int]:
+    return PDA_CACHE.find_program_address(seeds, program_id)
+
+"""
+Pre-derive the program state, lease and (optionally) permission PDAs for a
+list of feeds so the first crank pop / save result does not pay for them.
+
+Args:
+    program (anchorpy.Program): Switchboard program representation holding connection and IDL
+    pairs (list[Tuple[PublicKey, PublicKey]]): (queue, aggregator) pubkey pairs
+    queue_authority (PublicKey | None): authority of the queue(s), required to derive
+        the aggregator permission PDAs
+
+Returns:
+    PdaCacheInfo: counters after warming
+"""
+def warm_pda_cache(program: Any, pairs: Iterable[Tuple[PublicKey, PublicKey]], queue_authority: Optional[PublicKey] = None) -> PdaCacheInfo:
+    # imported here as the account wrappers themselves depend on this module
+    from switchboardpy.common import AccountParams
+    from switchboardpy.aggregator import AggregatorAccount
+    from switchboardpy.lease import LeaseAccount
+    from switchboardpy.oraclequeue import OracleQueueAccount
+    from switchboardpy.permission import PermissionAccount
+    from switchboardpy.program import ProgramStateAccount
+
+    ProgramStateAccount.from_seed(program)
+    for queue, aggregator in pairs:
+        LeaseAccount.from_seed(
+            program,
+            OracleQueueAccount(AccountParams(program=program, public_key=queue)),
+            AggregatorAccount(AccountParams(program=program, public_key=aggregator))
+        )
+        if queue_authority is not None:
+            PermissionAccount.from_seed(program, queue_authority, queue, aggregator)
+    return PDA_CACHE.cache_info()
@@ -6,7 +6,8 @@ from enum import Enum
 from solana import system_program
 from solana.keypair import Keypair
 from solana.publickey import PublicKey
-from switchboardpy.common import AccountParams
+from switchboardpy.common import AccountParams, fetch_account, load_many_accounts
+from switchboardpy.pda import find_program_address
 
 # Parameters for initializing PermissionAccount
 @dataclass
@@ -91,9 +92,22 @@ class PermissionAccount:
         AccountInvalidDiscriminator: If the discriminator doesn't match the IDL.
     """
     async def load_data(self):
-        permission = await self.program.account["PermissionAccountData"].fetch(self.public_key)
-        permission.ebuf = None
-        return permission
+        return await fetch_account(self.program, "PermissionAccountData", self.public_key)
+
+    """
+    Load and parse many PermissionAccounts at once with batched getMultipleAccounts calls.
+
+    Args:
+        program (anchorpy.Program): Switchboard program representation holding connection and IDL
+        pubkeys (list[PublicKey]): permission pubkeys to load
+
+    Returns:
+        list[Any | Exception]: data parsed in accordance with the Switchboard IDL,
+            or the error raised for that pubkey, in input order
+    """
+    @staticmethod
+    async def load_many(program: anchorpy.Program, pubkeys: list[PublicKey]):
+        return await load_many_accounts(program, "PermissionAccountData", pubkeys)
 
     """
     Get the size of a PermissionAccount on chain
@@ -156,7 +170,7 @@ class PermissionAccount:
     """
     @staticmethod
     def from_seed(program: anchorpy.Program, authority: PublicKey, granter: PublicKey, grantee: PublicKey):
-        pubkey, bump = PublicKey.find_program_address(
+        pubkey, bump = find_program_address(
             [
                 bytes(b'PermissionAccountData'), 
                 bytes(authority),
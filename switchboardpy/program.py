@@ -2,7 +2,6 @@ import anchorpy
 
 from dataclasses import dataclass
 from decimal import Decimal
-from solana import publickey
 from solana import system_program
 
 from spl.token.async_client import AsyncToken
@@ -10,7 +9,8 @@ from spl.token.constants import TOKEN_PROGRAM_ID
 from solana.keypair import Keypair
 from solana.publickey import PublicKey
 
-from switchboardpy.common import AccountParams
+from switchboardpy.common import AccountParams, fetch_account, get_program_extensions, load_many_accounts
+from switchboardpy.pda import find_program_address
 
 # Devnet Program ID.
 SBV2_DEVNET_PID = PublicKey(
@@ -61,7 +61,7 @@ class ProgramStateAccount:
     """
     @staticmethod
     def from_seed(program: anchorpy.Program):
-        state_pubkey, state_bump = publickey.PublicKey.find_program_address(['STATE'.encode()], program.program_id)
+        state_pubkey, state_bump = find_program_address(['STATE'.encode()], program.program_id)
         return ProgramStateAccount(AccountParams(program=program, public_key=state_pubkey)), state_bump
 
     """
@@ -78,9 +78,22 @@ class ProgramStateAccount:
         AccountInvalidDiscriminator: If the discriminator doesn't match the IDL.
     """
     async def load_data(self):
-        state = await self.program.account["SbState"].fetch(self.public_key)
-        state.ebuf = None
-        return state
+        return await fetch_account(self.program, "SbState", self.public_key)
+
+    """
+    Load and parse many ProgramStateAccounts at once with batched getMultipleAccounts calls.
+
+    Args:
+        program (anchorpy.Program): Switchboard program representation holding connection and IDL
+        pubkeys (list[PublicKey]): program state pubkeys to load
+
+    Returns:
+        list[Any | Exception]: data parsed in accordance with the Switchboard IDL,
+            or the error raised for that pubkey, in input order
+    """
+    @staticmethod
+    async def load_many(program: anchorpy.Program, pubkeys: list[PublicKey]):
+        return await load_many_accounts(program, "SbState", pubkeys)
 
     """
     Fetch the Switchboard token mint specified in the program state account.
@@ -91,10 +104,11 @@ class ProgramStateAccount:
         anchorpy.
     """
     async def get_token_mint(self) -> AsyncToken:
-        payer_keypair = Keypair.from_secret_key(self.program.provider.wallet.payer.secret_key)
+        context = get_program_context(self.program)
+        if self.public_key == context.state_account.public_key:
+            return await context.token()
         state = await self.load_data()
-        switch_token_mint = AsyncToken(self.program.provider.connection, state.token_mint, TOKEN_PROGRAM_ID, payer_keypair)
-        return switch_token_mint
+        return AsyncToken(self.program.provider.connection, state.token_mint, TOKEN_PROGRAM_ID, context.payer)
 
     """
     Get the size of the global ProgramStateAccount on chain
@@ -117,8 +131,9 @@ class ProgramStateAccount:
     """
     @staticmethod
     async def create(program: anchorpy.Program, params: ProgramInitParams):
-        payer_keypair = Keypair.from_secret_key(program.provider.wallet.payer.secret_key)
-        state_account, state_bump = ProgramStateAccount.from_seed(program)
+        context = get_program_context(program)
+        payer_keypair = context.payer
+        state_account, state_bump = context.state_account, context.state_bump
         psa = ProgramStateAccount(AccountParams(program=program, public_key=state_account.public_key))
         try:
             await psa.load_data()
@@ -173,9 +188,9 @@ class ProgramStateAccount:
         TransactionSignature
     """
     async def vault_transfer(self, to: PublicKey, authority: Keypair, params: VaultTransferParams):
-        state_pubkey, state_bump = ProgramStateAccount.from_seed(self.program)
-        state = await self.load_data()
-        vault = state.token_vault
+        context = get_program_context(self.program)
+        state_pubkey, state_bump = context.state_account.public_key, context.state_bump
+        vault = await context.token_vault()
         await self.program.rpc["vault_transfer"](
             {
                 "state_bump": state_bump,
@@ -192,3 +207,110 @@ class ProgramStateAccount:
                 signers=[authority]
             )
         )
+
+
+class ProgramContext:
+    """Program wide values every wrapper needs, resolved once per program and
+    shared by all wrappers: the payer keypair, the program state PDA and bump,
+    and the token mint and vault from the program state.
+
+    Attributes:
+        program (anchor.Program): The anchor program ref
+        state_account (ProgramStateAccount): the program state PDA
+        state_bump (int): bump of the program state PDA
+    """
+
+    def __init__(self, program: anchorpy.Program):
+        self.program = program
+        self.state_account, self.state_bump = ProgramStateAccount.from_seed(program)
+        self._payer: Keypair = None
+        self._payer_source: Keypair = None
+        self._token_mint: PublicKey = None
+        self._token_vault: PublicKey = None
+        self._token: AsyncToken = None
+
+    """
+    Payer keypair of the provider wallet, rebuilt only if the wallet changes.
+
+    Returns:
+        Keypair
+    """
+    @property
+    def payer(self) -> Keypair:
+        source = self.program.provider.wallet.payer
+        if source is not self._payer_source:
+            self._payer = Keypair.from_secret_key(source.secret_key)
+            self._payer_source = source
+        return self._payer
+
+    async def _load_state(self):
+        if self._token_mint is None:
+            state = await self.state_account.load_data()
+            self._token_mint = state.token_mint
+            self._token_vault = state.token_vault
+
+    """
+    Get the Switchboard token mint, loading the program state on first use.
+
+    Returns:
+        PublicKey
+
+    Raises:
+        AccountDoesNotExistError: If the program state doesn't exist.
+    """
+    async def token_mint(self) -> PublicKey:
+        await self._load_state()
+        return self._token_mint
+
+    """
+    Get the Switchboard token vault, loading the program state on first use.
+
+    Returns:
+        PublicKey
+
+    Raises:
+        AccountDoesNotExistError: If the program state doesn't exist.
+    """
+    async def token_vault(self) -> PublicKey:
+        await self._load_state()
+        return self._token_vault
+
+    """
+    Get the Switchboard token mint client, paid for by the payer.
+
+    Returns:
+        AsyncToken
+
+    Raises:
+        AccountDoesNotExistError: If the program state doesn't exist.
+    """
+    async def token(self) -> AsyncToken:
+        mint = await self.token_mint()
+        payer = self.payer
+        if self._token is None or self._token.payer is not payer:
+            self._token = AsyncToken(self.program.provider.connection, mint, TOKEN_PROGRAM_ID, payer)
+        return self._token
+
+    """
+    Forget the loaded program state, e.g. after re-initializing it.
+    """
+    def reset(self):
+        self._token_mint = None
+        self._token_vault = None
+        self._token = None
+
+"""
+Get the ProgramContext of a program, creating it on first use.
+
+Args:
+    program (anchorpy.Program): Switchboard program representation holding connection and IDL
+
+Returns:
+    ProgramContext
+"""
+def get_program_context(program: anchorpy.Program) -> ProgramContext:
+    extensions = get_program_extensions(program)
+    context = extensions.get("context")
+    if context is None:
+        context = extensions["context"] = ProgramContext(program)
+    return context
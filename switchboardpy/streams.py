@@ -0,0 +1,204 @@
+import asyncio
+import logging
+import time
+import websockets
+
+from typing import Any, Optional
+
+from switchboardpy import jsonpath
+from switchboardpy.subscribe import (
+    DEFAULT_RECONNECT_BASE_DELAY,
+    DEFAULT_RECONNECT_MAX_DELAY,
+    DEFAULT_WS_MAX_QUEUE,
+    reconnect_delay
+)
+
+logger = logging.getLogger(__name__)
+
+# Default seconds lookups wait for the first message matching a new filter.
+DEFAULT_FIRST_MESSAGE_TIMEOUT = 10.0
+
+class StreamMessage(jsonpath.JsonText):
+    """Latest message of a stream matching a filter, with its receive time. As
+    JsonText it feeds the next task of a job directly and its JSON is parsed once.
+
+    Attributes:
+        received_at (float): time.monotonic() timestamp at which the message was received
+    """
+
+class _Stream:
+    """A websocket connection sending one subscription message and keeping the
+    latest message matching each filter registered on it.
+    """
+
+    def __init__(self, manager: "StreamManager", url: str, subscription: str):
+        self.manager = manager
+        self.url = url
+        self.subscription = subscription
+        # filter -> compiled filter, None for the empty filter which keeps every message
+        self.filters: dict[str, Any] = {}
+        self.filters_added: dict[str, float] = {}
+        self.latest: dict[str, StreamMessage] = {}
+        self.received = asyncio.Condition()
+        self.connected = asyncio.Event()
+        self.last_error: Optional[Exception] = None
+        self.closed = False
+        self.task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self.task = asyncio.ensure_future(self.run())
+
+    async def close(self):
+        self.closed = True
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+    def add_filter(self, filter: str):
+        if filter not in self.filters:
+            self.filters[filter] = jsonpath.compile_path(filter) if filter else None
+            self.filters_added[filter] = time.monotonic()
+
+    async def run(self):
+        attempt = 0
+        while not self.closed:
+            try:
+                async with websockets.connect(self.url, max_queue=self.manager.ws_max_queue) as ws:
+                    if self.subscription:
+                        await ws.send(self.subscription)
+                    self.connected.set()
+                    self.last_error = None
+                    attempt = 0
+                    async for message in ws:
+                        await self.handle(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = e
+                logger.warning("Websocket stream %s failed", self.url, exc_info=True)
+            finally:
+                self.connected.clear()
+            if not self.closed:
+                self.manager.reconnects += 1
+                delay = reconnect_delay(attempt, self.manager.reconnect_base_delay, self.manager.reconnect_max_delay)
+                attempt += 1
+                await asyncio.sleep(delay)
+
+    async def handle(self, message: Any):
+        if isinstance(message, bytes):
+            message = message.decode(errors="replace")
+        received = StreamMessage(message)
+        received.received_at = time.monotonic()
+        matched = False
+        for filter, select in self.filters.items():
+            if select is not None:
+                try:
+                    # filters select the message itself, e.g. $[?(@.channel == 'ticker')]
+                    if not select([received.document()]):
+                        continue
+                except ValueError:
+                    continue
+            self.latest[filter] = received
+            matched = True
+        if matched:
+            async with self.received:
+                self.received.notify_all()
+
+class StreamManager:
+    """Long-lived websocket streams shared by every WebsocketTask using them.
+
+    Each (url, subscription) pair has a single connection, opened on first
+    use, which sends the subscription message on every (re)connection and
+    keeps in memory the latest message matching each filter registered on
+    it. A lookup is then a freshness check of that message. Dropped
+    connections reconnect after an exponential, jittered backoff.
+
+    Attributes:
+        streams (dict[tuple[str, str], _Stream]): streams by (url, subscription)
+        first_message_timeout (float): seconds a lookup waits for a stream's first matching message
+        reconnect_base_delay (float): delay before the first reconnection, doubled after each failed attempt
+        reconnect_max_delay (float): longest delay between reconnections
+        reconnects (int): number of websocket reconnections
+    """
+
+    def __init__(
+        self,
+        first_message_timeout: float = DEFAULT_FIRST_MESSAGE_TIMEOUT,
+        reconnect_base_delay: float = DEFAULT_RECONNECT_BASE_DELAY,
+        reconnect_max_delay: float = DEFAULT_RECONNECT_MAX_DELAY,
+        ws_max_queue: int = DEFAULT_WS_MAX_QUEUE
+    ):
+        self.streams: dict[tuple, _Stream] = {}
+        self.first_message_timeout = first_message_timeout
+        self.reconnect_base_delay = reconnect_base_delay
+        self.reconnect_max_delay = reconnect_max_delay
+        self.ws_max_queue = ws_max_queue
+        self.reconnects = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_t, exc_v, exc_tb):
+        await self.close()
+
+    """
+    Close every stream.
+    """
+    async def close(self):
+        streams = list(self.streams.values())
+        self.streams.clear()
+        for stream in streams:
+            await stream.close()
+
+    """
+    Get the error which last dropped or prevented a stream's connection.
+
+    Args:
+        url (str): websocket URL
+        subscription (str): message sent on connection
+
+    Returns:
+        Exception | None: None if the stream is connected, was never opened or
+            has not failed yet
+    """
+    def last_error(self, url: str, subscription: str = "") -> Optional[Exception]:
+        stream = self.streams.get((url, subscription))
+        return stream.last_error if stream is not None else None
+
+    """
+    Get the latest message of a stream matching a filter, opening the stream
+    if needed. Until a first matching message arrives, lookups wait for it for
+    up to first_message_timeout seconds after the filter was first used.
+
+    Args:
+        url (str): websocket URL
+        subscription (str): message sent on connection, empty to send nothing
+        filter (str): JSONPath filter the message must match, e.g.
+            $[?(@.channel == 'ticker')], empty to accept every message
+        max_age (float | None): seconds after which a message is too old, None for no limit
+
+    Returns:
+        StreamMessage | None: None if no fresh enough message is available
+    """
+    async def latest(self, url: str, subscription: str = "", filter: str = "", max_age: Optional[float] = None) -> Optional[StreamMessage]:
+        stream = self.streams.get((url, subscription))
+        if stream is None:
+            stream = self.streams[(url, subscription)] = _Stream(self, url, subscription)
+            stream.start()
+        message = stream.latest.get(filter)
+        if message is None:
+            stream.add_filter(filter)
+            remaining = self.first_message_timeout - (time.monotonic() - stream.filters_added[filter])
+            if remaining > 0:
+                try:
+                    async with stream.received:
+                        await asyncio.wait_for(stream.received.wait_for(lambda: filter in stream.latest), remaining)
+                except asyncio.TimeoutError:
+                    pass
+            message = stream.latest.get(filter)
+        if message is None or (max_age is not None and time.monotonic() - message.received_at > max_age):
+            return None
+        return message
@@ -0,0 +1,341 @@
+import anchorpy
+import asyncio
+import itertools
+import json
+import logging
+import random
+import time
+import websockets
+
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Optional
+
+from solana.publickey import PublicKey
+
+from switchboardpy.common import account_info_bytes, decode_account, get_program_extensions
+
+# Default number of websocket connections subscriptions are spread over.
+DEFAULT_WS_POOL_SIZE = 2
+
+# Default number of decoded updates buffered for consumers of AccountSubscriber.updates()
+DEFAULT_UPDATE_QUEUE_SIZE = 1024
+
+# Default number of incoming frames websockets buffers per connection before it
+# stops reading from the socket.
+DEFAULT_WS_MAX_QUEUE = 64
+
+# Default delay before the first reconnection of a dropped websocket connection, doubled after every failed attempt.
+DEFAULT_RECONNECT_BASE_DELAY = 0.5
+
+# Default longest delay between reconnection attempts.
+DEFAULT_RECONNECT_MAX_DELAY = 30.0
+
+logger = logging.getLogger(__name__)
+
+"""
+Get the delay before a reconnection attempt: exponential in the number of
+failed attempts, capped, and jittered so connections dropped together don't
+reconnect together.
+
+Args:
+    attempt (int): number of failed attempts since the last successful connection
+    base_delay (float): delay before the first attempt
+    max_delay (float): longest delay
+
+Returns:
+    float: seconds to wait
+"""
+def reconnect_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    delay = min(max_delay, base_delay * 2 ** attempt)
+    return random.uniform(delay / 2, delay)
+
+# A decoded account update received over a subscription
+@dataclass
+class AccountUpdate:
+
+    """Pubkey of the updated account"""
+    public_key: PublicKey
+
+    """IDL name of the account type"""
+    account_name: str
+
+    """Slot at which the update was observed"""
+    slot: int
+
+    """Account data parsed in accordance with the Switchboard IDL"""
+    data: Any
+
+    """time.monotonic() timestamp at which the update was received"""
+    received_at: float
+
+
+class _SubscriptionConnection:
+    """A single websocket connection carrying a share of the subscriptions.
+
+    Every key assigned to the connection is (re)subscribed each time the socket
+    connects, so a dropped connection transparently resubscribes.
+    """
+
+    def __init__(self, subscriber: "AccountSubscriber"):
+        self.subscriber = subscriber
+        self.keys: dict[str, str] = {}
+        self.subscriptions: dict[int, str] = {}
+        self.pending: dict[int, str] = {}
+        self.ws = None
+        self.connected = asyncio.Event()
+        self.closed = False
+        self.task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self.task = asyncio.ensure_future(self.run())
+
+    async def close(self):
+        self.closed = True
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+    async def add(self, key: str, account_name: str):
+        self.keys[key] = account_name
+        if self.ws is not None:
+            await self.send_subscribe(key)
+
+    async def remove(self, key: str):
+        self.keys.pop(key, None)
+        for subscription, subscribed_key in list(self.subscriptions.items()):
+            if subscribed_key == key:
+                del self.subscriptions[subscription]
+                if self.ws is not None:
+                    await self.send("accountUnsubscribe", [subscription])
+
+    async def send(self, method: str, params: list) -> int:
+        request_id = next(self.subscriber.request_ids)
+        await self.ws.send(json.dumps({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}))
+        return request_id
+
+    async def send_subscribe(self, key: str):
+        request_id = await self.send(
+            "accountSubscribe",
+            [key, {"encoding": "base64", "commitment": self.subscriber.commitment}]
+        )
+        self.pending[request_id] = key
+
+    async def run(self):
+        attempt = 0
+        while not self.closed:
+            try:
+                async with websockets.connect(self.subscriber.url, max_queue=self.subscriber.ws_max_queue) as ws:
+                    self.ws = ws
+                    self.subscriptions.clear()
+                    self.pending.clear()
+                    for key in list(self.keys):
+                        await self.send_subscribe(key)
+                    self.connected.set()
+                    attempt = 0
+                    async for message in ws:
+                        self.handle(json.loads(message))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Account subscription connection to %s failed", self.subscriber.url, exc_info=True)
+            finally:
+                self.ws = None
+                self.connected.clear()
+                self.subscriber.invalidate(self.keys)
+            if not self.closed:
+                self.subscriber.reconnects += 1
+                delay = reconnect_delay(attempt, self.subscriber.reconnect_base_delay, self.subscriber.reconnect_max_delay)
+                attempt += 1
+                await asyncio.sleep(delay)
+
+    def handle(self, message: dict):
+        if message.get("id") in self.pending:
+            key = self.pending.pop(message["id"])
+            if "result" in message and key in self.keys:
+                self.subscriptions[message["result"]] = key
+            return
+        if message.get("method") != "accountNotification":
+            return
+        params = message["params"]
+        key = self.subscriptions.get(params["subscription"])
+        if key is None:
+            return
+        result = params["result"]
+        value = result["value"]
+        data = account_info_bytes(value) if value else None
+        self.subscriber.store(key, self.keys[key], result["context"]["slot"], data)
+
+
+class AccountSubscriber:
+    """Push based account updates multiplexed over a small pool of websocket connections.
+
+    Updates are decoded with the program IDL coder and kept in a slot-stamped
+    in-memory cache. Once attached to a program, every wrapper's load_data()
+    answers from this cache while the entry is fresh. Dropped connections
+    reconnect after an exponential, jittered backoff.
+
+    Attributes:
+        program (anchorpy.Program): The anchor program ref
+        url (str): websocket RPC endpoint
+        max_age (float | None): seconds after which a cached entry is no longer served,
+            None to serve entries for as long as their subscription is connected
+        dropped (int): updates discarded because the updates() queue was full
+        reconnect_base_delay (float): delay before the first reconnection, doubled after each failed attempt
+        reconnect_max_delay (float): longest delay between reconnections
+        reconnects (int): number of websocket reconnections
+    """
+
+    def __init__(
+        self,
+        program: anchorpy.Program,
+        url: str,
+        pool_size: int = DEFAULT_WS_POOL_SIZE,
+        max_age: Optional[float] = None,
+        commitment: str = "confirmed",
+        queue_size: int = DEFAULT_UPDATE_QUEUE_SIZE,
+        ws_max_queue: int = DEFAULT_WS_MAX_QUEUE,
+        reconnect_base_delay: float = DEFAULT_RECONNECT_BASE_DELAY,
+        reconnect_max_delay: float = DEFAULT_RECONNECT_MAX_DELAY
+    ):
+        self.program = program
+        self.url = url
+        self.max_age = max_age
+        self.commitment = commitment
+        self.ws_max_queue = ws_max_queue
+        self.reconnect_base_delay = reconnect_base_delay
+        self.reconnect_max_delay = reconnect_max_delay
+        self.request_ids = itertools.count(1)
+        self.connections = [_SubscriptionConnection(self) for _ in range(pool_size)]
+        self.cache: dict[str, AccountUpdate] = {}
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self.reconnects = 0
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_t, exc_v, exc_tb):
+        await self.close()
+
+    """
+    Open the websocket connections and attach the subscriber to its program.
+    """
+    async def start(self):
+        for connection in self.connections:
+            connection.start()
+        self.attach()
+
+    """
+    Close every websocket connection and detach from the program.
+    """
+    async def close(self):
+        self.detach()
+        for connection in self.connections:
+            await connection.close()
+
+    """
+    Make load_data() of wrappers for this program read from the subscription cache.
+    """
+    def attach(self):
+        get_program_extensions(self.program)["subscriber"] = self
+
+    """
+    Stop serving load_data() from the subscription cache.
+    """
+    def detach(self):
+        extensions = get_program_extensions(self.program)
+        if extensions.get("subscriber") is self:
+            del extensions["subscriber"]
+
+    """
+    Wait until every connection in the pool is connected.
+
+    Args:
+        timeout (float | None): seconds to wait before raising asyncio.TimeoutError
+    """
+    async def wait_connected(self, timeout: Optional[float] = None):
+        await asyncio.wait_for(asyncio.gather(*[c.connected.wait() for c in self.connections]), timeout)
+
+    """
+    Subscribe to an account.
+
+    Args:
+        public_key (PublicKey): account to subscribe to
+        account_name (str): IDL name of the account type, e.g. "AggregatorAccountData"
+    """
+    async def subscribe(self, public_key: PublicKey, account_name: str):
+        key = str(public_key)
+        for connection in self.connections:
+            if key in connection.keys:
+                return
+        connection = min(self.connections, key=lambda c: len(c.keys))
+        await connection.add(key, account_name)
+
+    """
+    Unsubscribe from an account and drop its cached entry.
+
+    Args:
+        public_key (PublicKey): account to unsubscribe from
+    """
+    async def unsubscribe(self, public_key: PublicKey):
+        key = str(public_key)
+        for connection in self.connections:
+            if key in connection.keys:
+                await connection.remove(key)
+        self.cache.pop(key, None)
+
+    """
+    Get the cached update for an account if it is fresh enough.
+
+    Args:
+        public_key (PublicKey): account to look up
+        max_age (float | None): overrides the subscriber max_age
+
+    Returns:
+        AccountUpdate | None
+    """
+    def get(self, public_key: PublicKey, max_age: Optional[float] = None) -> Optional[AccountUpdate]:
+        update = self.cache.get(str(public_key))
+        if update is None:
+            return None
+        max_age = max_age if max_age is not None else self.max_age
+        if max_age is not None and time.monotonic() - update.received_at > max_age:
+            return None
+        return update
+
+    """
+    Iterate over decoded updates as they arrive. When the consumer falls behind
+    the oldest buffered updates are dropped; the cache always holds the latest.
+
+    Returns:
+        AsyncIterator[AccountUpdate]
+    """
+    async def updates(self) -> AsyncIterator[AccountUpdate]:
+        while True:
+            yield await self.queue.get()
+
+    def store(self, key: str, account_name: str, slot: int, data: Optional[bytes]):
+        current = self.cache.get(key)
+        if current is not None and current.slot > slot:
+            return
+        public_key = PublicKey(key)
+        try:
+            decoded = decode_account(self.program, account_name, public_key, data)
+        except Exception:
+            logger.warning("Could not decode %s update of %s", account_name, key, exc_info=True)
+            self.cache.pop(key, None)
+            return
+        update = AccountUpdate(public_key, account_name, slot, decoded, time.monotonic())
+        self.cache[key] = update
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(update)
+
+    def invalidate(self, keys):
+        for key in keys:
+            self.cache.pop(key, None)
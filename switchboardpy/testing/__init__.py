@@ -0,0 +1,33 @@
+"""Offline test and benchmark helpers for switchboardpy."""
+
+from switchboardpy.testing.accounts import STANDIN_IDL_PATH, encode_account, standin_program, synthetic_fixtures
+from switchboardpy.testing.crank import crank_buffer
+from switchboardpy.testing.history import history_buffer
+from switchboardpy.testing.http import HttpRoute, HttpStandIn
+from switchboardpy.testing.rpc import (
+    AccountFixture,
+    FaultInjection,
+    RpcStandIn,
+    dump_fixtures,
+    load_fixtures,
+    record_fixtures
+)
+from switchboardpy.testing.websocket import WebsocketStandIn
+
+__all__ = [
+    "AccountFixture",
+    "FaultInjection",
+    "HttpRoute",
+    "HttpStandIn",
+    "RpcStandIn",
+    "STANDIN_IDL_PATH",
+    "WebsocketStandIn",
+    "crank_buffer",
+    "dump_fixtures",
+    "encode_account",
+    "history_buffer",
+    "load_fixtures",
+    "record_fixtures",
+    "standin_program",
+    "synthetic_fixtures"
+]
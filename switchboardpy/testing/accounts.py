@@ -0,0 +1,117 @@
+import anchorpy
+
+from pathlib import Path
+from typing import Any
+
+from anchorpy import Provider, Wallet
+from anchorpy.program.common import Instruction
+from solana.keypair import Keypair
+from solana.publickey import PublicKey
+from solana.rpc.async_api import AsyncClient
+
+from switchboardpy.aggregator import AggregatorAccount
+from switchboardpy.bootstrap import load_program
+from switchboardpy.common import AccountParams, account_discriminator
+from switchboardpy.crank import CrankRow
+from switchboardpy.lease import LeaseAccount
+from switchboardpy.oraclequeue import OracleQueueAccount
+from switchboardpy.permission import PermissionAccount
+from switchboardpy.program import ProgramStateAccount
+from switchboardpy.testing.crank import crank_buffer
+from switchboardpy.testing.history import history_buffer
+from switchboardpy.testing.rpc import AccountFixture
+
+# Layout of the stand-in program, reconstructed from the accounts, instructions
+# and params the SDK uses. It is not the on-chain IDL: only use it against
+# stand-ins, never to decode chain data.
+STANDIN_IDL_PATH = Path(__file__).parent / "idl" / "switchboard_v2.json"
+
+"""
+Build the Switchboard program against a stand-in RPC from the stand-in IDL,
+without touching the network or the IDL cache.
+
+Args:
+    standin (RpcStandIn): started stand-in serving the accounts
+    payer (Keypair | None): wallet of the provider, a new keypair by default
+
+Returns:
+    anchorpy.Program
+"""
+async def standin_program(standin: Any, payer: Keypair = None) -> anchorpy.Program:
+    provider = Provider(AsyncClient(standin.http_url), Wallet(payer or Keypair()))
+    return await load_program(provider, idl=STANDIN_IDL_PATH.read_text(), cache_dir=None)
+
+def _assign(obj: Any, fields: dict):
+    for name, value in fields.items():
+        if isinstance(value, dict):
+            _assign(getattr(obj, name), value)
+        else:
+            setattr(obj, name, value)
+
+"""
+Encode account data the way the program stores it. Fields left out are
+zeroed, nested struct fields may be given as dicts of their own fields.
+
+Args:
+    program (anchorpy.Program): Switchboard program
+    account_name (str): IDL account name, e.g. AggregatorAccountData
+    **fields: snake_case field values
+
+Returns:
+    bytes: discriminator followed by the encoded account
+"""
+def encode_account(program: anchorpy.Program, account_name: str, **fields: Any) -> bytes:
+    zeroed = account_discriminator(account_name) + bytes(program.account[account_name].size - 8)
+    decoded = program.coder.accounts.decode(zeroed)
+    _assign(decoded, fields)
+    return program.coder.accounts.build(Instruction(data=decoded, name=account_name))
+
+# Rows of the history buffer of the synthetic aggregator
+SYNTHETIC_HISTORY_ROWS = 1000
+
+"""
+Synthesize a consistent set of Switchboard accounts: an aggregator with its
+history buffer, queue, crank (whose data buffer holds the aggregator), lease,
+permission and oracle, and the program state. Pubkeys are fixed so PDA
+derivations cost the same on every run. Job accounts are left out.
+
+Args:
+    program (anchorpy.Program): Switchboard program
+    history_rows (int): size of the aggregator history buffer
+
+Returns:
+    dict[str, AccountFixture]: accounts by pubkey, for RpcStandIn
+"""
+def synthetic_fixtures(program: anchorpy.Program, history_rows: int = SYNTHETIC_HISTORY_ROWS) -> dict:
+    aggregator, queue, authority, crank, oracle, history, token_mint, crank_data = (PublicKey(bytes([i]) * 32) for i in range(1, 9))
+    aggregator_account = AggregatorAccount(AccountParams(program=program, public_key=aggregator))
+    queue_account = OracleQueueAccount(AccountParams(program=program, public_key=queue))
+    lease_account, _ = LeaseAccount.from_seed(program, queue_account, aggregator_account)
+    permission_account, _ = PermissionAccount.from_seed(program, authority, queue, aggregator)
+    state_account, _ = ProgramStateAccount.from_seed(program)
+    result = {"mantissa": 24531123456, "scale": 6}
+    rows = {i: (1_650_000_000 + i, 123_456_789 + i, 6) for i in range(history_rows)}
+    accounts = {
+        str(aggregator): encode_account(
+            program,
+            "AggregatorAccountData",
+            queue_pubkey=queue,
+            authority=authority,
+            crank_pubkey=crank,
+            history_buffer=history,
+            oracle_request_batch_size=1,
+            min_oracle_results=1,
+            min_job_results=1,
+            latest_confirmed_round={"num_success": 1, "result": result},
+            current_round={"oracle_pubkeys_data": [oracle] + [PublicKey(0)] * 15},
+        ),
+        str(queue): encode_account(program, "OracleQueueAccountData", authority=authority, size=1, max_size=1, data_buffer=oracle),
+        str(crank): encode_account(program, "CrankAccountData", queue_pubkey=queue, pq_size=1, max_rows=100, data_buffer=crank_data),
+        str(crank_data): crank_buffer([CrankRow(aggregator, 0)], max_rows=100),
+        str(oracle): encode_account(program, "OracleAccountData", oracle_authority=authority, queue_pubkey=queue),
+        str(lease_account.public_key): encode_account(program, "LeaseAccountData", queue=queue, aggregator=aggregator, is_active=True),
+        str(permission_account.public_key): encode_account(program, "PermissionAccountData", authority=authority, granter=queue, grantee=aggregator),
+        str(state_account.public_key): encode_account(program, "SbState", authority=authority, token_mint=token_mint),
+        str(history): history_buffer(rows, size=history_rows, insert_idx=history_rows // 3),
+    }
+    return {pubkey: AccountFixture(data) for pubkey, data in accounts.items()}
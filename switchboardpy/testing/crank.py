@@ -0,0 +1,21 @@
+import struct
+
+from switchboardpy.crank import CRANK_BUFFER_HEADER_SIZE, CRANK_ROW_SIZE
+
+"""
+Build the raw data of a crank data buffer.
+
+Args:
+    rows (list[CrankRow]): rows in use, in buffer order
+    max_rows (int | None): capacity of the buffer, len(rows) by default
+
+Returns:
+    bytes: buffer data, header included
+"""
+def crank_buffer(rows: list, max_rows: int = None) -> bytes:
+    buf = bytearray(CRANK_BUFFER_HEADER_SIZE + max(max_rows or 0, len(rows)) * CRANK_ROW_SIZE)
+    for i, row in enumerate(rows):
+        offset = CRANK_BUFFER_HEADER_SIZE + i * CRANK_ROW_SIZE
+        buf[offset:offset + 32] = bytes(row.pubkey)
+        struct.pack_into("<q", buf, offset + 32, row.next_timestamp)
+    return bytes(buf)
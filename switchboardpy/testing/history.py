@@ -0,0 +1,25 @@
+import struct
+
+from switchboardpy.common import SwitchboardDecimal
+from switchboardpy.history import HISTORY_HEADER_SIZE, HISTORY_ROW_SIZE
+
+"""
+Build the raw data of an aggregator history buffer.
+
+Args:
+    rows (dict[int, tuple]): row index -> (timestamp, mantissa) or
+        (timestamp, mantissa, scale), rows left out are zeroed
+    size (int): number of rows of the ring buffer
+    insert_idx (int): index the next row will be written at
+
+Returns:
+    bytes: buffer data, header included
+"""
+def history_buffer(rows: dict, size: int, insert_idx: int) -> bytes:
+    buf = bytearray(HISTORY_HEADER_SIZE + size * HISTORY_ROW_SIZE)
+    struct.pack_into("<L", buf, 8, insert_idx)
+    for i, (timestamp, mantissa, *scale) in rows.items():
+        offset = HISTORY_HEADER_SIZE + i * HISTORY_ROW_SIZE
+        struct.pack_into("<q", buf, offset, timestamp)
+        SwitchboardDecimal(mantissa, scale[0] if scale else 0).pack_into(buf, offset + 8)
+    return bytes(buf)
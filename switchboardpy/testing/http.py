@@ -0,0 +1,126 @@
+import asyncio
+import json
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from switchboardpy.testing.server import serve_http_connection
+
+# A response served by the HttpStandIn
+@dataclass
+class HttpRoute:
+
+    """Response body, JSON encoded unless str or bytes"""
+    body: Any = ""
+
+    """Response status code"""
+    status: int = 200
+
+    """Seconds to wait before answering"""
+    latency: float = 0.0
+
+    """Response content type"""
+    content_type: str = "application/json"
+
+    def payload(self) -> bytes:
+        if isinstance(self.body, bytes):
+            return self.body
+        if isinstance(self.body, str):
+            return self.body.encode()
+        return json.dumps(self.body).encode()
+
+class HttpStandIn:
+    """In-process HTTP/1.1 server answering requests from a table of routes, for
+    testing code that fetches data sources (e.g. OracleJob HttpTasks) offline.
+
+    Attributes:
+        routes (dict[str, HttpRoute]): responses by path, query string included
+        calls (Counter): number of requests per path
+        requests (list[tuple[str, str, dict, bytes]]): method, path, headers and body of every request
+        connections (int): number of TCP connections accepted
+        in_flight (int): number of requests being processed
+        max_in_flight (int): largest number of requests processed at once
+        url (str): base URL, set once started
+    """
+
+    def __init__(self, routes: Optional[dict] = None):
+        self.routes: dict[str, HttpRoute] = dict(routes or {})
+        self.calls: Counter = Counter()
+        self.requests: list = []
+        self.connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.url: Optional[str] = None
+        self._server = None
+        self._handlers: set = set()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_t, exc_v, exc_tb):
+        await self.close()
+
+    """
+    Start listening on a free localhost port.
+
+    Returns:
+        HttpStandIn: self
+    """
+    async def start(self):
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        self.url = f"http://127.0.0.1:{self._server.sockets[0].getsockname()[1]}"
+        return self
+
+    """
+    Stop listening and drop open connections.
+    """
+    async def close(self):
+        self._server.close()
+        for handler in list(self._handlers):
+            handler.cancel()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        await self._server.wait_closed()
+
+    """
+    Serve a response on a path.
+
+    Args:
+        path (str): request path, query string included
+        body (Any): response body, JSON encoded unless str or bytes
+        status (int): response status code
+        latency (float): seconds to wait before answering
+        content_type (str): response content type
+    """
+    def route(self, path: str, body: Any = "", status: int = 200, latency: float = 0.0, content_type: str = "application/json"):
+        self.routes[path] = HttpRoute(body=body, status=status, latency=latency, content_type=content_type)
+
+    async def _respond(self, path: str) -> tuple:
+        route = self.routes.get(path)
+        if route is None:
+            return 404, b"", "text/plain"
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if route.latency:
+                await asyncio.sleep(route.latency)
+        finally:
+            self.in_flight -= 1
+        return route.status, route.payload(), route.content_type
+
+    async def _request(self, method: str, path: str, headers: dict, body: bytes) -> tuple:
+        self.calls[path] += 1
+        self.requests.append((method, path, headers, body))
+        return await self._respond(path)
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+        try:
+            await serve_http_connection(reader, writer, self._request)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._handlers.discard(handler)
@@ -0,0 +1,350 @@
+import asyncio
+import base58
+import base64
+import itertools
+import json
+import os
+import random
+import websockets
+
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from solana.publickey import PublicKey
+
+from switchboardpy.common import SBV2_DEVNET_PID, account_info_bytes
+from switchboardpy.testing.server import serve_http_connection
+
+# Lamports per byte-year and exemption threshold used by the rent calculation.
+LAMPORTS_PER_BYTE_YEAR = 3480
+EXEMPTION_THRESHOLD_YEARS = 2
+ACCOUNT_STORAGE_OVERHEAD = 128
+
+# JSON-RPC error returned for injected failures.
+INJECTED_ERROR = {"code": -32005, "message": "Node is unhealthy (injected error)"}
+
+# An account served by the RpcStandIn
+@dataclass
+class AccountFixture:
+
+    """Raw account data"""
+    data: bytes
+
+    """Owner program of the account"""
+    owner: PublicKey = SBV2_DEVNET_PID
+
+    """Account balance"""
+    lamports: int = 1_000_000_000
+
+    """Whether the account holds a program"""
+    executable: bool = False
+
+    def info(self, data_slice: Optional[dict] = None) -> dict:
+        data = self.data
+        if data_slice:
+            data = data[data_slice["offset"]:data_slice["offset"] + data_slice["length"]]
+        return {
+            "data": [base64.b64encode(data).decode(), "base64"],
+            "executable": self.executable,
+            "lamports": self.lamports,
+            "owner": str(self.owner),
+            "rentEpoch": 0,
+        }
+
+# Latency and failures injected into the stand-in's responses
+@dataclass
+class FaultInjection:
+
+    """Seconds added to every response"""
+    latency: float = 0.0
+
+    """Upper bound of a uniformly distributed extra delay, in seconds"""
+    jitter: float = 0.0
+
+    """Probability of answering a request with a JSON-RPC error"""
+    error_rate: float = 0.0
+
+    """Methods faults apply to, None for every method"""
+    methods: Optional[set] = None
+
+    """Seed of the random generator, for reproducible runs"""
+    seed: Optional[int] = None
+
+"""
+Load account fixtures from a JSON file of {pubkey: {"data": base64, "owner", "lamports"}}.
+
+Args:
+    path (str | Path): fixture file
+
+Returns:
+    dict[str, AccountFixture]
+"""
+def load_fixtures(path: Union[str, Path]) -> dict:
+    fixtures = json.loads(Path(path).read_text())
+    return {
+        pubkey: AccountFixture(
+            data=base64.b64decode(fixture["data"]),
+            owner=PublicKey(fixture.get("owner", str(SBV2_DEVNET_PID))),
+            lamports=fixture.get("lamports", 1_000_000_000),
+            executable=fixture.get("executable", False),
+        )
+        for pubkey, fixture in fixtures.items()
+    }
+
+"""
+Write account fixtures to a JSON file readable by load_fixtures.
+
+Args:
+    path (str | Path): fixture file
+    fixtures (dict[str, AccountFixture]): accounts by pubkey
+"""
+def dump_fixtures(path: Union[str, Path], fixtures: dict):
+    Path(path).write_text(json.dumps({
+        pubkey: {
+            "data": base64.b64encode(fixture.data).decode(),
+            "owner": str(fixture.owner),
+            "lamports": fixture.lamports,
+            "executable": fixture.executable,
+        }
+        for pubkey, fixture in fixtures.items()
+    }, indent=1))
+
+"""
+Record accounts from a live RPC as fixtures.
+
+Args:
+    connection (AsyncClient): connection to the live cluster
+    pubkeys (list[PublicKey]): accounts to record
+
+Returns:
+    dict[str, AccountFixture]: recorded accounts, missing accounts are skipped
+"""
+async def record_fixtures(connection: Any, pubkeys: list) -> dict:
+    response = await connection.get_multiple_accounts(pubkeys, encoding="base64")
+    fixtures = {}
+    for pubkey, value in zip(pubkeys, response["result"]["value"]):
+        if value:
+            fixtures[str(pubkey)] = AccountFixture(
+                data=account_info_bytes(value),
+                owner=PublicKey(value["owner"]),
+                lamports=value["lamports"],
+                executable=value["executable"],
+            )
+    return fixtures
+
+
+class RpcStandIn:
+    """In-process stand-in for a Solana JSON-RPC node serving account fixtures.
+
+    Serves HTTP JSON-RPC (single and batched requests, keep-alive) and the
+    accountSubscribe websocket API on localhost, with configurable injected
+    latency and error rates. Implements getAccountInfo, getMultipleAccounts,
+    getProgramAccounts, getMinimumBalanceForRentExemption, getRecentBlockhash,
+    sendTransaction, getSignatureStatuses, getSlot, accountSubscribe and
+    accountUnsubscribe. Sent transactions are recorded and reported confirmed.
+
+    Attributes:
+        accounts (dict[str, AccountFixture]): served accounts by pubkey
+        faults (FaultInjection): injected latency and failures
+        slot (int): current slot, advanced by every write
+        calls (Counter): number of requests per method
+        transactions (list[bytes]): raw transactions received by sendTransaction
+        http_url (str): JSON-RPC endpoint, set once started
+        ws_url (str): websocket endpoint, set once started
+    """
+
+    def __init__(self, accounts: Optional[dict] = None, faults: Optional[FaultInjection] = None, slot: int = 1):
+        self.accounts: dict[str, AccountFixture] = dict(accounts or {})
+        self.faults = faults or FaultInjection()
+        self.slot = slot
+        self.calls: Counter = Counter()
+        self.transactions: list[bytes] = []
+        self.signature_statuses: dict[str, dict] = {}
+        self.http_url: Optional[str] = None
+        self.ws_url: Optional[str] = None
+        self._random = random.Random(self.faults.seed)
+        self._subscription_ids = itertools.count(1)
+        self._subscriptions: dict[int, tuple] = {}
+        self._ws_clients: set = set()
+        self._http_server = None
+        self._ws_server = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_t, exc_v, exc_tb):
+        await self.close()
+
+    """
+    Start the HTTP and websocket listeners on free localhost ports.
+
+    Returns:
+        RpcStandIn: self
+    """
+    async def start(self):
+        self._http_server = await asyncio.start_server(self._serve_http, "127.0.0.1", 0)
+        self.http_url = f"http://127.0.0.1:{self._http_server.sockets[0].getsockname()[1]}"
+        self._ws_server = await websockets.serve(self._serve_ws, "127.0.0.1", 0)
+        self.ws_url = f"ws://127.0.0.1:{self._ws_server.sockets[0].getsockname()[1]}"
+        return self
+
+    """
+    Stop both listeners.
+    """
+    async def close(self):
+        self._http_server.close()
+        await self._http_server.wait_closed()
+        self._ws_server.close()
+        await self._ws_server.wait_closed()
+
+    """
+    Create or overwrite an account and notify its subscribers.
+
+    Args:
+        pubkey (PublicKey | str): account pubkey
+        data (bytes): raw account data
+        owner (PublicKey): owner program
+    """
+    async def set_account(self, pubkey: Union[PublicKey, str], data: bytes, owner: PublicKey = SBV2_DEVNET_PID):
+        key = str(pubkey)
+        self.slot += 1
+        self.accounts[key] = AccountFixture(data=data, owner=owner)
+        for subscription, (subscribed_key, websocket) in list(self._subscriptions.items()):
+            if subscribed_key == key:
+                try:
+                    await websocket.send(json.dumps(self._notification(subscription, key)))
+                except websockets.ConnectionClosed:
+                    self._subscriptions.pop(subscription, None)
+
+    """
+    Drop every open websocket connection, as a node restart would.
+    """
+    async def disconnect(self):
+        clients = list(self._ws_clients)
+        self._ws_clients.clear()
+        for client in clients:
+            await client.close()
+
+    def _notification(self, subscription: int, key: str) -> dict:
+        account = self.accounts.get(key)
+        return {
+            "jsonrpc": "2.0",
+            "method": "accountNotification",
+            "params": {
+                "subscription": subscription,
+                "result": {"context": {"slot": self.slot}, "value": account.info() if account else None},
+            },
+        }
+
+    def _context(self, value: Any) -> dict:
+        return {"context": {"slot": self.slot}, "value": value}
+
+    def _account_info(self, pubkey: str, config: dict) -> Optional[dict]:
+        account = self.accounts.get(pubkey)
+        return account.info(config.get("dataSlice")) if account else None
+
+    def _matches(self, account: AccountFixture, filters: list) -> bool:
+        for account_filter in filters:
+            if "dataSize" in account_filter and len(account.data) != account_filter["dataSize"]:
+                return False
+            if "memcmp" in account_filter:
+                offset = account_filter["memcmp"]["offset"]
+                expected = base58.b58decode(account_filter["memcmp"]["bytes"])
+                if account.data[offset:offset + len(expected)] != expected:
+                    return False
+        return True
+
+    def _send_transaction(self, params: list) -> str:
+        config = params[1] if len(params) > 1 else {}
+        raw = params[0]
+        raw = base64.b64decode(raw) if config.get("encoding") == "base64" else base58.b58decode(raw)
+        self.transactions.append(raw)
+        self.slot += 1
+        # wire format: compact-u16 signature count followed by 64 byte signatures
+        signature = base58.b58encode(raw[1:65]).decode()
+        self.signature_statuses[signature] = {
+            "slot": self.slot,
+            "confirmations": None,
+            "err": None,
+            "confirmationStatus": "confirmed",
+        }
+        return signature
+
+    def _call(self, method: str, params: list) -> Any:
+        config = params[-1] if params and isinstance(params[-1], dict) else {}
+        if method == "getAccountInfo":
+            return self._context(self._account_info(params[0], config))
+        if method == "getMultipleAccounts":
+            return self._context([self._account_info(pubkey, config) for pubkey in params[0]])
+        if method == "getProgramAccounts":
+            return [
+                {"pubkey": pubkey, "account": account.info(config.get("dataSlice"))}
+                for pubkey, account in self.accounts.items()
+                if str(account.owner) == params[0] and self._matches(account, config.get("filters", []))
+            ]
+        if method == "getMinimumBalanceForRentExemption":
+            return (ACCOUNT_STORAGE_OVERHEAD + params[0]) * LAMPORTS_PER_BYTE_YEAR * EXEMPTION_THRESHOLD_YEARS
+        if method == "getRecentBlockhash":
+            return self._context({
+                "blockhash": base58.b58encode(os.urandom(32)).decode(),
+                "feeCalculator": {"lamportsPerSignature": 5000},
+            })
+        if method == "sendTransaction":
+            return self._send_transaction(params)
+        if method == "getSignatureStatuses":
+            return self._context([self.signature_statuses.get(signature) for signature in params[0]])
+        if method == "getSlot":
+            return self.slot
+        raise KeyError(method)
+
+    async def _handle(self, request: dict) -> dict:
+        method = request.get("method")
+        self.calls[method] += 1
+        faults = self.faults
+        if faults.methods is None or method in faults.methods:
+            delay = faults.latency + (self._random.uniform(0, faults.jitter) if faults.jitter else 0.0)
+            if delay:
+                await asyncio.sleep(delay)
+            if faults.error_rate and self._random.random() < faults.error_rate:
+                return {"jsonrpc": "2.0", "id": request.get("id"), "error": INJECTED_ERROR}
+        try:
+            result = self._call(method, request.get("params") or [])
+        except KeyError:
+            return {"jsonrpc": "2.0", "id": request.get("id"), "error": {"code": -32601, "message": "Method not found"}}
+        return {"jsonrpc": "2.0", "id": request.get("id"), "result": result}
+
+    async def _rpc_request(self, method: str, path: str, headers: dict, body: bytes) -> tuple:
+        request = json.loads(body)
+        if isinstance(request, list):
+            response = await asyncio.gather(*[self._handle(item) for item in request])
+        else:
+            response = await self._handle(request)
+        return 200, json.dumps(response).encode(), "application/json"
+
+    async def _serve_http(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        await serve_http_connection(reader, writer, self._rpc_request)
+
+    async def _serve_ws(self, websocket, path=None):
+        self._ws_clients.add(websocket)
+        try:
+            async for message in websocket:
+                request = json.loads(message)
+                method = request.get("method")
+                self.calls[method] += 1
+                if method == "accountSubscribe":
+                    subscription = next(self._subscription_ids)
+                    self._subscriptions[subscription] = (request["params"][0], websocket)
+                    await websocket.send(json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": subscription}))
+                elif method == "accountUnsubscribe":
+                    removed = self._subscriptions.pop(request["params"][0], None) is not None
+                    await websocket.send(json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": removed}))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self._ws_clients.discard(websocket)
+            for subscription, (_, subscribed) in list(self._subscriptions.items()):
+                if subscribed is websocket:
+                    del self._subscriptions[subscription]
@@ -0,0 +1,50 @@
+import asyncio
+
+from typing import Awaitable, Callable
+
+# Reason phrases of the status codes stand-ins usually answer with
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 429: "Too Many Requests", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+"""
+Serve the HTTP/1.1 requests of one keep-alive connection until the client
+closes it or asks to.
+
+Args:
+    reader (asyncio.StreamReader): connection reader
+    writer (asyncio.StreamWriter): connection writer, closed on return
+    respond (Callable): coroutine function called with the method, path,
+        lowercased headers and body of each request, returning its status
+        code, body and content type
+"""
+async def serve_http_connection(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    respond: Callable[[str, str, dict, bytes], Awaitable[tuple]]
+):
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            method, path, _ = request_line.decode().split(" ", 2)
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode().partition(":")
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+            status, payload, content_type = await respond(method, path, headers, body)
+            writer.write(
+                f"HTTP/1.1 {status} {_REASONS.get(status, 'Unknown')}\r\n".encode()
+                + f"Content-Type: {content_type}\r\nContent-Length: {len(payload)}\r\n\r\n".encode()
+                + payload
+            )
+            await writer.drain()
+            if headers.get("connection", "").lower() == "close":
+                break
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
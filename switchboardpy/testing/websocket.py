@@ -0,0 +1,105 @@
+import asyncio
+import json
+import websockets
+
+from typing import Any, Optional
+
+class WebsocketStandIn:
+    """In-process websocket server broadcasting the messages it is given, for
+    testing code that streams data sources (e.g. OracleJob WebsocketTasks) offline.
+
+    Attributes:
+        connections (int): number of connections accepted
+        received (list[str]): messages sent by clients, e.g. subscriptions
+        url (str): server URL, set once started
+    """
+
+    def __init__(self):
+        self.connections = 0
+        self.received: list = []
+        self.url: Optional[str] = None
+        self._clients: set = set()
+        self._server = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_t, exc_v, exc_tb):
+        await self.close()
+
+    """
+    Start listening on a free localhost port.
+
+    Returns:
+        WebsocketStandIn: self
+    """
+    async def start(self):
+        self._server = await websockets.serve(self._serve, "127.0.0.1", 0)
+        self.url = f"ws://127.0.0.1:{self._server.sockets[0].getsockname()[1]}"
+        return self
+
+    """
+    Stop listening and drop open connections.
+    """
+    async def close(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    """
+    Number of clients currently connected.
+
+    Returns:
+        int
+    """
+    @property
+    def clients(self) -> int:
+        return len(self._clients)
+
+    """
+    Wait until a number of clients are connected.
+
+    Args:
+        count (int): number of clients
+        timeout (float | None): seconds to wait before raising asyncio.TimeoutError
+    """
+    async def wait_clients(self, count: int = 1, timeout: Optional[float] = 5.0):
+        async def connected():
+            while len(self._clients) < count:
+                await asyncio.sleep(0.01)
+        await asyncio.wait_for(connected(), timeout)
+
+    """
+    Send a message to every connected client.
+
+    Args:
+        message (Any): message, JSON encoded unless str or bytes
+    """
+    async def publish(self, message: Any):
+        if not isinstance(message, (str, bytes)):
+            message = json.dumps(message)
+        for client in list(self._clients):
+            try:
+                await client.send(message)
+            except websockets.ConnectionClosed:
+                self._clients.discard(client)
+
+    """
+    Drop every open connection, as a server restart would.
+    """
+    async def disconnect(self):
+        clients = list(self._clients)
+        self._clients.clear()
+        for client in clients:
+            await client.close()
+
+    async def _serve(self, websocket: Any, path: str = "/"):
+        self.connections += 1
+        self._clients.add(websocket)
+        try:
+            async for message in websocket:
+                self.received.append(message)
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self._clients.discard(websocket)
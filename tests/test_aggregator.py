@@ -12,6 +12,7 @@ from switchboardpy import (
   AggregatorSetHistoryBufferParams,
   OracleQueueAccount
 )
+from switchboardpy.testing import RpcStandIn, encode_account, standin_program
 
 from contextlib import contextmanager
 from decimal import Decimal
@@ -47,6 +48,22 @@ async def test_load_data():
         assert data.min_job_results == 2
         print(data)
 
+@mark.asyncio
+async def test_load_many():
+    async with RpcStandIn() as standin:
+        program = await standin_program(standin)
+        pubkeys = [PublicKey("88FX4tBstuwBPNhQU4EEBoPX35neSu4Le9zDSwtPRRQz"), Keypair().public_key]
+        await standin.set_account(pubkeys[0], encode_account(program, "AggregatorAccountData", min_oracle_results=3))
+
+        # one existing aggregator and one missing account
+        results = await AggregatorAccount.load_many(program, pubkeys)
+
+        assert len(results) == 2
+        assert results[0].min_oracle_results == 3
+        assert isinstance(results[1], Exception)
+        assert standin.calls["getMultipleAccounts"] == 1
+        await program.close()
+
 @mark.asyncio
 async def test_get_latest_value():
     async with SwitchboardProgram() as program:
@@ -89,4 +106,25 @@ async def test_create():
                 ),
                 start_after=0,
             )
-        )
\ No newline at end of file
+        )
+
+@mark.asyncio
+async def test_get_latest_value_fast():
+    async with RpcStandIn() as standin:
+        program = await standin_program(standin)
+        agg = AggregatorAccount(AccountParams(program=program, public_key=PublicKey("88FX4tBstuwBPNhQU4EEBoPX35neSu4Le9zDSwtPRRQz")))
+        await standin.set_account(agg.public_key, encode_account(
+            program,
+            "AggregatorAccountData",
+            latest_confirmed_round={"num_success": 3, "round_open_timestamp": 1646092800, "result": {"mantissa": -12345, "scale": 2}}
+        ))
+
+        # only the latest_confirmed_round bytes are downloaded
+        latest = await agg.get_latest_value_fast()
+        assert latest.value == await agg.get_latest_value() == Decimal("-123.45")
+        assert latest.timestamp == await agg.get_latest_feed_timestamp()
+
+        values = await AggregatorAccount.get_latest_values_fast(program, [agg.public_key, Keypair().public_key])
+        assert values[0] == latest
+        assert isinstance(values[1], Exception)
+        await program.close()
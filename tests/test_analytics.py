@@ -0,0 +1,44 @@
+import numpy as np
+
+from switchboardpy import Ema, HistoryAnalytics, RollingMax, RollingMin, RollingStd, Twap
+from switchboardpy.history import decode_history
+from switchboardpy.testing import history_buffer
+
+TIMESTAMPS = np.array([0, 10, 20, 50, 60, 90])
+VALUES = np.array([1.0, 3.0, 2.0, 6.0, 4.0, 5.0])
+
+def updated_in_two_steps(statistic, split=2):
+    first = statistic.update(TIMESTAMPS[:split], VALUES[:split])
+    return np.concatenate([first, statistic.update(TIMESTAMPS[split:], VALUES[split:])])
+
+def test_twap():
+    # 1 for 10s, 3 for 10s, 2 for 30s, 6 for 10s, 4 for 30s
+    assert np.allclose(updated_in_two_steps(Twap()), [1, 1, 2, 2, 8 / 3, 28 / 9])
+    # over the last 30s: the value at 60 is (2 * 20 + 6 * 10) / 30
+    assert np.allclose(updated_in_two_steps(Twap(30), split=4), [1, 1, 2, 2, 10 / 3, 4])
+
+def test_ema():
+    expected = [1.0]
+    for value in VALUES[1:]:
+        expected.append(expected[-1] + 0.5 * (value - expected[-1]))
+    assert np.allclose(updated_in_two_steps(Ema(span=3)), expected)
+
+    ema = Ema(half_life=10)
+    ema.update(TIMESTAMPS[:2], VALUES[:2])
+    assert ema.value == 2.0
+
+def test_rolling_windows():
+    assert np.allclose(updated_in_two_steps(RollingStd(3)), [np.std(VALUES[max(0, i - 2):i + 1]) for i in range(6)])
+    assert np.allclose(updated_in_two_steps(RollingMin(3)), [1, 1, 1, 2, 2, 4])
+    assert np.allclose(updated_in_two_steps(RollingMax(3)), [1, 3, 3, 6, 6, 6])
+    assert np.isnan(RollingStd(3, ddof=1).update(TIMESTAMPS[:1], VALUES[:1])[0])
+
+def test_only_new_rows_are_processed():
+    analytics = HistoryAnalytics(max=RollingMax(2))
+    rows = {i: (100 + 10 * i, i) for i in range(3)}
+    assert analytics.update(decode_history(history_buffer(rows, size=4, insert_idx=3)))["max"].tolist() == [0, 1, 2]
+    rows[3] = (130, 7)
+    rows[0] = (140, 5)
+    assert analytics.update(decode_history(history_buffer(rows, size=4, insert_idx=1)))["max"].tolist() == [7, 7]
+    assert analytics.last_timestamp == 140
+    assert analytics.snapshot() == {"max": 7.0}
@@ -0,0 +1,71 @@
+from pytest import mark
+
+from solana.publickey import PublicKey
+
+from switchboardpy import AccountParams, AggregatorAccount, HistoryArchive
+from switchboardpy.history import HISTORY_ROW_SIZE, decode_history
+from switchboardpy.testing import RpcStandIn, encode_account, history_buffer, standin_program
+
+AGGREGATOR = PublicKey("88FX4tBstuwBPNhQU4EEBoPX35neSu4Le9zDSwtPRRQz")
+HISTORY_BUFFER = PublicKey("GvDMxPzN1sCj7L26YDK2HnMRXEQmQ2aemov8YBtPS7vR")
+
+def test_append_deduplicates_and_survives_the_ring_wrapping(tmp_path):
+    archive = HistoryArchive(tmp_path)
+    rows = {i: (100 + 10 * i, i) for i in range(3)}
+    assert archive.append(AGGREGATOR, decode_history(history_buffer(rows, size=4, insert_idx=3))) == 3
+    assert archive.append(AGGREGATOR, decode_history(history_buffer(rows, size=4, insert_idx=3))) == 0
+
+    # the ring wraps and overwrites the row at 100, which stays archived
+    rows[3] = (130, 3)
+    rows[0] = (140, 4)
+    assert archive.append(AGGREGATOR, decode_history(history_buffer(rows, size=4, insert_idx=1))) == 2
+    assert archive.count(AGGREGATOR) == 5
+    assert archive.last_timestamp(AGGREGATOR) == 140
+    assert archive.aggregators() == [AGGREGATOR]
+
+    reopened = HistoryArchive(tmp_path)
+    assert reopened.read(AGGREGATOR).timestamps.tolist() == [100, 110, 120, 130, 140]
+    assert [row.value for row in reopened.read(AGGREGATOR)] == [0, 1, 2, 3, 4]
+
+def test_range_reads(tmp_path):
+    archive = HistoryArchive(tmp_path)
+    rows = {i: (10 * (i + 1), i) for i in range(100)}
+    archive.append(AGGREGATOR, decode_history(history_buffer(rows, size=100, insert_idx=0)))
+    history = archive.read(AGGREGATOR, since=250, until=300)
+    assert history.timestamps.tolist() == [250, 260, 270, 280, 290]
+    # a view over the read-only memory map
+    assert not history.timestamps.flags.owndata and not history.timestamps.flags.writeable
+    assert archive.read(AGGREGATOR, since=995).timestamps.tolist() == [1000]
+    assert archive.read(AGGREGATOR, until=30, last=1).timestamps.tolist() == [20]
+    assert len(archive.read(AGGREGATOR, since=2000)) == 0
+    assert len(archive.read(PublicKey("11111111111111111111111111111111"))) == 0
+
+def test_incomplete_record_is_dropped(tmp_path):
+    archive = HistoryArchive(tmp_path)
+    archive.append(AGGREGATOR, decode_history(history_buffer({0: (10, 1)}, size=2, insert_idx=1)))
+    with open(archive.path(AGGREGATOR), "ab") as f:
+        f.write(bytes(HISTORY_ROW_SIZE // 2))
+    assert archive.append(AGGREGATOR, decode_history(history_buffer({0: (10, 1), 1: (20, 2)}, size=2, insert_idx=0))) == 1
+    assert archive.read(AGGREGATOR).timestamps.tolist() == [10, 20]
+
+@mark.asyncio
+async def test_sync_from_aggregator(tmp_path):
+    archive = HistoryArchive(tmp_path)
+    rows = {i: (100 + 10 * i, i) for i in range(3)}
+    async with RpcStandIn() as standin:
+        program = await standin_program(standin)
+        await standin.set_account(AGGREGATOR, encode_account(program, "AggregatorAccountData", history_buffer=HISTORY_BUFFER))
+        await standin.set_account(HISTORY_BUFFER, history_buffer(rows, size=4, insert_idx=3))
+        agg = AggregatorAccount(AccountParams(program=program, public_key=AGGREGATOR))
+        assert await archive.sync(agg) == 3
+        assert await archive.sync(agg) == 0
+
+        # the ring wraps: only the rows newer than the archive are appended
+        rows[3] = (130, 3)
+        rows[0] = (140, 4)
+        rows[1] = (150, 5)
+        await standin.set_account(HISTORY_BUFFER, history_buffer(rows, size=4, insert_idx=2))
+        assert await archive.sync(agg) == 3
+        assert archive.read(AGGREGATOR).timestamps.tolist() == [100, 110, 120, 130, 140, 150]
+        assert [row.value for row in archive.read(AGGREGATOR, since=125)] == [3, 4, 5]
+        await program.close()
@@ -0,0 +1,105 @@
+import json
+import zlib
+from pytest import mark, raises
+
+from switchboardpy import (
+  SBV2_DEVNET_PID,
+  AccountParams,
+  AggregatorAccount,
+)
+from switchboardpy import bootstrap
+from switchboardpy.bootstrap import idl_hash, load_program, read_bundled_idl, read_cached_idl, update_bundled_idl, write_cached_idl
+from switchboardpy.common import account_discriminator
+from switchboardpy.testing import STANDIN_IDL_PATH, AccountFixture, RpcStandIn, encode_account
+
+from anchorpy import Provider, Wallet
+from anchorpy.idl import _idl_address
+from solana.keypair import Keypair
+from solana.publickey import PublicKey
+from solana.rpc.async_api import AsyncClient
+
+AGGREGATOR = PublicKey("88FX4tBstuwBPNhQU4EEBoPX35neSu4Le9zDSwtPRRQz")
+
+def idl_account(raw_idl: str) -> AccountFixture:
+    compressed = zlib.compress(raw_idl.encode())
+    data = account_discriminator("IdlAccount") + bytes(Keypair().public_key) + len(compressed).to_bytes(4, "little") + compressed
+    return AccountFixture(data)
+
+def test_idl_cache_roundtrip(tmp_path):
+    raw_idl = '{"version": "0.0.0", "name": "switchboard_v2", "instructions": []}'
+    digest = write_cached_idl(SBV2_DEVNET_PID, raw_idl, tmp_path)
+    assert digest == idl_hash(raw_idl)
+    assert read_cached_idl(SBV2_DEVNET_PID, tmp_path) == raw_idl
+
+    # a corrupted copy is ignored
+    (tmp_path / f"{digest}.json").write_text(raw_idl + " ")
+    assert read_cached_idl(SBV2_DEVNET_PID, tmp_path) is None
+
+def bundle_to(monkeypatch, tmp_path):
+    monkeypatch.setattr(bootstrap, "BUNDLED_IDL_PATH", tmp_path / "switchboard_v2.json")
+    monkeypatch.setattr(bootstrap, "BUNDLED_IDL_SOURCE_PATH", tmp_path / "switchboard_v2.source.json")
+
+@mark.asyncio
+async def test_load_program_without_local_idl(monkeypatch, tmp_path):
+    bundle_to(monkeypatch, tmp_path)
+    provider = Provider(AsyncClient("http://127.0.0.1:9"), Wallet(Keypair()))
+    with raises(ValueError):
+        await load_program(provider, cache_dir=tmp_path)
+    await provider.connection.close()
+
+@mark.asyncio
+async def test_update_bundled_idl(monkeypatch, tmp_path):
+    bundle_to(monkeypatch, tmp_path)
+    raw_idl = STANDIN_IDL_PATH.read_text()
+    async with RpcStandIn({str(_idl_address(SBV2_DEVNET_PID)): idl_account(raw_idl)}) as standin:
+        provider = Provider(AsyncClient(standin.http_url), Wallet(Keypair()))
+        digest = await update_bundled_idl(provider)
+        await provider.connection.close()
+    source = json.loads(bootstrap.BUNDLED_IDL_SOURCE_PATH.read_text())
+    assert source == {"program_id": str(SBV2_DEVNET_PID), "rpc_url": standin.http_url, "sha256": digest}
+    assert idl_hash(read_bundled_idl()) == digest
+    # bundled for another program
+    assert read_bundled_idl(AGGREGATOR) is None
+
+    # no cache and an unreachable RPC: only the bundled IDL can be used
+    provider = Provider(AsyncClient("http://127.0.0.1:9"), Wallet(Keypair()))
+    program = await load_program(provider, cache_dir=None)
+    assert program.idl.name == "switchboard_v2"
+    await program.close()
+
+    # an edited copy no longer matches its recorded hash
+    bootstrap.BUNDLED_IDL_PATH.write_text(raw_idl + " ")
+    assert read_bundled_idl() is None
+
+@mark.asyncio
+async def test_load_standin_program():
+    provider = Provider(AsyncClient("http://127.0.0.1:9"), Wallet(Keypair()))
+    program = await load_program(provider, idl=STANDIN_IDL_PATH.read_text(), cache_dir=None)
+    assert program.idl.name == "switchboard_v2"
+    assert program.account["AggregatorAccountData"].size == 3851
+    data = encode_account(program, "AggregatorAccountData", min_oracle_results=3, latest_confirmed_round={"result": {"mantissa": -5, "scale": 1}})
+    decoded = program.coder.accounts.decode(data)
+    assert decoded.min_oracle_results == 3
+    assert decoded.latest_confirmed_round.result.mantissa == -5
+    await program.close()
+
+@mark.asyncio
+async def test_load_program_from_cache(tmp_path):
+    idl = json.loads(STANDIN_IDL_PATH.read_text())
+    idl["version"] = "0.1.1"
+    async with RpcStandIn({str(_idl_address(SBV2_DEVNET_PID)): idl_account(json.dumps(idl))}) as standin:
+        provider = Provider(AsyncClient(standin.http_url), Wallet(Keypair()))
+        program = await load_program(provider, fetch=True, cache_dir=tmp_path)
+        await program.close()
+        assert json.loads(read_cached_idl(SBV2_DEVNET_PID, tmp_path))["version"] == "0.1.1"
+        assert standin.calls["getAccountInfo"] == 1
+
+        provider = Provider(AsyncClient(standin.http_url), Wallet(Keypair()))
+        program = await load_program(provider, cache_dir=tmp_path)
+        assert program.idl.version == "0.1.1"
+        assert standin.calls["getAccountInfo"] == 1
+        await standin.set_account(AGGREGATOR, encode_account(program, "AggregatorAccountData", min_oracle_results=3))
+        agg = AggregatorAccount(AccountParams(program=program, public_key=AGGREGATOR))
+        data = await agg.load_data()
+        assert data.min_oracle_results == 3
+        await program.close()
@@ -0,0 +1,129 @@
+import asyncio
+import time
+from pytest import mark
+
+from switchboardpy import (
+  SBV2_DEVNET_PID,
+  AccountCache,
+  AccountParams,
+  OracleQueueAccount,
+  ProgramStateAccount,
+  instrument,
+)
+from switchboardpy.testing import RpcStandIn, encode_account, standin_program
+
+from solana.keypair import Keypair
+from solana.publickey import PublicKey
+from solana.rpc.commitment import Confirmed
+from solana.rpc.types import TxOpts
+from solana.transaction import AccountMeta, Transaction, TransactionInstruction
+
+QUEUE = PublicKey("F8ce7MsckeZAbAGmxjJNetxYXQa9mKr9nnrC3qKubyYy")
+AGGREGATOR = PublicKey("88FX4tBstuwBPNhQU4EEBoPX35neSu4Le9zDSwtPRRQz")
+
+async def serve_program_state(standin, program, **fields):
+    state_account, _ = ProgramStateAccount.from_seed(program)
+    await standin.set_account(state_account.public_key, encode_account(program, "SbState", **fields))
+
+def write_txn(program, public_key):
+    txn = Transaction(recent_blockhash=str(Keypair().public_key))
+    txn.add(TransactionInstruction(
+        keys=[AccountMeta(pubkey=public_key, is_signer=False, is_writable=True)],
+        program_id=program.program_id,
+        data=b""
+    ))
+    txn.sign(program.provider.wallet.payer)
+    return txn
+
+def test_ttl_and_lru():
+    cache = AccountCache(None, ttls={"AggregatorAccountData": 0.05}, maxsize=2)
+    cache.put("AggregatorAccountData", AGGREGATOR, "aggregator", slot=10)
+    assert cache.get("AggregatorAccountData", AGGREGATOR) == "aggregator"
+    assert cache.get("OracleQueueAccountData", AGGREGATOR) is None
+    time.sleep(0.06)
+    assert cache.get("AggregatorAccountData", AGGREGATOR) is None
+
+    cache.put("SbState", AGGREGATOR, 1)
+    cache.put("SbState", QUEUE, 2)
+    cache.put("SbState", SBV2_DEVNET_PID, 3)
+    assert cache.get("SbState", AGGREGATOR) is None
+    assert cache.cache_info().currsize == 2
+
+def test_invalidation():
+    cache = AccountCache(None)
+    cache.put("OracleQueueAccountData", QUEUE, "queue", slot=10)
+    cache.put("SbState", SBV2_DEVNET_PID, "state", slot=20)
+    cache.invalidate_before(15)
+    assert cache.get("OracleQueueAccountData", QUEUE) is None
+    assert cache.get("SbState", SBV2_DEVNET_PID) == "state"
+    cache.invalidate([SBV2_DEVNET_PID])
+    assert cache.get("SbState", SBV2_DEVNET_PID) is None
+
+    version = cache.version()
+    cache.invalidate([QUEUE])
+    cache.put("OracleQueueAccountData", QUEUE, "stale", version=version)
+    assert cache.get("OracleQueueAccountData", QUEUE) is None
+
+def test_uncached_types():
+    cache = AccountCache(None, ttls={"CrankAccountData": 0})
+    cache.put("CrankAccountData", QUEUE, "crank")
+    assert cache.get("CrankAccountData", QUEUE) is None
+
+@mark.asyncio
+async def test_load_data_served_from_cache():
+    async with RpcStandIn() as standin:
+        program = await standin_program(standin)
+        await serve_program_state(standin, program)
+        await standin.set_account(QUEUE, encode_account(program, "OracleQueueAccountData"))
+        instrumentation = instrument(program)
+        cache = AccountCache(program)
+        cache.attach()
+        queue_account = OracleQueueAccount(AccountParams(program=program, public_key=QUEUE))
+        state_account, _ = ProgramStateAccount.from_seed(program)
+        for _ in range(3):
+            await queue_account.load_data()
+            await state_account.load_data()
+        assert sum(row["count"] for row in instrumentation.snapshot()) == 2
+        assert cache.cache_info().hits == 4
+        cache.detach()
+        await program.close()
+
+@mark.asyncio
+async def test_written_accounts_uncached_until_confirmed():
+    async with RpcStandIn() as standin:
+        program = await standin_program(standin)
+        await standin.set_account(QUEUE, encode_account(program, "OracleQueueAccountData", size=1))
+        cache = AccountCache(program)
+        cache.attach()
+        queue_account = OracleQueueAccount(AccountParams(program=program, public_key=QUEUE))
+        await queue_account.load_data()
+
+        # sent the way CrankTurner does, without waiting for confirmation
+        response = await program.provider.connection.send_raw_transaction(
+            write_txn(program, QUEUE).serialize(),
+            opts=TxOpts(skip_confirmation=True, skip_preflight=True, preflight_commitment=Confirmed)
+        )
+        status = standin.signature_statuses.pop(response["result"])
+        assert cache.pending_writes() == [QUEUE]
+        await standin.set_account(QUEUE, encode_account(program, "OracleQueueAccountData", size=2))
+        for _ in range(2):
+            assert (await queue_account.load_data()).size == 2
+        assert standin.calls["getAccountInfo"] == 3
+
+        standin.signature_statuses[response["result"]] = status
+        for _ in range(300):
+            if not cache.pending_writes():
+                break
+            await asyncio.sleep(0.01)
+        assert cache.pending_writes() == []
+        for _ in range(2):
+            await queue_account.load_data()
+        assert standin.calls["getAccountInfo"] == 4
+
+        # provider.send confirms before returning
+        await program.provider.send(write_txn(program, QUEUE))
+        assert cache.pending_writes() == []
+        await queue_account.load_data()
+        assert standin.calls["getAccountInfo"] == 5
+        cache.detach()
+        await program.close()
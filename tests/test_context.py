@@ -0,0 +1,35 @@
+from pytest import mark
+
+from switchboardpy import (
+  ProgramStateAccount,
+  get_program_context,
+)
+from switchboardpy.testing import RpcStandIn, encode_account, standin_program
+
+from solana.keypair import Keypair
+
+async def serve_program_state(standin, program, **fields):
+    state_account, _ = ProgramStateAccount.from_seed(program)
+    await standin.set_account(state_account.public_key, encode_account(program, "SbState", **fields))
+
+@mark.asyncio
+async def test_context_is_resolved_once():
+    async with RpcStandIn() as standin:
+        program = await standin_program(standin)
+        await serve_program_state(standin, program, token_mint=Keypair().public_key, token_vault=Keypair().public_key)
+        context = get_program_context(program)
+        assert get_program_context(program) is context
+        assert context.payer is context.payer
+        assert context.payer.public_key == program.provider.wallet.public_key
+
+        state_account, state_bump = ProgramStateAccount.from_seed(program)
+        assert context.state_account.public_key == state_account.public_key
+        assert context.state_bump == state_bump
+
+        state = await state_account.load_data()
+        assert await context.token_mint() == state.token_mint
+        assert await context.token_vault() == state.token_vault
+        token = await context.token()
+        assert await context.token() is token
+        assert (await state_account.get_token_mint()) is token
+        await program.close()
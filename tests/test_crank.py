@@ -1,16 +1,21 @@
 import asyncio
+import time
 from pytest import fixture, mark
 
 from switchboardpy import (
   SBV2_DEVNET_PID,
   AccountParams,
   CrankAccount,
+  CrankMirror,
   CrankPopParams,
   CrankPushParams,
   CrankInitParams,
   CrankRow,
-  OracleQueueAccount
+  CrankTurner,
+  OracleQueueAccount,
+  ProgramStateAccount
 )
+from switchboardpy.testing import RpcStandIn, crank_buffer, encode_account, standin_program
 
 from contextlib import contextmanager
 from decimal import Decimal
@@ -19,6 +24,7 @@ from solana.publickey import PublicKey
 from solana.rpc.async_api import AsyncClient
 from anchorpy import Program, Provider, Wallet
 
+QUEUE = PublicKey('F8ce7MsckeZAbAGmxjJNetxYXQa9mKr9nnrC3qKubyYy')
 CRANK_DEVNET = 'GN9jjCy2THzZxhYqZETmPM3my8vg4R5JyNkgULddUMa5' #  <-- new key | old key 'HX2oLYGqThai8i6hvEm9B4y5pAkLXLyryps13195BSAz';
 
 class SwitchboardProgram(object):
@@ -59,4 +65,124 @@ async def test_create():
                 ),
             )
         )
-        """
\ No newline at end of file
+        """
+
+def test_crank_mirror():
+    a, b, c = Keypair().public_key, Keypair().public_key, Keypair().public_key
+    mirror = CrankMirror(rows=[CrankRow(a, 30), CrankRow(b, 10), CrankRow(c, 20)])
+    assert mirror.next_ready(now=25) == [b, c]
+    assert mirror.next_ready(1, now=25) == [b]
+
+    # b was popped and rescheduled, c removed from the crank
+    mirror.update([CrankRow(a, 30), CrankRow(b, 40)])
+    assert len(mirror) == 2
+    assert mirror.next_ready(now=100) == [a, b]
+    assert [row.next_timestamp for row in mirror.next_with_time(5)] == [30, 40]
+
+@mark.asyncio
+async def test_crank_rows_from_data_buffer():
+    async with RpcStandIn() as standin:
+        program = await standin_program(standin)
+        data_buffer = Keypair().public_key
+        now = int(time.time())
+        a, b, c = Keypair().public_key, Keypair().public_key, Keypair().public_key
+        rows = [CrankRow(a, now + 3600), CrankRow(b, now - 20), CrankRow(c, now - 10)]
+        await standin.set_account(CRANK_DEVNET, encode_account(program, "CrankAccountData", queue_pubkey=QUEUE, pq_size=3, max_rows=5, data_buffer=data_buffer))
+        # a stale row past pq_size is ignored
+        await standin.set_account(data_buffer, crank_buffer(rows + [CrankRow(Keypair().public_key, 0)], max_rows=5))
+        crank = CrankAccount(AccountParams(program=program, public_key=PublicKey(CRANK_DEVNET)))
+
+        assert await crank.load_rows() == rows
+        assert await crank.peak_next_ready(5) == [b, c]
+        assert await crank.peak_next(1) == [b]
+        assert await crank.peak_next_with_time(5) == [rows[1], rows[2], rows[0]]
+        mirror = await CrankMirror(crank).refresh()
+        assert mirror.next_ready() == [b, c]
+        await program.close()
+
+async def serve_crank(standin, program, queue_authority, rows):
+    state_account, _ = ProgramStateAccount.from_seed(program)
+    data_buffer = Keypair().public_key
+    await standin.set_account(state_account.public_key, encode_account(program, "SbState", token_mint=Keypair().public_key))
+    await standin.set_account(QUEUE, encode_account(program, "OracleQueueAccountData", authority=queue_authority))
+    await standin.set_account(CRANK_DEVNET, encode_account(program, "CrankAccountData", queue_pubkey=QUEUE, pq_size=len(rows), data_buffer=data_buffer))
+    await standin.set_account(data_buffer, crank_buffer(rows))
+
+@mark.asyncio
+async def test_crank_turner_pops_ready_rows():
+    async with RpcStandIn() as standin:
+        program = await standin_program(standin)
+        rows = [CrankRow(Keypair().public_key, 10 + i) for i in range(3)] + [CrankRow(Keypair().public_key, int(time.time()) + 3600)]
+        await serve_crank(standin, program, Keypair().public_key, rows)
+        crank = CrankAccount(AccountParams(program=program, public_key=PublicKey(CRANK_DEVNET)))
+        turner = CrankTurner(crank, payout_wallet=program.provider.wallet.public_key, batch_size=2, poll_interval=0.01)
+        loads = []
+        load_data = crank.load_data
+        async def counted_load_data():
+            loads.append(time.monotonic())
+            return await load_data()
+        crank.load_data = counted_load_data
+
+        await turner.start()
+        assert len(loads) == 1
+        # the ready rows go out in two pops, the row due in an hour stays
+        assert len(await turner.turn()) == 2
+        assert turner.stats()["sent"] == 2
+        await turner.check_confirmations()
+        assert turner.stats()["confirmed"] == 2
+        assert turner.in_flight == {}
+
+        # one crank load per poll
+        polls = []
+        turn = turner.turn
+        async def counted_turn():
+            polls.append(len(loads))
+            return await turn()
+        turner.turn = counted_turn
+        stats = await turner.run(duration=0.05)
+        assert stats["errors"] == 0
+        assert polls == list(range(2, len(polls) + 2))
+        await program.close()
+
+def test_crank_turner_nonce_skips_zero():
+    turner = CrankTurner.__new__(CrankTurner)
+    turner._nonce = (1 << 32) - 2
+    assert [turner._next_nonce() for _ in range(3)] == [(1 << 32) - 1, 1, 2]
+
+@mark.asyncio
+async def test_crank_turner_refreshes_accounts(monkeypatch, caplog):
+    async with RpcStandIn() as standin:
+        program = await standin_program(standin)
+        first_authority, second_authority = Keypair().public_key, Keypair().public_key
+        rows = [CrankRow(Keypair().public_key, 10), CrankRow(Keypair().public_key, 20)]
+        await serve_crank(standin, program, first_authority, rows)
+        crank = CrankAccount(AccountParams(program=program, public_key=PublicKey(CRANK_DEVNET)))
+        turner = CrankTurner(crank, payout_wallet=program.provider.wallet.public_key, max_in_flight=2, poll_interval=0.01)
+
+        # loads crank, queue and mint without sending anything
+        await turner.start()
+        assert len(turner.mirror) == 2
+        assert turner._queue_authority == first_authority
+        assert turner.stats()["sent"] == 0
+
+        # an account mismatch reloads the queue before the next pop
+        await standin.set_account(QUEUE, encode_account(program, "OracleQueueAccountData", authority=second_authority))
+        mismatch = next(error.code for error in program.idl.errors if error.name == "OracleQueueMismatch")
+        await turner.slots.acquire()
+        turner.in_flight["mismatched"] = (time.monotonic(), rows[:1])
+        standin.signature_statuses["mismatched"] = {"slot": 1, "confirmations": None, "err": {"InstructionError": [0, {"Custom": mismatch}]}, "confirmationStatus": "confirmed"}
+        await turner.check_confirmations()
+        assert turner.mismatches == 1
+        turner._backoff_until = 0.0
+        # keep the turner from sending pops for the mirrored rows
+        monkeypatch.setattr(turner, "turn", lambda: asyncio.sleep(0))
+        await turner.run(duration=0.02)
+        assert turner._queue_authority == second_authority
+
+        # failures are counted and logged
+        del standin.accounts[CRANK_DEVNET]
+        turner.accounts_refresh_interval = 0.0
+        stats = await turner.run(duration=0.02)
+        assert stats["errors"] >= 1
+        assert f"Crank {CRANK_DEVNET} could not be turned" in caplog.text
+        await program.close()
@@ -0,0 +1,64 @@
+import dataclasses
+
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from switchboardpy import SwitchboardDecimal
+from switchboardpy.common import SWITCHBOARD_DECIMAL_SIZE
+
+def test_from_decimal_round_trip():
+    for value in ["24531.123456", "-1.5", "0", "1E+3", "0.000000001"]:
+        sbd = SwitchboardDecimal.from_decimal(Decimal(value))
+        assert sbd.scale >= 0
+        assert SwitchboardDecimal.sbd_to_decimal(sbd) == Decimal(value)
+    assert SwitchboardDecimal.from_decimal(Decimal("-1.50")) == SwitchboardDecimal(-150, 2)
+
+def test_to_decimal_many():
+    mantissas = [12345, -7, 2 ** 100]
+    scales = [2, 0, 20]
+    expected = [SwitchboardDecimal.sbd_to_decimal(SwitchboardDecimal(m, s)) for m, s in zip(mantissas, scales)]
+    assert SwitchboardDecimal.to_decimal_many(mantissas, scales) == expected
+
+def test_to_float_array():
+    values = SwitchboardDecimal.to_float_array([12345, -7, 2 ** 100, 5], [2, 0, 20, 70])
+    assert values.dtype == np.float64
+    assert values.tolist() == [123.45, -7.0, float(2 ** 100) / 1e20, 5e-70]
+    assert SwitchboardDecimal.to_float_array(np.array([1, 2]), np.array([1, 1])).tolist() == [0.1, 0.2]
+
+def test_integer_comparisons():
+    assert SwitchboardDecimal.compare(SwitchboardDecimal(150, 2), SwitchboardDecimal(15, 1)) == 0
+    assert SwitchboardDecimal.compare(SwitchboardDecimal(-1, 0), SwitchboardDecimal(1, 30)) == -1
+    assert SwitchboardDecimal.compare(SwitchboardDecimal(2, 0), SwitchboardDecimal(19, 1)) == 1
+
+    latest = SwitchboardDecimal(10000, 2)
+    threshold = SwitchboardDecimal(5, 1)
+    assert not SwitchboardDecimal.exceeds_threshold(SwitchboardDecimal(1005, 1), latest, threshold)
+    assert not SwitchboardDecimal.exceeds_threshold(SwitchboardDecimal(995, 1), latest, threshold)
+    assert SwitchboardDecimal.exceeds_threshold(SwitchboardDecimal(100501, 3), latest, threshold)
+    assert SwitchboardDecimal.exceeds_threshold(SwitchboardDecimal(99499, 3), latest, threshold)
+
+def test_i128_codec():
+    for mantissa in [0, 1, -1, 2 ** 64, -(2 ** 64) - 3, 2 ** 127 - 1, -(2 ** 127)]:
+        sbd = SwitchboardDecimal(mantissa, 9)
+        data = sbd.to_bytes()
+        assert len(data) == SWITCHBOARD_DECIMAL_SIZE
+        assert SwitchboardDecimal.from_bytes(data) == sbd
+
+        buf = bytearray(4 + SWITCHBOARD_DECIMAL_SIZE)
+        sbd.pack_into(buf, 4)
+        assert bytes(buf[4:]) == data
+        assert SwitchboardDecimal.unpack_from(buf, 4) == sbd
+        assert SwitchboardDecimal.unpack_decimal_from(buf, 4) == SwitchboardDecimal.sbd_to_decimal(sbd)
+
+    with pytest.raises(OverflowError):
+        SwitchboardDecimal(2 ** 127, 0).pack_into(bytearray(SWITCHBOARD_DECIMAL_SIZE))
+    with pytest.raises(ValueError):
+        SwitchboardDecimal.from_bytes(bytes(16))
+
+def test_dataclass_helpers():
+    sbd = SwitchboardDecimal(12345, 2)
+    assert dataclasses.asdict(sbd) == {"mantissa": 12345, "scale": 2}
+    assert dataclasses.replace(sbd, scale=3) == SwitchboardDecimal(12345, 3)
+    assert not hasattr(sbd, "__dict__")
@@ -0,0 +1,69 @@
+import dataclasses
+from pytest import mark
+
+from switchboardpy.fastdecode import get_decoder
+from switchboardpy.testing import RpcStandIn, encode_account, standin_program
+
+from solana.publickey import PublicKey
+
+QUEUE = PublicKey("F8ce7MsckeZAbAGmxjJNetxYXQa9mKr9nnrC3qKubyYy")
+ROUND = {
+    "num_success": 3,
+    "is_closed": True,
+    "round_open_slot": 123456789,
+    "round_open_timestamp": 1646092800,
+    "result": {"mantissa": -(2 ** 100) + 7, "scale": 9},
+    "medians_data": [{"mantissa": i * 1000, "scale": 3} for i in range(16)],
+    "current_payout": [-i for i in range(16)],
+    "medians_fulfilled": [i % 2 == 0 for i in range(16)],
+}
+FIELDS = {
+    "AggregatorAccountData": dict(
+        name=list(b"BTC_USD".ljust(32, b"\0")),
+        queue_pubkey=QUEUE,
+        min_oracle_results=3,
+        start_after=-1,
+        variance_threshold={"mantissa": 5, "scale": 1},
+        latest_confirmed_round=ROUND,
+        job_pubkeys_data=[QUEUE] * 16,
+        job_pubkeys_size=2,
+        is_locked=True,
+    ),
+    "CrankAccountData": dict(queue_pubkey=QUEUE, pq_size=7, max_rows=100, jitter_modifier=255),
+    "OracleQueueAccountData": dict(authority=QUEUE, reward=2 ** 64 - 1, variance_tolerance_multiplier={"mantissa": 2, "scale": 0}, size=4),
+    "LeaseAccountData": dict(queue=QUEUE, is_active=True, update_count=2 ** 127 + 5, created_at=-5),
+}
+
+# reduce decoded values to builtins so both decoders' outputs can be compared
+def normalize(value):
+    if dataclasses.is_dataclass(value):
+        value = {field.name: getattr(value, field.name) for field in dataclasses.fields(value)}
+    if isinstance(value, dict):
+        return {k: normalize(v) for k, v in value.items() if not str(k).startswith("_")}
+    if isinstance(value, (list, tuple)):
+        return [normalize(v) for v in value]
+    return value
+
+@mark.asyncio
+async def test_matches_anchorpy_decoder():
+    async with RpcStandIn() as standin:
+        program = await standin_program(standin)
+        for account_name, fields in FIELDS.items():
+            data = encode_account(program, account_name, **fields)
+            expected = program.coder.accounts.decode(data)
+            assert normalize(get_decoder(program, account_name).decode(data)) == normalize(expected)
+        await program.close()
+
+@mark.asyncio
+async def test_partial_decode():
+    async with RpcStandIn() as standin:
+        program = await standin_program(standin)
+        data = encode_account(program, "AggregatorAccountData", **FIELDS["AggregatorAccountData"])
+        expected = program.coder.accounts.decode(data)
+        fields = get_decoder(program, "AggregatorAccountData").decode_fields(
+            data,
+            ["latest_confirmed_round.result", "latest_confirmed_round.round_open_timestamp"]
+        )
+        assert normalize(fields["latest_confirmed_round.result"]) == normalize(expected.latest_confirmed_round.result)
+        assert fields["latest_confirmed_round.round_open_timestamp"] == 1646092800
+        await program.close()
@@ -0,0 +1,60 @@
+import asyncio
+from pytest import mark
+
+from switchboardpy import (
+  AccountParams,
+  AggregatorAccount,
+  CrankAccount,
+  OracleQueueAccount,
+  enable_fetch_batching,
+  instrument,
+)
+from switchboardpy.testing import RpcStandIn, encode_account, standin_program
+
+from solana.publickey import PublicKey
+
+AGGREGATOR = PublicKey("88FX4tBstuwBPNhQU4EEBoPX35neSu4Le9zDSwtPRRQz")
+QUEUE = PublicKey("F8ce7MsckeZAbAGmxjJNetxYXQa9mKr9nnrC3qKubyYy")
+CRANK = PublicKey("GN9jjCy2THzZxhYqZETmPM3my8vg4R5JyNkgULddUMa5")
+
+async def serve_accounts(standin, program):
+    await standin.set_account(AGGREGATOR, encode_account(program, "AggregatorAccountData", queue_pubkey=QUEUE))
+    await standin.set_account(QUEUE, encode_account(program, "OracleQueueAccountData", authority=AGGREGATOR))
+    await standin.set_account(CRANK, encode_account(program, "CrankAccountData", queue_pubkey=QUEUE))
+
+def request_counts(instrumentation):
+    counts = {}
+    for row in instrumentation.snapshot():
+        counts[row["method"]] = counts.get(row["method"], 0) + row["count"]
+    return counts
+
+@mark.asyncio
+async def test_concurrent_fetches_are_coalesced():
+    async with RpcStandIn() as standin:
+        program = await standin_program(standin)
+        await serve_accounts(standin, program)
+        instrumentation = instrument(program)
+        aggregator = AggregatorAccount(AccountParams(program=program, public_key=AGGREGATOR))
+        results = await asyncio.gather(*[aggregator.load_data() for _ in range(20)])
+        assert all(result is results[0] for result in results)
+        assert request_counts(instrumentation) == {"getAccountInfo": 1}
+        await program.close()
+
+@mark.asyncio
+async def test_fetches_are_batched():
+    async with RpcStandIn() as standin:
+        program = await standin_program(standin)
+        await serve_accounts(standin, program)
+        instrumentation = instrument(program)
+        batcher = enable_fetch_batching(program)
+        aggregator, queue, crank = await asyncio.gather(
+            AggregatorAccount(AccountParams(program=program, public_key=AGGREGATOR)).load_data(),
+            OracleQueueAccount(AccountParams(program=program, public_key=QUEUE)).load_data(),
+            CrankAccount(AccountParams(program=program, public_key=CRANK)).load_data(),
+        )
+        assert aggregator.queue_pubkey == QUEUE
+        assert crank.queue_pubkey == QUEUE
+        assert queue.authority == AGGREGATOR
+        assert batcher.batches == 1
+        assert request_counts(instrumentation) == {"getMultipleAccounts": 1}
+        await program.close()
@@ -0,0 +1,134 @@
+import numpy as np
+
+from decimal import Decimal
+from pytest import mark
+
+from solana.publickey import PublicKey
+from solana.rpc.async_api import AsyncClient
+
+from switchboardpy import AccountParams, AggregatorAccount
+from switchboardpy.history import (
+  HISTORY_ROW_SIZE,
+  AggregatorHistoryRow,
+  decode_history,
+  history_num_rows,
+  read_history_range,
+)
+from switchboardpy.testing import AccountFixture, RpcStandIn, encode_account, history_buffer, standin_program
+
+HISTORY_BUFFER = PublicKey("88FX4tBstuwBPNhQU4EEBoPX35neSu4Le9zDSwtPRRQz")
+AGGREGATOR = PublicKey("GvDMxPzN1sCj7L26YDK2HnMRXEQmQ2aemov8YBtPS7vR")
+
+def test_empty_buffer():
+    history = decode_history(b'')
+    assert len(history) == 0
+    assert list(history) == []
+
+def test_partially_filled_buffer():
+    buf = history_buffer({0: (100, 12345, 2), 1: (200, -5, 1)}, size=4, insert_idx=2)
+    history = decode_history(buf)
+    assert history.timestamps.tolist() == [100, 200]
+    assert history.values.tolist() == [123.45, -0.5]
+    assert list(history.decimals()) == [Decimal('123.45'), Decimal('-0.5')]
+
+def test_wrapped_buffer_is_rotated():
+    rows = {0: (400, 4, 0), 1: (500, 5, 0), 2: (200, 2, 0), 3: (300, 3, 0)}
+    history = decode_history(history_buffer(rows, size=4, insert_idx=2))
+    assert history.timestamps.tolist() == [200, 300, 400, 500]
+    assert [row.value for row in history] == [2, 3, 4, 5]
+
+def test_rows_are_not_copied():
+    buf = history_buffer(wrapped_rows(10, 7), size=10, insert_idx=7)
+    history = decode_history(buf)
+    assert len(history.segments) == 2
+    assert all(np.shares_memory(segment, np.frombuffer(buf, dtype=np.uint8)) for segment in history.segments)
+    assert history[-1].timestamp == 100
+
+    # rows 7..9 of the ring, which do not wrap: the timestamps are a view too
+    selected = history.select(until=40)
+    assert len(selected.segments) == 1
+    assert np.shares_memory(selected.timestamps, np.frombuffer(buf, dtype=np.uint8))
+    assert selected.timestamps.tolist() == [10, 20, 30]
+
+def test_i128_mantissa():
+    mantissa = 2 ** 100 + 7
+    history = decode_history(history_buffer({0: (1, mantissa, 10)}, size=2, insert_idx=1))
+    assert history.decimal_at(0) == Decimal(mantissa) / Decimal(10 ** 10)
+
+def test_row_from_buffer():
+    buf = history_buffer({0: (1650000000, -(2 ** 70), 3)}, size=1, insert_idx=1)
+    row = AggregatorHistoryRow.from_buffer(buf[12:12 + HISTORY_ROW_SIZE])
+    assert row == AggregatorHistoryRow(1650000000, Decimal(-(2 ** 70)) / Decimal(1000))
+
+def wrapped_rows(size, insert_idx):
+    # timestamps 10, 20, ... in chronological order, starting at insert_idx
+    return {(insert_idx + i) % size: (10 * (i + 1), i, 0) for i in range(size)}
+
+def test_iter_rows_range():
+    history = decode_history(history_buffer(wrapped_rows(10, 7), size=10, insert_idx=7))
+    assert history.index_range(since=30, until=70) == (2, 6)
+    assert [row.timestamp for row in history.iter_rows(since=35, until=70)] == [40, 50, 60]
+    assert [row.timestamp for row in history.iter_rows(last=2)] == [90, 100]
+    assert [row.timestamp for row in history.iter_rows(until=60, last=2)] == [40, 50]
+    assert list(history.iter_rows(since=80, until=20)) == []
+
+@mark.asyncio
+async def test_read_history_range_with_data_slices():
+    for size, insert_idx, filled in [(50, 17, 50), (50, 30, 30)]:
+        rows = {i: row for i, row in wrapped_rows(size, insert_idx if filled == size else 0).items() if i < filled}
+        buf = history_buffer(rows, size=size, insert_idx=insert_idx)
+        expected = decode_history(buf)
+        async with RpcStandIn({str(HISTORY_BUFFER): AccountFixture(buf)}) as standin:
+            client = AsyncClient(standin.http_url)
+            for since, until, last in [(None, None, None), (95, 215, None), (None, None, 7), (None, 100, 3), (1000, None, None)]:
+                history = await read_history_range(client, HISTORY_BUFFER, history_num_rows(len(buf)), since, until, last)
+                assert list(history) == list(expected.iter_rows(since, until, last))
+            await client.close()
+
+RANGES = [(None, None, None), (95, 215, None), (None, None, 7), (None, 100, 3), (130, None, 5), (1000, None, None)]
+
+@mark.asyncio
+async def test_aggregator_history_ranges():
+    # a wrapped ring: the oldest row is at insert_idx
+    buf = history_buffer(wrapped_rows(50, 17), size=50, insert_idx=17)
+    expected = decode_history(buf)
+    async with RpcStandIn() as standin:
+        program = await standin_program(standin)
+        await standin.set_account(AGGREGATOR, encode_account(program, "AggregatorAccountData", history_buffer=HISTORY_BUFFER))
+        await standin.set_account(HISTORY_BUFFER, buf)
+        agg = AggregatorAccount(AccountParams(program=program, public_key=AGGREGATOR))
+
+        # the buffer size is not known yet: downloaded whole
+        for since, until, last in RANGES:
+            rows = list(expected.iter_rows(since, until, last))
+            assert list(await agg.load_history_range(since, until, last, slice_min_rows=1)) == rows
+            assert [row async for row in agg.iter_history(since, until, last, slice_min_rows=1)] == rows
+        assert [row.timestamp async for row in agg.iter_history(since=495)] == [500]
+
+        # now it is: read with dataSlice, in chunks of 4 rows
+        aggregator = await agg.load_data()
+        for since, until, last in RANGES:
+            rows = list(expected.iter_rows(since, until, last))
+            assert list(await agg.load_history_range(since, until, last, aggregator, slice_min_rows=1)) == rows
+            assert [row async for row in agg.iter_history(since, until, last, aggregator, slice_min_rows=1, chunk_rows=4)] == rows
+        await program.close()
+
+@mark.asyncio
+async def test_iter_history_yields_per_chunk():
+    buf = history_buffer(wrapped_rows(50, 17), size=50, insert_idx=17)
+    async with RpcStandIn() as standin:
+        program = await standin_program(standin)
+        await standin.set_account(AGGREGATOR, encode_account(program, "AggregatorAccountData", history_buffer=HISTORY_BUFFER))
+        await standin.set_account(HISTORY_BUFFER, buf)
+        agg = AggregatorAccount(AccountParams(program=program, public_key=AGGREGATOR))
+        aggregator = await agg.load_data()
+        await agg.load_history(aggregator)
+
+        # rows 46..49 then 0..7 of the ring, fetched 4 per request
+        rows = agg.iter_history(since=300, until=420, aggregator=aggregator, slice_min_rows=1, chunk_rows=4)
+        assert (await rows.__anext__()).timestamp == 300
+        fetched = standin.calls["getAccountInfo"]
+        assert [row.timestamp async for row in rows] == list(range(310, 420, 10))
+        # the two chunks after the wrap were only fetched once needed
+        assert standin.calls["getAccountInfo"] == fetched + 2
+        await program.close()
@@ -0,0 +1,74 @@
+from pytest import mark
+
+from switchboardpy import (
+  AccountParams,
+  AggregatorAccount,
+  RpcCall,
+  RpcInstrumentation,
+  instrument,
+)
+from switchboardpy import common
+from switchboardpy.instrumentation import caller, get_instrumentation
+from switchboardpy.testing import RpcStandIn, encode_account, standin_program
+
+from solana.publickey import PublicKey
+
+AGGREGATOR = PublicKey("88FX4tBstuwBPNhQU4EEBoPX35neSu4Le9zDSwtPRRQz")
+
+@mark.asyncio
+async def test_calls_are_attributed_to_sdk_functions():
+    async with RpcStandIn() as standin:
+        program = await standin_program(standin)
+        await standin.set_account(AGGREGATOR, encode_account(program, "AggregatorAccountData"))
+        calls = []
+        instrumentation = instrument(program, callbacks=[calls.append])
+        aggregator = AggregatorAccount(AccountParams(program=program, public_key=AGGREGATOR))
+        await aggregator.load_data()
+        with caller("application"):
+            await program.provider.connection.get_slot()
+        stats = {(row["method"], row["caller"]): row for row in instrumentation.snapshot()}
+        assert stats[("getAccountInfo", "AggregatorAccount.load_data")]["count"] == 1
+        assert stats[("getAccountInfo", "AggregatorAccount.load_data")]["bytes"] > 0
+        assert stats[("getSlot", "application")]["count"] == 1
+        assert len(calls) == 2
+
+        instrumentation.enabled = False
+        await aggregator.load_data()
+        assert len(calls) == 2
+
+        instrumentation.uninstall(program)
+        assert get_instrumentation(program) is None
+        await program.close()
+
+@mark.asyncio
+async def test_uninstrumented_fetches_skip_the_stack_walk(monkeypatch):
+    async with RpcStandIn() as standin:
+        program = await standin_program(standin)
+        await standin.set_account(AGGREGATOR, encode_account(program, "AggregatorAccountData", min_oracle_results=3))
+        walks = []
+        caller_frame = common._caller_frame
+        monkeypatch.setattr(common, "_caller_frame", lambda: walks.append(1) or caller_frame())
+        aggregator = AggregatorAccount(AccountParams(program=program, public_key=AGGREGATOR))
+        assert (await aggregator.load_data()).min_oracle_results == 3
+        await AggregatorAccount.load_many(program, [AGGREGATOR])
+        assert walks == []
+
+        instrumentation = instrument(program)
+        await aggregator.load_data()
+        await AggregatorAccount.load_many(program, [AGGREGATOR])
+        assert len(walks) == 2
+        instrumentation.uninstall(program)
+        await program.close()
+
+def test_prometheus_export():
+    instrumentation = RpcInstrumentation()
+    instrumentation.record(RpcCall("getAccountInfo", "AggregatorAccount.load_data", 0.02, 100, False))
+    instrumentation.record(RpcCall("getAccountInfo", "AggregatorAccount.load_data", 0.2, 50, True))
+    text = instrumentation.prometheus()
+    labels = 'method="getAccountInfo",caller="AggregatorAccount.load_data"'
+    assert f"switchboardpy_rpc_requests_total{{{labels}}} 2" in text
+    assert f"switchboardpy_rpc_errors_total{{{labels}}} 1" in text
+    assert f"switchboardpy_rpc_response_bytes_total{{{labels}}} 150" in text
+    assert f'switchboardpy_rpc_latency_seconds_bucket{{{labels},le="0.025"}} 1' in text
+    assert f'switchboardpy_rpc_latency_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f"switchboardpy_rpc_latency_seconds_count{{{labels}}} 2" in text
@@ -0,0 +1,206 @@
+import asyncio
+import json
+from decimal import Decimal
+
+import pytest
+from pytest import mark
+
+from switchboardpy import JobRunner, OracleJob
+from switchboardpy.jobrunner import HttpBody, TaskError
+from switchboardpy.streams import StreamManager
+from switchboardpy.testing import HttpStandIn, WebsocketStandIn
+
+def http(url):
+    return OracleJob.Task(http_task=OracleJob.HttpTask(url=url))
+
+def json_parse(path, aggregation=OracleJob.JsonParseTask.NONE):
+    return OracleJob.Task(json_parse_task=OracleJob.JsonParseTask(path=path, aggregation_method=aggregation))
+
+def price_job(url, path="$.price"):
+    return OracleJob(tasks=[http(url), json_parse(path)])
+
+def median_of(urls, **fields):
+    return OracleJob(tasks=[OracleJob.Task(median_task=OracleJob.MedianTask(
+        jobs=[price_job(url) for url in urls], **fields
+    ))])
+
+@mark.asyncio
+async def test_http_json_pipeline():
+    async with HttpStandIn() as standin, JobRunner() as runner:
+        standin.route("/ticker", {"data": [{"symbol": "BTC", "price": "42000.5"}, {"symbol": "ETH", "price": 3000}]})
+        job = OracleJob(tasks=[
+            http(f"{standin.url}/ticker"),
+            json_parse("$.data[?(@.symbol == 'BTC')].price"),
+            OracleJob.Task(multiply_task=OracleJob.MultiplyTask(scalar=2)),
+            OracleJob.Task(subtract_task=OracleJob.SubtractTask(job=OracleJob(tasks=[
+                OracleJob.Task(value_task=OracleJob.ValueTask(value=0.5))
+            ]))),
+        ])
+        assert await runner.run_job(job) == Decimal("84000.5")
+        total = OracleJob(tasks=[http(f"{standin.url}/ticker"), json_parse("$.data[*].price", OracleJob.JsonParseTask.SUM)])
+        assert await runner.run_job(total) == Decimal("45000.5")
+
+@mark.asyncio
+async def test_run_jobs_aggregates_successes():
+    async with HttpStandIn() as standin, JobRunner() as runner:
+        for i, price in enumerate([10, 30, 20]):
+            standin.route(f"/price/{i}", {"price": price})
+        jobs = [price_job(f"{standin.url}/price/{i}") for i in range(3)] + [price_job(f"{standin.url}/missing")]
+        results = await runner.run_jobs(jobs)
+        assert (results.value, results.min_response, results.max_response) == (20, 10, 30)
+        assert results.results[3] is None
+        assert isinstance(results.errors[3], TaskError)
+
+@mark.asyncio
+async def test_connections_are_pooled_and_limited_per_host():
+    async with HttpStandIn() as standin, JobRunner(max_connections_per_host=2) as runner:
+        for i in range(8):
+            standin.route(f"/slow?i={i}", {"price": 1}, latency=0.05)
+        results = await runner.run_jobs([price_job(f"{standin.url}/slow?i={i}") for i in range(8)])
+        assert results.results == [1] * 8
+        assert standin.max_in_flight == 2
+        assert standin.connections == 2
+
+@mark.asyncio
+async def test_fallbacks_and_errors():
+    async with HttpStandIn() as standin, JobRunner(timeout=0.05) as runner:
+        standin.route("/text", "last trade: 123.45 USD", content_type="text/plain")
+        standin.route("/slow", {"price": 1}, latency=0.5)
+        regex = OracleJob(tasks=[
+            http(f"{standin.url}/text"),
+            OracleJob.Task(regex_extract_task=OracleJob.RegexExtractTask(pattern=r"([\d.]+) USD", group_number=1)),
+        ])
+        assert await runner.run_job(regex) == Decimal("123.45")
+
+        conditional = OracleJob(tasks=[OracleJob.Task(conditional_task=OracleJob.ConditionalTask(
+            attempt=[http(f"{standin.url}/slow"), json_parse("$.price")],
+            on_failure=[OracleJob.Task(value_task=OracleJob.ValueTask(value=7))],
+        ))])
+        assert await runner.run_job(conditional) == 7
+
+        with pytest.raises(TaskError):
+            await runner.run_job(price_job(f"{standin.url}/slow"))
+        with pytest.raises(TaskError):
+            await runner.run_job(OracleJob(tasks=[OracleJob.Task(lp_exchange_rate_task=OracleJob.LpExchangeRateTask())]))
+
+
+@mark.asyncio
+async def test_identical_requests_are_sent_once_per_round():
+    async with HttpStandIn() as standin, JobRunner(fetch_window=0.2) as runner:
+        standin.route("/ticker", {"BTC": 42000, "ETH": 3000}, latency=0.02)
+        standin.route("/other", {"BTC": 42010})
+        url = f"{standin.url}/ticker"
+        rounds = [[price_job(url, "$.BTC"), price_job(f"{standin.url}/other", "$.BTC")], [price_job(url, "$.ETH")]] * 10
+        results = await runner.run_round(rounds)
+        assert [r.value for r in results[:2]] == [42005, 3000]
+        assert standin.calls["/ticker"] == 1 and standin.calls["/other"] == 1
+
+        # responses are reused within the window, then fetched again
+        assert await runner.run_job(price_job(url, "$.BTC")) == 42000
+        assert standin.calls["/ticker"] == 1
+        await asyncio.sleep(0.25)
+        assert await runner.run_job(price_job(url, "$.BTC")) == 42000
+        assert standin.calls["/ticker"] == 2
+        runner.clear_fetches()
+        assert await runner.run_job(price_job(url, "$.BTC")) == 42000
+        assert standin.calls["/ticker"] == 3
+
+        # failures are not kept
+        standin.route("/flaky", "", status=503)
+        with pytest.raises(TaskError):
+            await runner.run_job(price_job(f"{standin.url}/flaky"))
+        standin.route("/flaky", {"price": 5})
+        assert await runner.run_job(price_job(f"{standin.url}/flaky")) == 5
+
+def test_http_body_parses_json_once():
+    body = HttpBody('{"price": 1}')
+    assert body.document() is body.document() == {"price": 1}
+
+@mark.asyncio
+async def test_json_parse_aggregation_methods():
+    document = {"bids": [["41990.5", "1"], ["41980", "2"]], "asks": [{"p": 42001}, {"p": 42003.25}]}
+    async with JobRunner() as runner:
+        async def parse(path, method):
+            return await runner.run_task(json_parse(path, method), HttpBody(json.dumps(document)))
+        assert await parse("$.bids[*][0]", OracleJob.JsonParseTask.MIN) == Decimal("41980")
+        assert await parse("$.asks[*].p", OracleJob.JsonParseTask.MAX) == Decimal("42003.25")
+        assert await parse("$.asks[?(@.p > 42002)].p", OracleJob.JsonParseTask.SUM) == Decimal("42003.25")
+        assert await parse("$.bids[0][0]", OracleJob.JsonParseTask.NONE) == "41990.5"
+        with pytest.raises(TaskError):
+            await parse("$.missing", OracleJob.JsonParseTask.MAX)
+        with pytest.raises(TaskError):
+            await parse("$.bids[", OracleJob.JsonParseTask.NONE)
+
+@mark.asyncio
+async def test_children_run_concurrently_within_budget():
+    async with HttpStandIn() as standin, JobRunner(max_concurrent_children=3) as runner:
+        for i in range(6):
+            standin.route(f"/source/{i}", {"price": i}, latency=0.1)
+        children = []
+        runner.on_child = children.append
+        start = asyncio.get_event_loop().time()
+        assert await runner.run_job(median_of([f"{standin.url}/source/{i}" for i in range(6)])) == Decimal("2.5")
+        assert asyncio.get_event_loop().time() - start < 0.35
+        assert standin.max_in_flight == 3
+        assert sorted(child.index for child in children) == list(range(6))
+        assert all(child.seconds >= 0.1 and child.error is None for child in children)
+        assert runner.child_latency["median_task"].count == 6
+
+        # children nested in a child share its slot instead of waiting for another one
+        nested = OracleJob(tasks=[OracleJob.Task(mean_task=OracleJob.MeanTask(jobs=[
+            median_of([f"{standin.url}/source/{i}", f"{standin.url}/source/{i + 1}"]) for i in range(4)
+        ]))])
+        assert await asyncio.wait_for(runner.run_job(nested), 2) == Decimal("2")
+
+@mark.asyncio
+async def test_nested_children_fetches_within_budget():
+    async with HttpStandIn() as standin, JobRunner(max_concurrent_children=2, max_concurrent_fetches=3) as runner:
+        for i in range(8):
+            standin.route(f"/source/{i}", {"price": i}, latency=0.05)
+        # 2 top-level children of 4 fetches each: only the fetch budget bounds the leaves
+        nested = OracleJob(tasks=[OracleJob.Task(mean_task=OracleJob.MeanTask(jobs=[
+            median_of([f"{standin.url}/source/{i}" for i in range(j, j + 4)]) for j in (0, 4)
+        ]))])
+        assert await runner.run_job(nested) == Decimal("3.5")
+        assert standin.max_in_flight == 3
+        assert sum(standin.calls.values()) == 8
+
+@mark.asyncio
+async def test_children_tolerate_failures_down_to_minimum():
+    async with HttpStandIn() as standin, JobRunner(min_child_successes=2) as runner:
+        standin.route("/a", {"price": 10})
+        standin.route("/b", {"price": 20})
+        urls = [f"{standin.url}/a", f"{standin.url}/b", f"{standin.url}/down"]
+        assert await runner.run_job(median_of(urls)) == 15
+        with pytest.raises(TaskError, match="1 of 2"):
+            await runner.run_job(median_of(urls[1:]))
+
+@mark.asyncio
+async def test_websocket_task_reads_shared_stream():
+    async with WebsocketStandIn() as standin, JobRunner(streams=StreamManager(first_message_timeout=1.0)) as runner:
+        def ws_job(market):
+            return OracleJob(tasks=[
+                OracleJob.Task(websocket_task=OracleJob.WebsocketTask(
+                    url=standin.url, subscription='{"op": "subscribe"}',
+                    max_data_age_seconds=5, filter=f"$[?(@.market == '{market}')]"
+                )),
+                json_parse("$.price"),
+            ])
+        pending = asyncio.ensure_future(runner.run_jobs([ws_job("BTC"), ws_job("BTC"), ws_job("ETH")]))
+        await standin.wait_clients(1)
+        await standin.publish({"market": "BTC", "price": "42000.5"})
+        await standin.publish({"market": "ETH", "price": 3000})
+        results = await pending
+        assert results.results == [Decimal("42000.5"), Decimal("42000.5"), 3000]
+        assert standin.connections == 1
+        await runner.streams.close()
+
+@mark.asyncio
+async def test_websocket_task_reports_connection_error():
+    streams = StreamManager(first_message_timeout=0.2, reconnect_base_delay=0.01)
+    async with JobRunner(streams=streams) as runner:
+        # nothing listens on the discard port
+        job = OracleJob(tasks=[OracleJob.Task(websocket_task=OracleJob.WebsocketTask(url="ws://127.0.0.1:9"))])
+        with pytest.raises(TaskError, match="last connection error"):
+            await runner.run_job(job)
+        await streams.close()
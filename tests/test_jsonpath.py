@@ -0,0 +1,63 @@
+import pytest
+
+from switchboardpy import jsonpath
+from switchboardpy.jsonpath import evaluate
+
+DOCUMENT = {
+    "price": 9,
+    "data": [
+        {"symbol": "BTCUSDT", "price": "42000.5", "volume": 3},
+        {"symbol": "ETHUSDT", "price": 3000, "volume": 1},
+    ],
+    "result": {"XXBTZUSD": {"c": ["41999.1", "0.1"]}},
+}
+
+def test_selectors():
+    assert evaluate("$", DOCUMENT) == [DOCUMENT]
+    assert evaluate("$.result.XXBTZUSD.c[0]", DOCUMENT) == ["41999.1"]
+    assert evaluate("$['result'][\"XXBTZUSD\"].c[-1]", DOCUMENT) == ["0.1"]
+    assert evaluate("$.data[*].price", DOCUMENT) == ["42000.5", 3000]
+    assert evaluate("$.data[0:1].symbol", DOCUMENT) == ["BTCUSDT"]
+    assert evaluate("$..price", DOCUMENT) == [9, "42000.5", 3000]
+    assert evaluate("$.missing", DOCUMENT) == []
+
+def test_filters():
+    assert evaluate("$.data[?(@.symbol == 'BTCUSDT')].price", DOCUMENT) == ["42000.5"]
+    assert evaluate("$.data[?(@.volume > 1 || @.symbol == 'X')].symbol", DOCUMENT) == ["BTCUSDT"]
+    assert evaluate("$.data[?(@.volume >= 1 && @.symbol != 'BTCUSDT')].symbol", DOCUMENT) == ["ETHUSDT"]
+    assert evaluate("$.data[?(@.missing)]", DOCUMENT) == []
+
+def test_invalid_paths():
+    for path in ["data", "$.data[", "$.data[?(@.volume ~ 1)]"]:
+        with pytest.raises(ValueError):
+            evaluate(path, DOCUMENT)
+
+def test_compiled_paths_match_interpretation():
+    paths = [
+        "$",
+        "$.price",
+        "$.result.XXBTZUSD.c[0]",
+        "$.result.XXBTZUSD.c[5]",
+        "$.result.*.c[-1]",
+        "$.data[1].symbol",
+        "$.data[*].price",
+        "$.data[::-1].volume",
+        "$..price",
+        "$.data[?(@.symbol == 'BTCUSDT')].price",
+        "$.data[?(@.volume > 1 || @.symbol == 'X')].symbol",
+        "$.price.missing[0]",
+    ]
+    for path in paths:
+        assert jsonpath.compile_path(path)(DOCUMENT) == evaluate(path, DOCUMENT), path
+    assert jsonpath.compile_path("$.price") is jsonpath.compile_path("$.price")
+    with pytest.raises(ValueError):
+        jsonpath.compile_path("$.data[")
+
+def test_malformed_paths_are_cached(monkeypatch):
+    parsed = []
+    parse = jsonpath.parse
+    monkeypatch.setattr(jsonpath, "parse", lambda path: parsed.append(path) or parse(path))
+    for _ in range(3):
+        with pytest.raises(ValueError, match="bids"):
+            jsonpath.compile_path("$.bids[0")
+    assert parsed == ["$.bids[0"]
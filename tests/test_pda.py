@@ -0,0 +1,52 @@
+from switchboardpy import (
+  SBV2_DEVNET_PID,
+  PDA_CACHE,
+  PdaCache,
+  AccountParams,
+  LeaseAccount,
+  OracleQueueAccount,
+  AggregatorAccount,
+  ProgramStateAccount,
+  warm_pda_cache
+)
+
+from types import SimpleNamespace
+from solana.keypair import Keypair
+from solana.publickey import PublicKey
+
+QUEUE = PublicKey("F8ce7MsckeZAbAGmxjJNetxYXQa9mKr9nnrC3qKubyYy")
+AGGREGATOR = PublicKey("88FX4tBstuwBPNhQU4EEBoPX35neSu4Le9zDSwtPRRQz")
+
+def test_cached_address_matches_derivation():
+    cache = PdaCache()
+    expected = PublicKey.find_program_address([b'STATE'], SBV2_DEVNET_PID)
+    assert cache.find_program_address([b'STATE'], SBV2_DEVNET_PID) == expected
+    assert cache.find_program_address([b'STATE'], SBV2_DEVNET_PID) == expected
+    info = cache.cache_info()
+    assert info.hits == 1
+    assert info.misses == 1
+    assert info.currsize == 1
+
+def test_lru_eviction():
+    cache = PdaCache(maxsize=2)
+    for seed in [b'a', b'b', b'c']:
+        cache.find_program_address([seed], SBV2_DEVNET_PID)
+    assert cache.cache_info().currsize == 2
+
+    # b'a' was evicted, deriving it again is a miss
+    cache.find_program_address([b'a'], SBV2_DEVNET_PID)
+    assert cache.cache_info().misses == 4
+
+def test_warm():
+    program = SimpleNamespace(program_id=SBV2_DEVNET_PID)
+    authority = Keypair().public_key
+    warm_pda_cache(program, [(QUEUE, AGGREGATOR)], queue_authority=authority)
+
+    hits = PDA_CACHE.hits
+    LeaseAccount.from_seed(
+        program,
+        OracleQueueAccount(AccountParams(program=program, public_key=QUEUE)),
+        AggregatorAccount(AccountParams(program=program, public_key=AGGREGATOR))
+    )
+    ProgramStateAccount.from_seed(program)
+    assert PDA_CACHE.hits == hits + 2
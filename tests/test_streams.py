@@ -0,0 +1,71 @@
+import asyncio
+
+from pytest import mark
+
+from switchboardpy.streams import StreamManager
+from switchboardpy.testing import WebsocketStandIn
+
+SUBSCRIPTION = '{"op": "subscribe", "channel": "ticker"}'
+BTC = "$[?(@.market == 'BTC')]"
+ETH = "$[?(@.market == 'ETH')]"
+
+@mark.asyncio
+async def test_one_connection_per_subscription_with_latest_by_filter():
+    async with WebsocketStandIn() as standin, StreamManager(first_message_timeout=1.0) as streams:
+        btc = asyncio.ensure_future(streams.latest(standin.url, SUBSCRIPTION, BTC))
+        eth = asyncio.ensure_future(streams.latest(standin.url, SUBSCRIPTION, ETH))
+        await standin.wait_clients(1)
+        await standin.publish({"market": "BTC", "price": 42000})
+        await standin.publish({"market": "ETH", "price": 3000})
+        assert (await btc).document()["price"] == 42000
+        assert (await eth).document()["price"] == 3000
+        assert standin.connections == 1
+        assert standin.received == [SUBSCRIPTION]
+
+        await standin.publish({"market": "BTC", "price": 42001})
+        await standin.publish({"market": "SOL", "price": 100})
+        await asyncio.sleep(0.05)
+        latest = await streams.latest(standin.url, SUBSCRIPTION, BTC, max_age=1.0)
+        assert latest.document() == {"market": "BTC", "price": 42001}
+        assert (await streams.latest(standin.url, SUBSCRIPTION, ETH)).document()["price"] == 3000
+
+        # lookups of fresh messages do not wait, stale ones are refused
+        await asyncio.sleep(0.1)
+        assert await asyncio.wait_for(streams.latest(standin.url, SUBSCRIPTION, BTC, max_age=0.05), 0.01) is None
+        assert standin.connections == 1
+
+@mark.asyncio
+async def test_reconnects_with_backoff_and_resubscribes():
+    async with WebsocketStandIn() as standin, StreamManager(reconnect_base_delay=0.05, reconnect_max_delay=0.1) as streams:
+        first = asyncio.ensure_future(streams.latest(standin.url, SUBSCRIPTION))
+        await standin.wait_clients(1)
+        await standin.publish("tick 1")
+        assert await first == "tick 1"
+
+        await standin.disconnect()
+        await standin.wait_clients(1)
+        # the subscription is sent once the connection is accepted
+        for _ in range(100):
+            if len(standin.received) == 2:
+                break
+            await asyncio.sleep(0.01)
+        assert streams.reconnects == 1
+        assert standin.received == [SUBSCRIPTION, SUBSCRIPTION]
+        await standin.publish("tick 2")
+        await asyncio.sleep(0.05)
+        assert await streams.latest(standin.url, SUBSCRIPTION) == "tick 2"
+
+@mark.asyncio
+async def test_first_message_timeout():
+    async with WebsocketStandIn() as standin, StreamManager(first_message_timeout=0.1) as streams:
+        assert await streams.latest(standin.url, SUBSCRIPTION, BTC) is None
+        # the filter had its chance, later lookups do not wait again
+        assert await asyncio.wait_for(streams.latest(standin.url, SUBSCRIPTION, BTC), 0.01) is None
+
+@mark.asyncio
+async def test_connection_errors_are_kept(caplog):
+    async with StreamManager(first_message_timeout=0.1, reconnect_base_delay=0.01) as streams:
+        # nothing listens on the discard port
+        assert await streams.latest("ws://127.0.0.1:9", SUBSCRIPTION) is None
+        assert isinstance(streams.last_error("ws://127.0.0.1:9", SUBSCRIPTION), OSError)
+        assert "Websocket stream ws://127.0.0.1:9 failed" in caplog.text
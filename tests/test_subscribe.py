@@ -0,0 +1,111 @@
+import asyncio
+from pytest import mark, raises
+
+from switchboardpy import (
+  AccountParams,
+  AggregatorAccount,
+  LeaseAccount,
+)
+from switchboardpy.subscribe import AccountSubscriber, reconnect_delay
+from switchboardpy.testing import RpcStandIn, encode_account, standin_program
+
+from anchorpy.error import AccountInvalidDiscriminator
+from solana.publickey import PublicKey
+
+AGGREGATOR = PublicKey("88FX4tBstuwBPNhQU4EEBoPX35neSu4Le9zDSwtPRRQz")
+
+async def wait_for(predicate, timeout=5):
+    for _ in range(int(timeout * 100)):
+        if predicate():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not met")
+
+@mark.asyncio
+async def test_load_data_from_cache():
+    async with RpcStandIn() as standin:
+        program = await standin_program(standin)
+        async with AccountSubscriber(program, standin.ws_url, pool_size=1) as subscriber:
+            await subscriber.subscribe(AGGREGATOR, "AggregatorAccountData")
+            await wait_for(lambda: subscriber.connections[0].subscriptions)
+            await standin.set_account(AGGREGATOR, encode_account(program, "AggregatorAccountData", min_oracle_results=3))
+            await wait_for(lambda: subscriber.get(AGGREGATOR) is not None)
+
+            agg = AggregatorAccount(AccountParams(program=program, public_key=AGGREGATOR))
+            data = await agg.load_data()
+            assert data is subscriber.get(AGGREGATOR).data
+            assert data.min_oracle_results == 3
+            assert standin.calls["getAccountInfo"] == 0
+        await program.close()
+
+@mark.asyncio
+async def test_other_account_type_is_loaded_from_rpc():
+    async with RpcStandIn() as standin:
+        program = await standin_program(standin)
+        async with AccountSubscriber(program, standin.ws_url, pool_size=1) as subscriber:
+            await subscriber.subscribe(AGGREGATOR, "AggregatorAccountData")
+            await wait_for(lambda: subscriber.connections[0].subscriptions)
+            await standin.set_account(AGGREGATOR, encode_account(program, "AggregatorAccountData"))
+            await wait_for(lambda: subscriber.get(AGGREGATOR) is not None)
+
+            # the subscribed aggregator is not handed out as a lease
+            lease = LeaseAccount(AccountParams(program=program, public_key=AGGREGATOR))
+            with raises(AccountInvalidDiscriminator):
+                await lease.load_data()
+            assert standin.calls["getAccountInfo"] == 1
+        await program.close()
+
+@mark.asyncio
+async def test_resubscribe_on_disconnect():
+    async with RpcStandIn() as standin:
+        program = await standin_program(standin)
+        async with AccountSubscriber(program, standin.ws_url, pool_size=1, reconnect_base_delay=0.05) as subscriber:
+            await subscriber.subscribe(AGGREGATOR, "AggregatorAccountData")
+            await wait_for(lambda: subscriber.connections[0].subscriptions)
+            await standin.set_account(AGGREGATOR, encode_account(program, "AggregatorAccountData", min_oracle_results=1))
+            await wait_for(lambda: subscriber.get(AGGREGATOR) is not None)
+
+            await standin.disconnect()
+            await wait_for(lambda: standin.calls["accountSubscribe"] == 2 and subscriber.connections[0].subscriptions)
+            await standin.set_account(AGGREGATOR, encode_account(program, "AggregatorAccountData", min_oracle_results=2))
+            await wait_for(lambda: subscriber.get(AGGREGATOR) is not None)
+
+            assert subscriber.reconnects >= 1
+            assert subscriber.get(AGGREGATOR).slot == standin.slot
+            assert subscriber.get(AGGREGATOR).data.min_oracle_results == 2
+        await program.close()
+
+@mark.asyncio
+async def test_backpressure():
+    async with RpcStandIn() as standin:
+        program = await standin_program(standin)
+        async with AccountSubscriber(program, standin.ws_url, pool_size=1, queue_size=10) as subscriber:
+            await subscriber.subscribe(AGGREGATOR, "AggregatorAccountData")
+            await wait_for(lambda: subscriber.connections[0].subscriptions)
+            data = encode_account(program, "AggregatorAccountData")
+            for _ in range(200):
+                await standin.set_account(AGGREGATOR, data)
+            last_slot = standin.slot
+            await wait_for(lambda: subscriber.get(AGGREGATOR) is not None and subscriber.get(AGGREGATOR).slot == last_slot)
+
+            # the slow consumer only sees the newest updates, the cache holds the latest
+            assert subscriber.queue.qsize() == 10
+            assert subscriber.dropped == 190
+            updates = subscriber.updates()
+            assert (await updates.__anext__()).slot == last_slot - 9
+        await program.close()
+
+@mark.asyncio
+async def test_connection_errors_are_logged(caplog):
+    async with RpcStandIn() as standin:
+        program = await standin_program(standin)
+        # nothing listens on the discard port
+        async with AccountSubscriber(program, "ws://127.0.0.1:9", pool_size=1, reconnect_base_delay=0.01) as subscriber:
+            await wait_for(lambda: subscriber.reconnects >= 2)
+        assert "Account subscription connection to ws://127.0.0.1:9 failed" in caplog.text
+        await program.close()
+
+def test_reconnect_delay():
+    assert 0.5 <= reconnect_delay(0, 1.0, 30.0) <= 1.0
+    assert 4.0 <= reconnect_delay(3, 1.0, 30.0) <= 8.0
+    assert 15.0 <= reconnect_delay(10, 1.0, 30.0) <= 30.0
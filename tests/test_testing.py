@@ -0,0 +1,92 @@
+import base64
+import time
+
+from decimal import Decimal
+from pytest import mark
+
+from switchboardpy import AccountParams, AggregatorAccount, LeaseAccount, OracleQueueAccount
+from switchboardpy.common import SBV2_DEVNET_PID, account_discriminator
+from switchboardpy.testing import (
+  AccountFixture,
+  FaultInjection,
+  RpcStandIn,
+  dump_fixtures,
+  load_fixtures,
+  standin_program,
+  synthetic_fixtures,
+)
+
+from solana.keypair import Keypair
+from solana.publickey import PublicKey
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.types import DataSliceOpts, MemcmpOpts
+
+ACCOUNT = PublicKey("88FX4tBstuwBPNhQU4EEBoPX35neSu4Le9zDSwtPRRQz")
+DATA = account_discriminator("AggregatorAccountData") + bytes(range(32))
+
+def decode(value):
+    return base64.b64decode(value["data"][0])
+
+@mark.asyncio
+async def test_account_info():
+    async with RpcStandIn({str(ACCOUNT): AccountFixture(DATA)}) as standin:
+        client = AsyncClient(standin.http_url)
+        response = await client.get_account_info(ACCOUNT, encoding="base64")
+        assert decode(response["result"]["value"]) == DATA
+        response = await client.get_account_info(ACCOUNT, encoding="base64", data_slice=DataSliceOpts(offset=8, length=4))
+        assert decode(response["result"]["value"]) == bytes(range(4))
+        response = await client.get_multiple_accounts([ACCOUNT, Keypair().public_key], encoding="base64")
+        assert decode(response["result"]["value"][0]) == DATA
+        assert response["result"]["value"][1] is None
+        await client.close()
+        assert standin.calls["getAccountInfo"] == 2
+
+@mark.asyncio
+async def test_program_accounts():
+    async with RpcStandIn({str(ACCOUNT): AccountFixture(DATA)}) as standin:
+        client = AsyncClient(standin.http_url)
+        response = await client.get_program_accounts(
+            SBV2_DEVNET_PID,
+            encoding="base64",
+            memcmp_opts=[MemcmpOpts(offset=0, bytes=str(PublicKey(DATA[:32])))]
+        )
+        assert [account["pubkey"] for account in response["result"]] == [str(ACCOUNT)]
+        response = await client.get_program_accounts(SBV2_DEVNET_PID, encoding="base64", data_size=len(DATA) + 1)
+        assert response["result"] == []
+        await client.close()
+
+@mark.asyncio
+async def test_fault_injection():
+    async with RpcStandIn({str(ACCOUNT): AccountFixture(DATA)}, FaultInjection(latency=0.05)) as standin:
+        client = AsyncClient(standin.http_url)
+        start = time.monotonic()
+        await client.get_account_info(ACCOUNT, encoding="base64")
+        assert time.monotonic() - start >= 0.05
+        standin.faults.error_rate = 1.0
+        response = await client.get_account_info(ACCOUNT, encoding="base64")
+        assert response["error"]["code"] == -32005
+        await client.close()
+
+def test_fixtures_round_trip(tmp_path):
+    fixtures = {str(ACCOUNT): AccountFixture(DATA, lamports=42)}
+    dump_fixtures(tmp_path / "fixtures.json", fixtures)
+    assert load_fixtures(tmp_path / "fixtures.json") == fixtures
+
+@mark.asyncio
+async def test_synthetic_fixtures():
+    async with RpcStandIn() as standin:
+        program = await standin_program(standin)
+        fixtures = synthetic_fixtures(program, history_rows=10)
+        standin.accounts.update(fixtures)
+        aggregator_pubkey = PublicKey(bytes([1]) * 32)
+        aggregator_account = AggregatorAccount(AccountParams(program=program, public_key=aggregator_pubkey))
+        aggregator = await aggregator_account.load_data()
+        assert await aggregator_account.get_latest_value() == Decimal("24531.123456")
+        assert len(await aggregator_account.load_history()) == 10
+
+        queue_account = OracleQueueAccount(AccountParams(program=program, public_key=aggregator.queue_pubkey))
+        lease_account, _ = LeaseAccount.from_seed(program, queue_account, aggregator_account)
+        lease = await lease_account.load_data()
+        assert lease.aggregator == aggregator_pubkey
+        assert lease.queue == queue_account.public_key
+        await program.close()